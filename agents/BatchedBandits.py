@@ -0,0 +1,198 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import abc
+
+import numpy as np
+
+
+class BatchedBandit:
+    """
+    Runs a bandit algorithm on many independent runs at once. counts and values are n_runs x n_arms arrays; every
+    call of select_arms chooses one arm for each run, and update takes the rewards of all the runs.
+
+    Only one element of every row changes per update, so the arrays are indexed through flat views with the offset
+    of every row, which is much cheaper than indexing them by row and column.
+    """
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, n_runs, n_arms=None, seed=None):
+        """
+        :param n_runs: number of independent runs
+        :param n_arms: number of arms; the arrays are created by initialize if not given
+        :param seed: seed of the random numbers used to select the arms
+        """
+        self.n_runs = n_runs
+        self.rng = np.random.RandomState(seed)
+        self.counts = None
+        self.values = None
+        self.t = 0
+        if n_arms is not None:
+            self.initialize(n_arms)
+
+    def initialize(self, n_arms):
+        """
+        :param n_arms: tells the number of arms (or actions) in the problem
+        """
+        self.n_arms = n_arms
+        self.counts = np.zeros((self.n_runs, n_arms), dtype=np.int64)
+        self.values = np.zeros((self.n_runs, n_arms))
+        self.offsets = np.arange(self.n_runs) * n_arms
+        self.t = 0
+
+    @abc.abstractmethod
+    def select_arms(self):
+        """
+        :return: array with the index of the arm to be pulled in every run
+        """
+
+    def update(self, chosen_arms, rewards):
+        """
+        Updates the running average of the chosen arm of every run with its reward, like the update of the
+        single run algorithms.
+        :param chosen_arms: array with the arm pulled in every run
+        :param rewards: array with the reward obtained in every run
+        """
+        index = self.offsets + chosen_arms
+        counts = self.counts.reshape(-1)
+        values = self.values.reshape(-1)
+
+        counts[index] += 1
+        value = values[index]
+        value += (rewards - value) / counts[index]
+        values[index] = value
+        self.t += 1
+
+        self.updated(index, value)
+
+    def updated(self, index, value):
+        """
+        Called after every update, to bring state derived from the values up to date.
+        :param index: flat index of the elements that changed
+        :param value: their new value
+        """
+        pass
+
+
+class BatchedEpsilonGreedy(BatchedBandit):
+
+    def __init__(self, epsilon, n_runs, n_arms=None, seed=None):
+        """
+        :param epsilon: tells the probability with which we explore
+        """
+        BatchedBandit.__init__(self, n_runs, n_arms, seed)
+        self.epsilon = epsilon
+
+    def select_arms(self):
+        arms = self.values.argmax(axis=1)
+
+        explore = np.flatnonzero(self.rng.random_sample(self.n_runs) < self.epsilon)
+        arms[explore] = self.rng.randint(self.n_arms, size=len(explore))
+
+        return arms
+
+
+class BatchedSoftmax(BatchedBandit):
+    """
+    Keeps the weight exp(value / temperature - shift) of every arm, where the shift of a run is its largest scaled
+    value when its weights were last computed. Every update recomputes only the weights that changed; the weights of
+    a run are computed again when their sum drifts far enough to risk an overflow or underflow.
+    """
+
+    def __init__(self, temperature, n_runs, n_arms=None, seed=None, annealing=False):
+        """
+        :param temperature: parameter that controls the randomness of the softmax function
+        :param annealing: lower the temperature over time as 1/log(t + 1), like AnnealingSoftMax; the temperature
+                          given is then ignored, and all the weights are computed again at every pull
+        """
+        self.temperature = temperature
+        self.annealing = annealing
+        BatchedBandit.__init__(self, n_runs, n_arms, seed)
+
+    def initialize(self, n_arms):
+        BatchedBandit.initialize(self, n_arms)
+        self.weights = np.ones((self.n_runs, n_arms))
+        self.shifts = np.zeros(self.n_runs)
+
+    def reweigh(self, runs=None):
+        """
+        Computes the weights of the given runs, or of all of them, from scratch.
+        """
+        if runs is None:
+            z = self.values / self.temperature
+            self.shifts = z.max(axis=1)
+            self.weights = np.exp(z - self.shifts[:, np.newaxis])
+        else:
+            z = self.values[runs] / self.temperature
+            self.shifts[runs] = z.max(axis=1)
+            self.weights[runs] = np.exp(z - self.shifts[runs, np.newaxis])
+
+    def updated(self, index, value):
+        if not self.annealing:
+            # an overflow is caught by select_arms, which computes the weights of the run again
+            with np.errstate(over='ignore'):
+                self.weights.reshape(-1)[index] = np.exp(value / self.temperature - self.shifts)
+
+    def select_arms(self):
+        if self.annealing:
+            self.temperature = 1 / np.log(self.t + 1 + 0.000001)
+            self.reweigh()
+
+        cumulative = self.weights.cumsum(axis=1)
+        totals = cumulative[:, -1]
+        drifted = np.flatnonzero((totals > 1e100) | (totals < 1e-100))
+        if len(drifted):
+            self.reweigh(drifted)
+            cumulative[drifted] = self.weights[drifted].cumsum(axis=1)
+            totals = cumulative[:, -1]
+
+        draws = self.rng.random_sample(self.n_runs) * totals
+        return (cumulative > draws[:, np.newaxis]).argmax(axis=1)
+
+
+class BatchedUCB1(BatchedBandit):
+    """
+    Keeps 1/sqrt(count) of every arm, so that only the factor sqrt(2 log t) of the bonus changes between pulls.
+    """
+
+    def initialize(self, n_arms):
+        BatchedBandit.initialize(self, n_arms)
+        # the arms never played have an infinite bonus, so that every arm is played at least once, in order
+        self.inverse_roots = np.full((self.n_runs, n_arms), np.inf)
+
+    def updated(self, index, value):
+        self.inverse_roots.reshape(-1)[index] = 1 / np.sqrt(self.counts.reshape(-1)[index])
+
+    def select_arms(self):
+        # before every arm was played only the infinite bonuses matter, as long as the factor is positive
+        factor = np.sqrt(2 * np.log(max(self.t, 2)))
+
+        return (self.values + factor * self.inverse_roots).argmax(axis=1)
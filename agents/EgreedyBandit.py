@@ -35,15 +35,17 @@ import random
 
 class EpsilonGreedy:
 
-    def __init__(self, epsilon, counts, values):
+    def __init__(self, epsilon, counts, values, rng=random):
         """
         :param epsilon: tells the probability with which we explore 
         :param counts: vector of length N that tells how many times we played each of N arms
         :param values: vector of length N that tells the average amount of rewards obtained playing each of N arms
+        :param rng: source of random numbers with the interface of the random module, e.g., a misc.rng.BlockRandom
         """
         self.epsilon = epsilon
         self.counts = counts
         self.values = values
+        self.rng = rng
 
     def initialize(self, n_arms):
         """
@@ -63,10 +65,10 @@ class EpsilonGreedy:
         """
         :return: the index of the arm to be pulled (action to be performed)
         """
-        if random.random() > self.epsilon:
+        if self.rng.random() > self.epsilon:
             return index_max(self.values)
         else:
-            random.randrange(len(self.values))
+            return self.rng.randrange(len(self.values))
 
     def update(self, chosen_arm, reward):
         """
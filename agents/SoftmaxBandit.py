@@ -33,8 +33,8 @@ import math
 import random
 
 
-def categorical_draws(probabilities):
-    z = random.random()
+def categorical_draws(probabilities, rng=random):
+    z = rng.random()
     cum_prob = 0.0
 
     for i in xrange(len(probabilities)):
@@ -46,6 +46,83 @@ def categorical_draws(probabilities):
     return len(probabilities) - 1
 
 
+def softmax_probabilities(values, temperature):
+    """
+    :return: the probabilities exp(v/temperature)/z of the values; the largest value is subtracted before exp, which
+             keeps it from overflowing and does not change the probabilities
+    """
+    m = max(values)
+    weights = [math.exp((v - m) / temperature) for v in values]
+    z = sum(weights)
+    return [w / z for w in weights]
+
+
+class SumTree:
+    """
+    Binary tree over non-negative weights in which every node holds the sum of the weights below it. Changing a
+    weight and drawing an index with probability proportional to its weight both take O(log n).
+    """
+
+    def __init__(self, weights):
+        """
+        :param weights: the initial weights
+        """
+        self.n = len(weights)
+        self.leaves = 1
+        while self.leaves < self.n:
+            self.leaves *= 2
+        self.build(weights)
+
+    def build(self, weights):
+        """
+        Replaces all the weights in O(n).
+        """
+        tree = [0.0] * (2 * self.leaves)
+        tree[self.leaves:self.leaves + self.n] = weights
+        for node in xrange(self.leaves - 1, 0, -1):
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+        self.tree = tree
+
+    def total(self):
+        return self.tree[1]
+
+    def update(self, index, weight):
+        """
+        Sets the weight of the given index. The sums above it are added up again rather than adjusted by the
+        difference, so that rounding errors do not pile up.
+        """
+        tree = self.tree
+        node = self.leaves + index
+        tree[node] = weight
+        node //= 2
+        while node:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node //= 2
+
+    def find(self, u):
+        """
+        :param u: number in [0, total)
+        :return: the index at which the running sum of the weights exceeds u
+        """
+        tree = self.tree
+        node = 1
+        while node < self.leaves:
+            left = 2 * node
+            # rounding may leave u at or above the total; it must not end in a zero weight then
+            if u < tree[left] or tree[left + 1] == 0.0:
+                node = left
+            else:
+                u -= tree[left]
+                node = left + 1
+        return node - self.leaves
+
+    def draw(self, rng=random):
+        """
+        :return: an index drawn with probability proportional to its weight
+        """
+        return self.find(rng.random() * self.tree[1])
+
+
 class Softmax:
     """
     Provides structured exploration. Tries to cope with the arms differing in estimated value by incorporating
@@ -53,16 +130,18 @@ class Softmax:
     rescaling.
     """
 
-    def __init__(self, temperature, counts, values):
+    def __init__(self, temperature, counts, values, rng=random):
         """
         When temperature is high, the randomness is high via: -exp(prob/temp)
         :param temperature: parameter that controls the randomness of the softmax function
         :param counts: vector of length N that tells how many times we played each of N arms
         :param values: vector of length N that tells the average amount of rewards obtained playing each of N arms
+        :param rng: source of random numbers with the interface of the random module, e.g., a misc.rng.BlockRandom
         """
         self.temperature = temperature
         self.counts = counts
         self.values = values
+        self.rng = rng
 
     def initialize(self, n_arms):
         """
@@ -75,9 +154,7 @@ class Softmax:
         """
         :return: the index of the arm to be pulled (action to be performed)
         """
-        z = sum([math.exp(v/self.temperature) for v in self.values])
-        probs = [math.exp(v/self.temperature)/z for v in self.values]
-        return categorical_draws(probs)
+        return categorical_draws(softmax_probabilities(self.values, self.temperature), self.rng)
 
     def update(self, chosen_arm, reward):
         """
@@ -104,8 +181,8 @@ class AnnealingSoftMax(Softmax):
     temperature parameter will make Softmax algorithm exploit the best arm more often and settle into 
     its final deterministic strategy for choosing an arm.
     """
-    def __init__(self, counts, values):
-        super(AnnealingSoftMax, self).__init__(0, counts, values)
+    def __init__(self, counts, values, rng=random):
+        Softmax.__init__(self, 0, counts, values, rng)
 
     def select_arm(self):
         """
@@ -119,6 +196,104 @@ class AnnealingSoftMax(Softmax):
         t = sum(self.counts) + 1
         self.temperature = 1/math.log(t + 0.000001)
 
-        z = sum([math.exp(v / self.temperature) for v in self.values])
-        probs = [math.exp(v / self.temperature) / z for v in self.values]
-        return categorical_draws(probs)
+        return categorical_draws(softmax_probabilities(self.values, self.temperature), self.rng)
+
+
+class TreeSoftmax(Softmax):
+    """
+    Softmax that keeps the weights of the arms in a SumTree, so that a pull costs O(log n) instead of two exponentials
+    per arm and a linear scan.
+
+    The weight of an arm is exp(value/temperature - shift), where the shift is the largest value/temperature when
+    the weights were last computed (log-sum-exp rebasing). An update only computes the weight of the arm that was
+    played. When the sum of the weights leaves [exp(-rebase_limit), exp(rebase_limit)], it is close to overflowing
+    or underflowing, and all the weights are computed again with a new shift.
+    """
+
+    def __init__(self, temperature, counts, values, rng=random, rebase_limit=200.0):
+        """
+        :param rebase_limit: the weights are computed again when the log of their sum is farther than this from 0
+        """
+        Softmax.__init__(self, temperature, counts, values, rng)
+        self.rebase_limit = rebase_limit
+        self.tree = None
+
+    def initialize(self, n_arms):
+        """
+        :param n_arms: tells the number of arms (or actions) in the problem
+        """
+        Softmax.initialize(self, n_arms)
+        self.rebase()
+
+    def rebase(self):
+        """
+        Computes all the weights again, shifted by the largest value/temperature.
+        """
+        self.shift = max(self.values) / self.temperature
+        weights = [math.exp(v / self.temperature - self.shift) for v in self.values]
+        if self.tree is None or self.tree.n != len(weights):
+            self.tree = SumTree(weights)
+        else:
+            self.tree.build(weights)
+
+    def select_arm(self):
+        """
+        :return: the index of the arm to be pulled (action to be performed)
+        """
+        total = self.tree.total()
+        if not math.exp(-self.rebase_limit) < total < math.exp(self.rebase_limit):
+            self.rebase()
+        return self.tree.draw(self.rng)
+
+    def update(self, chosen_arm, reward):
+        """
+        Updates the estimated value of the chosen arm like Softmax, and its weight.
+        :param chosen_arm: arm that was selected to be pulled (action to be performed)
+        :param reward: numerical value obtained for performing the action
+        """
+        Softmax.update(self, chosen_arm, reward)
+
+        z = self.values[chosen_arm] / self.temperature - self.shift
+        if z > self.rebase_limit:
+            self.rebase()
+        else:
+            self.tree.update(chosen_arm, math.exp(z))
+
+
+class TreeAnnealingSoftmax(TreeSoftmax):
+    """
+    AnnealingSoftMax on a SumTree. The annealing temperature 1/log(t) changes on every pull, which would mean
+    computing every weight again on every pull; instead the weights are only computed again once the temperature
+    has moved by more than the given fraction since they were. Until then the arms are drawn with the temperature
+    the weights were computed for.
+    """
+
+    def __init__(self, counts, values, rng=random, tolerance=0.01):
+        """
+        :param tolerance: relative change of the temperature after which all the weights are computed again
+        """
+        TreeSoftmax.__init__(self, 1.0, counts, values, rng)
+        self.tolerance = tolerance
+        self.t = 0
+
+    def initialize(self, n_arms):
+        """
+        :param n_arms: tells the number of arms (or actions) in the problem
+        """
+        self.t = 0
+        self.temperature = 1/math.log(1 + 0.000001)
+        TreeSoftmax.initialize(self, n_arms)
+
+    def select_arm(self):
+        """
+        :return: the index of the arm to be pulled (action to be performed)
+        """
+        temperature = 1/math.log(self.t + 1 + 0.000001)
+        if abs(temperature - self.temperature) > self.tolerance * self.temperature:
+            self.temperature = temperature
+            self.rebase()
+        return TreeSoftmax.select_arm(self)
+
+    def update(self, chosen_arm, reward):
+        self.t += 1
+        TreeSoftmax.update(self, chosen_arm, reward)
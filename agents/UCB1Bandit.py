@@ -29,6 +29,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+import heapq
 import math
 
 
@@ -90,6 +91,96 @@ class UCB1:
         self.values[chosen_arm] = new_value
 
 
+class LazyUCB1(UCB1):
+    """
+    UCB1 for problems with very many arms. It selects the same arms as UCB1, up to ties between arms whose averages
+    differ only by rounding, without computing the value of every arm on every pull.
+
+    The total number of pulls is kept as a running total, and the arms not played yet in a heap of their indices.
+    The played arms are grouped by the number of times they were played: all the arms of a group have the same bonus,
+    so the best of them is the one with the highest average reward, whatever the total. Every group is a heap of its
+    arms by average reward, and select_arm only compares the best arm of every group. The number of groups does not
+    grow with the number of arms, and is at most sqrt(2 * total).
+
+    An update moves the arm to the next group. It is not removed from its old group: the entry is dropped once it
+    comes up, since the count of its arm no longer matches the group.
+    """
+
+    def initialize(self, n_arms):
+        """
+        :param n_arms: tells the number of arms (or actions) in the problem
+        """
+        UCB1.initialize(self, n_arms)
+        self.total = 0
+        self.untried = range(n_arms)
+        self.groups = {}
+        self.n_entries = 0
+
+    def select_arm(self):
+        """
+        :return: the index of the arm to be pulled (action to be performed)
+        """
+        untried = self.untried
+        while untried:
+            if self.counts[untried[0]] == 0:  # ensure that every arm is played at least once
+                return untried[0]
+            heapq.heappop(untried)
+
+        counts = self.counts
+        values = self.values
+        log_total = 2 * math.log(self.total)
+
+        best_arm = None
+        best_value = float("-inf")
+        for count, group in self.groups.items():
+            while group and counts[group[0][1]] != count:
+                heapq.heappop(group)
+            if not group:
+                del self.groups[count]
+                continue
+
+            arm = group[0][1]
+            value = values[arm] + math.sqrt(log_total / count)
+            if value > best_value or (value == best_value and arm < best_arm):
+                best_arm = arm
+                best_value = value
+
+        return best_arm
+
+    def update(self, chosen_arm, reward):
+        """
+        Updates the estimated value of the chosen arm like UCB1, and moves it to the group of its new count.
+        :param chosen_arm: arm that was selected to be pulled (action to be performed)
+        :param reward: numerical value obtained for performing the action
+        """
+        UCB1.update(self, chosen_arm, reward)
+        self.total += 1
+
+        count = self.counts[chosen_arm]
+        if count not in self.groups:
+            self.groups[count] = []
+        heapq.heappush(self.groups[count], (-self.values[chosen_arm], chosen_arm))
+
+        self.n_entries += 1
+        if self.n_entries > 2 * len(self.counts):
+            self.regroup()
+
+    def regroup(self):
+        """
+        Builds the groups again, without the entries that are out of date.
+        """
+        groups = {}
+        for arm in xrange(len(self.counts)):
+            count = self.counts[arm]
+            if count > 0:
+                groups.setdefault(count, []).append((-self.values[arm], arm))
+        for group in groups.itervalues():
+            heapq.heapify(group)
+
+        self.groups = groups
+        self.n_entries = sum(len(group) for group in groups.itervalues())
+
+
 def index_max(x):
     """
     :param x: vector whose max index has to be returned 
@@ -0,0 +1,107 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import random
+
+import numpy as np
+
+from rlglue.types import Observation
+from pyrl.rlglue import TaskSpecRLGlue
+from pyrl.rlglue.registry import register_environment
+from pyrl.environments.BernoulliEnvironment import BernoulliEnv
+from pyrl.environments.arm_distributions import make_arms
+from pyrl.misc.rng import BlockRandom
+
+
+def task_spec_bound(value):
+    if value == float("inf"):
+        return "POSINF"
+    elif value == float("-inf"):
+        return "NEGINF"
+    return value
+
+
+@register_environment
+class BanditEnv(BernoulliEnv):
+    """
+    Multi-armed bandit whose arms follow any of the distributions of arm_distributions, declared in the parameters of
+    the environment in the experiment configuration, e.g.,
+    "environment": {"name": "Bandit Environment",
+                    "params": {"arms": {"type": "heavy-tailed", "means": [0.1, 0.5, 0.3], "df": 2.5}, "seed": 1}}
+    """
+    name = "Bandit Environment"
+
+    def __init__(self, arms=None, seed=None, rng=random):
+        """
+        :param arms: configuration of the arms, see arm_distributions.make_arms; by default the Bernoulli arms of
+                     BernoulliEnv, shuffled with rng
+        :param seed: seed of the rewards; rng is used if None
+        :param rng: source of random numbers with the interface of the random module, e.g., a misc.rng.BlockRandom
+        """
+        if seed is not None:
+            rng = BlockRandom(seed)
+        self.rng = rng
+        self.state = np.random.RandomState(rng.randrange(2 ** 32))
+
+        if arms is None:
+            means = [0.1, 0.2, 0.6, 0.1]
+            rng.shuffle(means)
+            arms = {"type": "bernoulli", "means": means}
+        self.arms = make_arms(arms, self.state)
+        self.means = self.arms.means
+        self.n_arms = self.arms.n_arms
+
+        # a bandit has a single state
+        self.observation = Observation(numInts=1)
+
+    def makeTaskSpec(self):
+        low, high = self.arms.reward_range
+        ts = TaskSpecRLGlue.TaskSpec(discount_factor=0.9, reward_range=(task_spec_bound(low), task_spec_bound(high)))
+        ts.addDiscreteAction((0, self.n_arms - 1))
+        ts.addDiscreteObservation((0, 1))
+        ts.setEpisodic()
+        ts.setExtra(self.name)
+
+        return ts.toTaskSpec()
+
+    def env_step(self, thisAction):
+        rot = BernoulliEnv.env_step(self, thisAction)
+
+        self.arms.advance()
+        self.means = self.arms.means
+
+        return rot
+
+    def draw(self, arm):
+        return self.arms.draw(arm)
+
+    def pull(self, arms):
+        return self.arms.pull(np.asarray(arms))
@@ -31,29 +31,34 @@ THE SOFTWARE.
 
 import random
 
+import numpy as np
+
 from rlglue.environment.Environment import Environment
 from rlglue.environment import EnvironmentLoader as EnvironmentLoader
 from rlglue.types import Observation
 from rlglue.types import Action
 from rlglue.types import Reward_observation_terminal
-from rlglue import TaskSpecRLGlue
-from rlglue.registry import register_environment
+from pyrl.rlglue import TaskSpecRLGlue
+from pyrl.rlglue.registry import register_environment
+from pyrl.misc.rng import BlockRandom
 
 
 class BernoulliArm:
 
-    def __init__(self, p):
+    def __init__(self, p, rng=random):
         """
         Implements a simple random reward generator
         :param p: the probability with which the arm associated returns 1 as reward
+        :param rng: source of random numbers with the interface of the random module, e.g., a misc.rng.BlockRandom
         """
         self.p = p
+        self.rng = rng
 
     def draw(self):
         """
         Returns reward 1 with probability p
         """
-        if random.random() > self.p:
+        if self.rng.random() > self.p:
             return 0.0
         else:
             return 1.0
@@ -61,26 +66,131 @@ class BernoulliArm:
 
 @register_environment
 class BernoulliEnv(Environment):
+    """
+    Multi-armed bandit with Bernoulli arms. The means of the arms are kept in an array, so that it can have millions
+    of arms, and many arms can be pulled with a single call.
+    """
     name = "Bernoulli Random Environment"
 
-    def __init__(self, means=None):
-        self.means = [0.1, 0.2, 0.6, 0.1]  # probabilities with which each arm emits a reward 1
+    def __init__(self, means=None, n_arms=None, seed=None, rng=random):
+        """
+        :param means: probabilities with which each arm returns 1 as reward; by default [0.1, 0.2, 0.6, 0.1] in a
+                      random order, or n_arms uniformly random means if n_arms is given
+        :param n_arms: number of arms with random means, when no means are given
+        :param seed: seed of the rewards and of the random means; rng is used if None
+        :param rng: source of random numbers with the interface of the random module, e.g., a misc.rng.BlockRandom
+        """
+        if seed is not None:
+            rng = BlockRandom(seed)
+        self.rng = rng
+        # the state draws the random means and the rewards of batched pulls
+        self.state = np.random.RandomState(rng.randrange(2 ** 32))
+
+        if means is None and n_arms is not None:
+            means = self.state.random_sample(n_arms)
+        elif means is None:
+            means = [0.1, 0.2, 0.6, 0.1]
+            rng.shuffle(means)
+        self.means = np.asarray(means, dtype=float)
         self.n_arms = len(self.means)
-        random.shuffle(self.means)
-        self.arms = map(lambda mu: BernoulliArm(mu), self.means)
+
+        # a bandit has a single state
+        self.observation = Observation(numInts=1)
 
     def makeTaskSpec(self):
         ts = TaskSpecRLGlue.TaskSpec(discount_factor=0.9, reward_range=(0.0, 1.0))
-        ts.addDiscreteAction((0, len(self.means)-1))
+        ts.addDiscreteAction((0, self.n_arms - 1))
         ts.addDiscreteObservation((0, 1))
         ts.setEpisodic()
         ts.setExtra(self.name)
 
         return ts.toTaskSpec()
 
+    def env_init(self):
+        return self.makeTaskSpec()
+
+    def env_start(self):
+        return self.observation
+
+    def env_step(self, thisAction):
+        """
+        :param thisAction: Action whose first int is the arm to pull, the index of the arm, or an array of arm indices
+                           to pull at once
+        :return: Reward_observation_terminal; the reward is an array, one per arm, when an array of arms was pulled
+        """
+        if isinstance(thisAction, Action):
+            thisAction = thisAction.intArray[0]
+
+        if isinstance(thisAction, (list, tuple, np.ndarray)):
+            reward = self.pull(thisAction)
+        else:
+            reward = self.draw(thisAction)
+
+        return Reward_observation_terminal(reward, self.observation, 0)
+
+    def env_cleanup(self):
+        pass
+
+    def env_message(self, message):
+        return ""
+
+    def draw(self, arm):
+        """
+        :return: reward 1 with the probability of the arm, like BernoulliArm.draw
+        """
+        if self.rng.random() > self.means[arm]:
+            return 0.0
+        else:
+            return 1.0
+
+    def pull(self, arms):
+        """
+        :param arms: array of arm indices; an arm may appear more than once
+        :return: array with the reward, 1 or 0, of every pull
+        """
+        arms = np.asarray(arms)
+        return (self.state.random_sample(arms.shape) <= self.means[arms]).astype(float)
+
+
+class BatchedBernoulliEnv:
+    """
+    Bernoulli arms pulled by many independent runs at once, see agents.BatchedBandits.
+    """
+
+    def __init__(self, means, n_runs, seed=None):
+        """
+        :param means: probabilities with which the arms return 1 as reward; either one per arm, shared by all the runs,
+                      or an n_runs x n_arms array
+        :param n_runs: number of independent runs
+        :param seed: seed of the random numbers used to draw the rewards
+        """
+        self.means = np.asarray(means, dtype=float)
+        self.n_runs = n_runs
+        self.n_arms = self.means.shape[-1]
+        self.rng = np.random.RandomState(seed)
+        self.rows = np.arange(n_runs)
+
+    def best_arms(self):
+        """
+        :return: the arm with the highest mean, of every run
+        """
+        return np.broadcast_to(self.means, (self.n_runs, self.n_arms)).argmax(axis=1)
+
+    def pull(self, arms):
+        """
+        :param arms: array with the arm pulled in every run
+        :return: array with the reward, 1 or 0, of every run
+        """
+        if self.means.ndim == 1:
+            means = self.means[arms]
+        else:
+            means = self.means[self.rows, arms]
+        return (self.rng.random_sample(self.n_runs) < means).astype(float)
+
 
 def test():
     b_env = BernoulliEnv([0.1, 0.2, 0.6, 0.1])
-    print "Arms: ", b_env.arms
-    for a in b_env.arms:
-        a.draw()
\ No newline at end of file
+    print "Arms: ", b_env.means
+    for a in xrange(b_env.n_arms):
+        b_env.draw(a)
+    print "Rewards: ", b_env.pull(np.arange(b_env.n_arms))
\ No newline at end of file
@@ -0,0 +1 @@
+__all__ = ["headless_mission", "BernoulliEnvironment", "BanditEnvironment"]
@@ -0,0 +1,90 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import argparse
+import logging
+import time
+
+from pyrl.environments import fake_malmo, malmo_backend
+from pyrl.environments.arena_generator import generate_arena
+from pyrl.environments.malmo_client import MalmoClient
+from pyrl.environments.simple_mission import SimpleMalmoEnvironment
+
+
+def measure(size, n_landmarks, n_obstacles, malmo, seed=0):
+    """
+    :return: seconds to generate the arena, to build the mission XML and to load it into a MissionSpec, the length
+             of the XML, the number of obstacles placed and the numbers of blocks and drawing elements
+    """
+    start = time.time()
+    layout = generate_arena([size, size], n_landmarks, n_obstacles, seed)
+    generate_time = time.time() - start
+
+    env = SimpleMalmoEnvironment(client=MalmoClient(fake_malmo.AgentHost()), malmo=malmo, arena_size=[size, size],
+                                 n_landmarks=n_landmarks, n_obstacles=n_obstacles, arena_seed=seed)
+    start = time.time()
+    xml = env.generate_malmo_environment_xml()
+    build_time = time.time() - start
+
+    start = time.time()
+    malmo.MissionSpec(xml, True)
+    load_time = time.time() - start
+
+    return generate_time, build_time, load_time, len(xml), len(layout.obstacles), env.draw_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the time to generate arenas and to build and load their '
+                                                 'missions against the size of the arena.')
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 16, 32, 64, 128, 256])
+    parser.add_argument("--density", type=float, default=0.2, help="fraction of the cells blocked")
+    parser.add_argument("--landmarks", type=int, default=32, help="largest number of landmarks")
+    parser.add_argument("--backend", default=None, help="malmo or fake; defaults to PYRL_MALMO_BACKEND")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    log = logging.getLogger('ArenaBenchmark')
+    log.setLevel('INFO')
+
+    malmo = malmo_backend.load(args.backend)
+    for size in args.sizes:
+        cells = (size + 1) ** 2
+        n_landmarks = min(args.landmarks, max(2, cells // 16))
+        generate_time, build_time, load_time, length, n_obstacles, draw_stats = measure(size, n_landmarks,
+                                                                                         int(args.density * cells),
+                                                                                         malmo)
+        log.info("%3dx%-3d %2d landmarks %5d obstacles: generate %.4f s, build %.4f s (%d chars, %d blocks in %d "
+                 "elements), load %.4f s", size, size, n_landmarks, n_obstacles, generate_time, build_time, length,
+                 draw_stats[0], draw_stats[1], load_time)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import collections
+import random
+
+# a layout in the format of mission_layout: size [x, z], landmarks [[x, z], ...] and obstacles [[x, z, direction], ...]
+ArenaLayout = collections.namedtuple('ArenaLayout', ['size', 'landmarks', 'obstacles'])
+
+NEIGHBOURS = [(0, 1), (-1, 0), (0, -1), (1, 0)]
+
+
+def obstacle_for_cell(cx, cz):
+    """
+    :return: the obstacle that blocks cell (cx, cz): a wall on the east side of the cell to its west, see
+             mission_layout.obstacle_cell; valid for 1 <= cx <= size[0] - 1
+    """
+    return [cx - 1, cz, 2]
+
+
+def reachable(size, blocked, sources):
+    """
+    :param size: size of the arena; the cells are 0..size[0] by 0..size[1]
+    :param blocked: set of blocked (x, z) cells
+    :param sources: cells to search from
+    :return: set of the cells reachable from the sources
+    """
+    seen = set(sources)
+    queue = collections.deque(seen)
+    while queue:
+        x, z = queue.popleft()
+        for dx, dz in NEIGHBOURS:
+            cell = (x + dx, z + dz)
+            if 0 <= cell[0] <= size[0] and 0 <= cell[1] <= size[1] and cell not in blocked and cell not in seen:
+                seen.add(cell)
+                queue.append(cell)
+
+    return seen
+
+
+def carve(size, blocked, component, targets):
+    """
+    Unblocks the fewest cells needed to connect every target to the component, one shortest 0-1 BFS tree grown from
+    the component for all of them.
+    :param blocked: set of blocked cells; changed in place
+    :param component: set of connected free cells
+    :param targets: cells to connect to the component
+    :return: number of cells unblocked
+    """
+    cost = dict.fromkeys(component, 0)
+    parent = {}
+    queue = collections.deque(component)
+    while queue:
+        cell = queue.popleft()
+        x, z = cell
+        for dx, dz in NEIGHBOURS:
+            step = (x + dx, z + dz)
+            if not (0 <= step[0] <= size[0] and 0 <= step[1] <= size[1]):
+                continue
+            weight = 1 if step in blocked else 0
+            if step not in cost or cost[cell] + weight < cost[step]:
+                cost[step] = cost[cell] + weight
+                parent[step] = cell
+                if weight == 0:
+                    queue.appendleft(step)
+                else:
+                    queue.append(step)
+
+    unblocked = 0
+    for target in targets:
+        cell = target
+        while cell not in component:
+            if cell in blocked:
+                blocked.discard(cell)
+                unblocked += 1
+            cell = parent[cell]
+
+    return unblocked
+
+
+def generate_arena(size, n_landmarks, n_obstacles, seed=None):
+    """
+    Generates a random arena in which every landmark can be reached from every other one. Landmarks and obstacles
+    are put on distinct random cells; obstacles that cut landmarks off are then removed along the shortest way to
+    them, so the arena can end up with fewer obstacles than asked for.
+    :param size: size of the arena [x, z]
+    :param n_landmarks: number of landmarks, at least 2
+    :param n_obstacles: number of cells to block
+    :param seed: seed of the layout
+    :return: ArenaLayout
+    """
+    rng = random.Random(seed)
+    width, depth = size[0] + 1, size[1] + 1
+    if n_landmarks < 2 or n_landmarks > width * depth:
+        raise ValueError("Cannot place %d landmarks in an arena of size %s" % (n_landmarks, size))
+
+    cells = rng.sample(xrange(width * depth), n_landmarks)
+    landmarks = [(i // depth, i % depth) for i in cells]
+
+    # obstacles are walls attached to the cell west of the blocked one, so the westmost and eastmost columns stay free
+    taken = set(landmarks)
+    candidates = (size[0] - 1) * depth
+    n_obstacles = min(n_obstacles, max(0, candidates - len(taken)))
+    blocked = set()
+    while len(blocked) < n_obstacles:
+        i = rng.randrange(candidates)
+        cell = (1 + i // depth, i % depth)
+        if cell not in taken:
+            blocked.add(cell)
+            taken.add(cell)
+
+    component = reachable(size, blocked, landmarks[:1])
+    cut_off = [landmark for landmark in landmarks if landmark not in component]
+    if cut_off:
+        carve(size, blocked, component, cut_off)
+
+    return ArenaLayout(list(size), [list(landmark) for landmark in landmarks],
+                       [obstacle_for_cell(cx, cz) for cx, cz in sorted(blocked)])
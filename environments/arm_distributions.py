@@ -0,0 +1,273 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import abc
+import itertools
+
+import numpy as np
+
+# number of samples drawn at a time into a bank shared by all the arms
+BANK_SIZE = 4096
+# number of samples drawn at a time into the bank of a single arm
+ARM_BANK_SIZE = 64
+
+
+class SampleBank:
+    """
+    Samples drawn in bulk and handed out one at a time through a C level iterator; the bank is refilled lazily when
+    it runs out.
+    """
+
+    def __init__(self, generate, size=BANK_SIZE):
+        """
+        :param generate: callable that returns an array of the given number of samples
+        :param size: number of samples drawn at a time
+        """
+        self.generate = generate
+        self.size = size
+        self.next = itertools.chain.from_iterable(self._refills()).next
+
+    def _refills(self):
+        while True:
+            yield self.generate(self.size).tolist()
+
+
+class ArmDistribution:
+    """
+    Reward distributions of the arms of a bandit. draw pulls a single arm, taking its sample from a bank, and pull
+    pulls an array of arms with one vectorized draw. means holds the expected reward of every arm, e.g., to measure
+    the regret, and advance is called once per step of the environment.
+
+    The parameters are kept in arrays for pull, and in lists for draw: indexing a list and computing with floats
+    costs a fraction of doing the same with numpy scalars. A distribution has to implement draw; pull defaults to
+    drawing the arms one by one.
+    """
+    __metaclass__ = abc.ABCMeta
+    reward_range = (float("-inf"), float("inf"))
+
+    def __init__(self, state):
+        """
+        :param state: numpy RandomState the samples are drawn from
+        """
+        self.state = state
+        self.means = None
+        self.n_arms = 0
+
+    @abc.abstractmethod
+    def draw(self, arm):
+        """
+        :return: the reward of pulling the arm
+        """
+
+    def pull(self, arms):
+        """
+        :param arms: array of arm indices; an arm may appear more than once
+        :return: array with the reward of every pull
+        """
+        return np.array([self.draw(arm) for arm in np.ravel(arms)], dtype=float).reshape(np.shape(arms))
+
+    def advance(self):
+        pass
+
+
+class BernoulliArms(ArmDistribution):
+    reward_range = (0.0, 1.0)
+
+    def __init__(self, state, means, bank_size=BANK_SIZE):
+        """
+        :param means: probability with which every arm returns 1 as reward
+        """
+        ArmDistribution.__init__(self, state)
+        self.means = np.asarray(means, dtype=float)
+        self.n_arms = len(self.means)
+        self.mean_list = self.means.tolist()
+        self.uniforms = SampleBank(state.random_sample, bank_size)
+
+    def draw(self, arm):
+        if self.uniforms.next() > self.mean_list[arm]:
+            return 0.0
+        else:
+            return 1.0
+
+    def pull(self, arms):
+        return (self.state.random_sample(np.shape(arms)) <= self.means[arms]).astype(float)
+
+
+class GaussianArms(ArmDistribution):
+
+    def __init__(self, state, means, stds=1.0, bank_size=BANK_SIZE):
+        """
+        :param means: mean reward of every arm
+        :param stds: standard deviation of the reward of every arm, or one for all of them
+        """
+        ArmDistribution.__init__(self, state)
+        self.means = np.asarray(means, dtype=float)
+        self.n_arms = len(self.means)
+        self.stds = np.broadcast_to(np.asarray(stds, dtype=float), self.means.shape)
+        self.mean_list = self.means.tolist()
+        self.std_list = self.stds.tolist()
+        self.normals = SampleBank(state.standard_normal, bank_size)
+
+    def draw(self, arm):
+        return self.mean_list[arm] + self.std_list[arm] * self.normals.next()
+
+    def pull(self, arms):
+        return self.means[arms] + self.stds[arms] * self.state.standard_normal(np.shape(arms))
+
+
+class BetaArms(ArmDistribution):
+    """
+    Arms with Beta distributed rewards. Unlike the other distributions, the samples of an arm cannot be derived from a
+    shared bank, so every arm gets a small bank of its own when it is first pulled.
+    """
+    reward_range = (0.0, 1.0)
+
+    def __init__(self, state, alpha, beta, bank_size=ARM_BANK_SIZE):
+        """
+        :param alpha: first shape parameter of every arm
+        :param beta: second shape parameter of every arm
+        """
+        ArmDistribution.__init__(self, state)
+        self.alpha = np.asarray(alpha, dtype=float)
+        self.beta = np.broadcast_to(np.asarray(beta, dtype=float), self.alpha.shape)
+        self.means = self.alpha / (self.alpha + self.beta)
+        self.n_arms = len(self.means)
+        self.bank_size = bank_size
+        self.banks = {}
+
+    def draw(self, arm):
+        bank = self.banks.get(arm)
+        if bank is None:
+            a, b = float(self.alpha[arm]), float(self.beta[arm])
+            bank = self.banks[arm] = SampleBank(lambda size: self.state.beta(a, b, size), self.bank_size)
+        return bank.next()
+
+    def pull(self, arms):
+        return self.state.beta(self.alpha[arms], self.beta[arms])
+
+
+class HeavyTailedArms(ArmDistribution):
+    """
+    Arms whose rewards are their mean plus Student's t noise; the fewer the degrees of freedom, the heavier the tails.
+    """
+
+    def __init__(self, state, means, scale=1.0, df=2.0, bank_size=BANK_SIZE):
+        """
+        :param means: mean reward of every arm
+        :param scale: scale of the noise of every arm, or one for all of them
+        :param df: degrees of freedom of the noise, more than 1 for the mean to exist
+        """
+        if df <= 1:
+            raise ValueError("Heavy tailed arms need more than 1 degree of freedom, not %s" % df)
+        ArmDistribution.__init__(self, state)
+        self.means = np.asarray(means, dtype=float)
+        self.n_arms = len(self.means)
+        self.scale = np.broadcast_to(np.asarray(scale, dtype=float), self.means.shape)
+        self.df = df
+        self.mean_list = self.means.tolist()
+        self.scale_list = self.scale.tolist()
+        self.noise = SampleBank(lambda size: state.standard_t(df, size), bank_size)
+
+    def draw(self, arm):
+        return self.mean_list[arm] + self.scale_list[arm] * self.noise.next()
+
+    def pull(self, arms):
+        return self.means[arms] + self.scale[arms] * self.state.standard_t(self.df, np.shape(arms))
+
+
+class PiecewiseArms(ArmDistribution):
+    """
+    Non-stationary arms: every segment is a distribution of the arms, which takes over from the previous one at its
+    change point, counted in steps of the environment.
+    """
+
+    def __init__(self, state, segments, change_points):
+        """
+        :param segments: ArmDistribution of every segment, all with the same number of arms
+        :param change_points: increasing steps at which the second, third, ... segment starts
+        """
+        if len(change_points) != len(segments) - 1:
+            raise ValueError("%d segments need %d change points, not %d" % (len(segments), len(segments) - 1,
+                                                                            len(change_points)))
+        if len(set(segment.n_arms for segment in segments)) != 1:
+            raise ValueError("All the segments must have the same number of arms")
+        ArmDistribution.__init__(self, state)
+        self.segments = segments
+        self.change_points = list(change_points)
+        self.reward_range = (min(segment.reward_range[0] for segment in segments),
+                             max(segment.reward_range[1] for segment in segments))
+        self.n_arms = segments[0].n_arms
+        self.t = 0
+        self.segment = 0
+        self.current = segments[0]
+        self.means = self.current.means
+
+    def draw(self, arm):
+        return self.current.draw(arm)
+
+    def pull(self, arms):
+        return self.current.pull(arms)
+
+    def advance(self):
+        self.t += 1
+        if self.segment < len(self.change_points) and self.t >= self.change_points[self.segment]:
+            self.segment += 1
+            self.current = self.segments[self.segment]
+            self.means = self.current.means
+
+
+DISTRIBUTIONS = {"bernoulli": BernoulliArms,
+                 "gaussian": GaussianArms,
+                 "beta": BetaArms,
+                 "heavy-tailed": HeavyTailedArms,
+                 "piecewise": PiecewiseArms}
+
+
+def make_arms(config, state):
+    """
+    Creates the arms declared in an experiment configuration, e.g.,
+    {"type": "gaussian", "means": [0.1, 0.5], "stds": 0.2} or
+    {"type": "piecewise", "change_points": [1000], "segments": [{"type": "bernoulli", "means": [0.2, 0.8]},
+                                                                 {"type": "bernoulli", "means": [0.8, 0.2]}]}.
+    The other keys are passed on to the distribution of the type.
+    :param config: dictionary with the type of the distribution and its parameters
+    :param state: numpy RandomState the samples are drawn from
+    :return: ArmDistribution
+    """
+    params = dict(config)
+    kind = params.pop("type", "bernoulli")
+    if kind not in DISTRIBUTIONS:
+        raise ValueError("Unknown arm distribution %s, expected one of %s" % (kind, sorted(DISTRIBUTIONS)))
+
+    if kind == "piecewise":
+        params["segments"] = [make_arms(segment, state) for segment in params["segments"]]
+
+    return DISTRIBUTIONS[kind](state, **params)
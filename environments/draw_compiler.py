@@ -0,0 +1,105 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import collections
+
+Cuboid = collections.namedtuple('Cuboid', ['x1', 'y1', 'z1', 'x2', 'y2', 'z2', 'type'])
+
+
+def compile_blocks(blocks):
+    """
+    Merges blocks into cuboids: the blocks of one type are first joined into vertical runs, and the runs that span the
+    same heights are then covered greedily with rectangles, each grown as far as possible along z and then along x.
+    :param blocks: dictionary from (x, y, z) to the block type
+    :return: list of Cuboid covering exactly the given blocks, in a deterministic order
+    """
+    # vertical runs of identical blocks, grouped by type and heights
+    columns = collections.defaultdict(list)
+    for (x, y, z), block_type in blocks.iteritems():
+        columns[(x, z, block_type)].append(y)
+
+    runs = collections.defaultdict(set)
+    for (x, z, block_type), heights in columns.iteritems():
+        heights.sort()
+        start = heights[0]
+        for previous, y in zip(heights, heights[1:]):
+            if y != previous + 1:
+                runs[(block_type, start, previous)].add((x, z))
+                start = y
+        runs[(block_type, start, heights[-1])].add((x, z))
+
+    cuboids = []
+    for (block_type, y1, y2) in sorted(runs):
+        cells = runs[(block_type, y1, y2)]
+        for x1, z1, x2, z2 in cover(cells):
+            cuboids.append(Cuboid(x1, y1, z1, x2, y2, z2, block_type))
+
+    return cuboids
+
+
+def cover(cells):
+    """
+    :param cells: set of (x, z) cells
+    :return: list of (x1, z1, x2, z2) rectangles that cover the cells without overlapping
+    """
+    remaining = set(cells)
+    rectangles = []
+    for x, z in sorted(cells):
+        if (x, z) not in remaining:
+            continue
+
+        z2 = z
+        while (x, z2 + 1) in remaining:
+            z2 += 1
+        x2 = x
+        while all((x2 + 1, k) in remaining for k in xrange(z, z2 + 1)):
+            x2 += 1
+
+        for i in xrange(x, x2 + 1):
+            for k in xrange(z, z2 + 1):
+                remaining.discard((i, k))
+        rectangles.append((x, z, x2, z2))
+
+    return rectangles
+
+
+def to_xml(cuboids):
+    """
+    :return: DrawingDecorator elements for the cuboids; single blocks are drawn with DrawBlock
+    """
+    elements = []
+    for c in cuboids:
+        if c.x1 == c.x2 and c.y1 == c.y2 and c.z1 == c.z2:
+            elements.append('<DrawBlock x="%d" y="%d" z="%d" type="%s" />' % (c.x1, c.y1, c.z1, c.type))
+        else:
+            elements.append('<DrawCuboid x1="%d" y1="%d" z1="%d" x2="%d" y2="%d" z2="%d" type="%s" />' % c)
+
+    return "".join(elements)
@@ -0,0 +1,567 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+
+# A local stand-in for the parts of MalmoPython used by the environments. It runs the mission in process on a grid:
+# the arena is read from the DrawingDecorator of the mission XML, and the agent handles the discrete movement,
+# inventory, absolute movement and chat commands the environments send. It is meant for tests and for exercising
+# the polling, retry and reset logic without Minecraft. The module can stand in for MalmoPython itself, see
+# malmo_backend, and Faults makes it late and unreliable the way a loaded Minecraft client is.
+
+MALMO_NS = "{http://ProjectMalmo.microsoft.com}"
+
+# blocks at these heights stop the agent (feet and head); the LineOfSight ray is cast at eye height, in block 47
+FLOOR_Y = 45
+FEET_Y = 46
+EYE_Y = 47
+
+# unit steps along x and z for Yaw 0, 90, 180 and 270
+HEADINGS = [(0, 1), (-1, 0), (0, -1), (1, 0)]
+
+N_INVENTORY_SLOTS = 41
+
+# names of the worlds written to the saves directory
+WORLD_NAMES = ("fake_world_%d" % i for i in itertools.count())
+
+
+class TimestampedString:
+    def __init__(self, text, timestamp=None):
+        self.text = text
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+
+class TimestampedReward:
+    def __init__(self, value, timestamp=None):
+        self.value = value
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    def getValue(self):
+        return self.value
+
+
+class TimestampedVideoFrame:
+    def __init__(self, width, height, channels, pixels, timestamp=None):
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.pixels = pixels
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+
+class WorldState:
+    def __init__(self, has_mission_begun=False, is_mission_running=False, observations=None, rewards=None,
+                 video_frames=None, errors=None, mission_control_messages=None):
+        self.has_mission_begun = has_mission_begun
+        self.is_mission_running = is_mission_running
+        self.observations = observations or []
+        self.rewards = rewards or []
+        self.video_frames = video_frames or []
+        self.errors = errors or []
+        self.mission_control_messages = mission_control_messages or []
+        self.number_of_observations_since_last_state = len(self.observations)
+        self.number_of_rewards_since_last_state = len(self.rewards)
+        self.number_of_video_frames_since_last_state = len(self.video_frames)
+
+
+class MissionRecordSpec:
+    def __init__(self, destination=""):
+        self.destination = destination
+
+
+class ClientInfo:
+    def __init__(self, ip_address="127.0.0.1", control_port=10000):
+        self.ip_address = ip_address
+        self.control_port = control_port
+
+
+class ClientPool:
+    def __init__(self):
+        self.clients = []
+
+    def add(self, client_info):
+        self.clients.append(client_info)
+
+
+class MissionSpec:
+    """
+    Keeps the mission XML and the changes made through the MissionSpec methods used by the environments.
+    """
+
+    def __init__(self, xml="", validate=False):
+        self.xml = xml
+        self.root = ElementTree.fromstring(xml.strip().encode("utf-8")) if xml else None
+        self.viewpoint = 0
+        self.start = None
+        self.items = []
+
+    def setViewpoint(self, viewpoint):
+        self.viewpoint = viewpoint
+
+    def startAt(self, x, y, z):
+        self.start = (x, y, z)
+
+    def drawItem(self, x, y, z, item_type):
+        self.items.append((int(x), int(y), int(z), item_type))
+
+    def getAsXML(self, pretty_print=False):
+        return self.xml
+
+    def find(self, name):
+        """
+        :return: the first element of the mission with the given tag, without namespace, or None
+        """
+        if self.root is None:
+            return None
+        for element in self.root.iter():
+            if element.tag == MALMO_NS + name or element.tag == name:
+                return element
+        return None
+
+
+class FakeWorld:
+    """
+    The state of a running mission: the solid blocks of the arena, the agent, the items lying around and the
+    inventory.
+    """
+
+    def __init__(self, mission, saves_dir=None):
+        """
+        :param mission: the MissionSpec
+        :param saves_dir: directory /save-all writes the world to, like the saves directory of Minecraft
+        """
+        self.solid = {}
+        self.block_types = {}
+        self.items = {}
+        self.inventory = []
+        self.send_command_reward = 0.0
+        self.saves_dir = saves_dir
+        self.name = next(WORLD_NAMES)
+        self.create()
+
+        world_file = mission.find("FileWorldGenerator")
+        if world_file is not None:
+            with open(os.path.join(world_file.attrib["src"], "blocks.json")) as f:
+                for x, y, z, block_type in json.load(f):
+                    self.set_block(x, y, z, block_type)
+
+        decorator = mission.find("DrawingDecorator")
+        if decorator is not None:
+            for element in decorator:
+                tag = element.tag.replace(MALMO_NS, "")
+                if tag == "DrawCuboid":
+                    a = element.attrib
+                    self._draw(int(a["x1"]), int(a["y1"]), int(a["z1"]), int(a["x2"]), int(a["y2"]), int(a["z2"]),
+                               a["type"])
+                elif tag == "DrawBlock":
+                    a = element.attrib
+                    self._draw(int(a["x"]), int(a["y"]), int(a["z"]), int(a["x"]), int(a["y"]), int(a["z"]),
+                               a["type"])
+                elif tag == "DrawItem":
+                    a = element.attrib
+                    self.add_item(int(a["x"]), int(a["z"]), a["type"])
+
+        for x, y, z, item_type in mission.items:
+            self.add_item(x, z, item_type)
+
+        reward = mission.find("RewardForSendingCommand")
+        if reward is not None:
+            self.send_command_reward = float(reward.attrib.get("reward", 0))
+
+        start = mission.start
+        if start is None:
+            placement = mission.find("Placement")
+            if placement is not None:
+                start = (float(placement.attrib["x"]), float(placement.attrib["y"]), float(placement.attrib["z"]))
+            else:
+                start = (0.5, FEET_Y, 0.5)
+        self.x, self.z = int(start[0] // 1), int(start[2] // 1)
+        self.yaw = 0
+
+        self.pick_up()
+
+    def _draw(self, x1, y1, z1, x2, y2, z2, block_type):
+        # only the heights that matter for moving and looking around are kept
+        for y in (FEET_Y, EYE_Y):
+            if not min(y1, y2) <= y <= max(y1, y2):
+                continue
+            for x in xrange(min(x1, x2), max(x1, x2) + 1):
+                for z in xrange(min(z1, z2), max(z1, z2) + 1):
+                    self.set_block(x, y, z, block_type)
+
+    def set_block(self, x, y, z, block_type):
+        self.solid[(x, y, z)] = block_type != "air"
+        self.block_types[(x, y, z)] = block_type
+
+    def is_solid(self, x, y, z):
+        # everything that was not drawn is the stone of the flat world
+        return self.solid.get((x, y, z), True)
+
+    def is_free(self, x, z):
+        return not self.is_solid(x, FEET_Y, z) and not self.is_solid(x, EYE_Y, z)
+
+    def add_item(self, x, z, item_type):
+        self.items.setdefault((x, z), []).append(item_type)
+
+    def pick_up(self):
+        self.inventory.extend(self.items.pop((self.x, self.z), []))
+
+    def heading(self):
+        return HEADINGS[(self.yaw // 90) % 4]
+
+    def line_of_sight(self):
+        dx, dz = self.heading()
+        k = 1
+        while not self.is_solid(self.x + k * dx, EYE_Y, self.z + k * dz):
+            k += 1
+        hit_x, hit_z = self.x + k * dx, self.z + k * dz
+        return {u"hitType": u"block", u"type": self.block_types.get((hit_x, EYE_Y, hit_z), u"stone"),
+                u"x": hit_x, u"y": EYE_Y, u"z": hit_z, u"distance": k - 0.5, u"inRange": True}
+
+    def execute(self, command):
+        """
+        Carries out a command.
+        :return: False if the command is not known
+        """
+        verb, _, argument = command.partition(" ")
+        if verb == "move":
+            dx, dz = self.heading()
+            step = 1 if float(argument) > 0 else -1
+            if self.is_free(self.x + step * dx, self.z + step * dz):
+                self.x, self.z = self.x + step * dx, self.z + step * dz
+                self.pick_up()
+        elif verb == "turn":
+            self.yaw = (self.yaw + (90 if float(argument) > 0 else -90)) % 360
+        elif verb == "use":
+            if float(argument) > 0 and self.inventory:
+                # the held block is placed in front of the agent
+                dx, dz = self.heading()
+                if self.is_free(self.x + dx, self.z + dz):
+                    self.set_block(self.x + dx, FEET_Y, self.z + dz, self.inventory.pop(0))
+        elif verb == "tp":
+            x, y, z = [float(v) for v in argument.split()]
+            self.x, self.z = int(x // 1), int(z // 1)
+            self.pick_up()
+        elif verb == "setYaw":
+            self.yaw = int(float(argument)) % 360
+        elif verb == "chat":
+            return self.chat(argument)
+        elif verb not in ("jump", "quit"):
+            return False
+
+        return True
+
+    def chat(self, message):
+        words = message.split()
+        if not words:
+            return True
+        if words[0] == "/clear":
+            self.inventory = []
+        elif words[0] == "/kill":
+            self.items = {}
+        elif words[0] == "/fill" and len(words) >= 11 and words[9] == "replace":
+            x1, y1, z1, x2, y2, z2 = [int(w) for w in words[1:7]]
+            old = words[10].replace("minecraft:", "")
+            for (x, y, z), block_type in list(self.block_types.items()):
+                if block_type == old and min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2) \
+                        and min(z1, z2) <= z <= max(z1, z2):
+                    self.set_block(x, y, z, words[7])
+        elif words[0] == "/save-all":
+            self.save()
+        elif words[0] == "/summon":
+            match = re.search(r'id:"?(?:minecraft:)?([a-z_]+)', message)
+            if match is not None:
+                self.add_item(int(float(words[2])), int(float(words[4])), match.group(1))
+        else:
+            return False
+
+        return True
+
+    def create(self):
+        """
+        Writes the level.dat of a new world, like Minecraft does when it creates one; the blocks are only written by
+        /save-all.
+        """
+        if self.saves_dir is None:
+            return
+        world = os.path.join(self.saves_dir, self.name)
+        if not os.path.isdir(world):
+            os.makedirs(world)
+        with open(os.path.join(world, "level.dat"), "w") as f:
+            f.write(self.name)
+
+    def save(self):
+        """
+        Writes the blocks to the saves directory; the items and the agent are not part of a saved world.
+        """
+        if self.saves_dir is None:
+            return
+        world = os.path.join(self.saves_dir, self.name)
+        if not os.path.isdir(world):
+            os.makedirs(world)
+        with open(os.path.join(world, "blocks.json"), "w") as f:
+            json.dump([[x, y, z, block_type] for (x, y, z), block_type in self.block_types.items()], f)
+        with open(os.path.join(world, "level.dat"), "w") as f:
+            f.write(self.name)
+
+    def observation(self):
+        observation = {u"XPos": self.x + 0.5, u"YPos": float(FEET_Y), u"ZPos": self.z + 0.5,
+                       u"Yaw": float(self.yaw), u"Pitch": 0.0, u"LineOfSight": self.line_of_sight()}
+        for i in xrange(N_INVENTORY_SLOTS):
+            item = self.inventory[i] if i < len(self.inventory) else u"air"
+            observation[u"InventorySlot_%d_item" % i] = item
+            observation[u"InventorySlot_%d_size" % i] = 1 if i < len(self.inventory) else 0
+
+        return observation
+
+
+def constant(seconds):
+    return lambda rng: seconds
+
+
+def uniform(low, high):
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median, sigma):
+    """
+    Latency with a long tail: the median is exceeded by a factor of exp(sigma) about 16% of the time.
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def with_spikes(latency, rate, spike):
+    """
+    :param latency: latency distribution
+    :param rate: probability of a spike
+    :param spike: distribution of the extra latency of a spike, e.g. a garbage collection pause of the client
+    """
+    return lambda rng: latency(rng) + (spike(rng) if rng.random() < rate else 0.0)
+
+
+class Faults:
+    """
+    How late and how unreliable a fake mission is. The latencies are distributions like the ones above: callables
+    that take a random.Random and return seconds.
+    """
+
+    def __init__(self, observation_latency=None, command_latency=None, drop_rate=0.0, incomplete_rate=0.0,
+                 start_failure_rate=0.0, start_failures=0, command_drop_rate=0.0, seed=None):
+        """
+        :param observation_latency: time from the tick an observation is made at until it shows in the world state
+        :param command_latency: time from sendCommand until the command is carried out
+        :param drop_rate: probability that the observation of a tick is lost
+        :param incomplete_rate: probability that an observation comes without LineOfSight
+        :param start_failure_rate: probability that startMission fails
+        :param start_failures: number of times startMission fails on an agent host before it can succeed
+        :param command_drop_rate: probability that a command never reaches the mission
+        :param seed: seed of the random source of the faults
+        """
+        self.observation_latency = observation_latency
+        self.command_latency = command_latency
+        self.drop_rate = drop_rate
+        self.incomplete_rate = incomplete_rate
+        self.start_failure_rate = start_failure_rate
+        self.start_failures = start_failures
+        self.command_drop_rate = command_drop_rate
+        self.rng = random.Random(seed)
+
+
+# faults of the agent hosts created without any, e.g. by code that uses this module as MalmoPython
+default_faults = Faults()
+
+
+def set_default_faults(faults):
+    global default_faults
+    default_faults = faults
+
+
+class AgentHost:
+    """
+    Runs one mission at a time in process. Observations are produced once per tick, like the Malmo mod does, and
+    handed out by getWorldState together with the rewards collected since the previous call.
+    """
+
+    def __init__(self, tick_length=None, faults=None, saves_dir=None):
+        """
+        :param tick_length: seconds between two observations; defaults to the MsPerTick of the mission, or 50 ms
+        :param faults: Faults of the missions; defaults to default_faults
+        :param saves_dir: directory the worlds are saved to by /save-all
+        """
+        self.tick_length = tick_length
+        self.saves_dir = saves_dir
+        self.faults = faults if faults is not None else default_faults
+        self.failed_starts = 0
+        self.world = None
+        self.lock = threading.RLock()
+        self._reset_state()
+
+    def _reset_state(self):
+        self.has_mission_begun = False
+        self.is_mission_running = False
+        self.observations = []
+        self.rewards = []
+        self.errors = []
+        self.video_frames = []
+        self.pending_commands = []
+        self.in_flight = []
+        self.last_tick = 0.0
+        self.end_time = None
+        self.tick = 0.05
+        self.video = None
+
+    def startMission(self, mission, *args):
+        """
+        Accepts the same arguments as MalmoPython: (mission, mission_record) or
+        (mission, client_pool, mission_record, role, experiment_id).
+        """
+        with self.lock:
+            if self.is_mission_running:
+                raise RuntimeError("A mission is already running.")
+
+            faults = self.faults
+            if self.failed_starts < faults.start_failures or faults.rng.random() < faults.start_failure_rate:
+                self.failed_starts += 1
+                raise RuntimeError("Failed to find an available client for this mission - tried all the clients in "
+                                   "the supplied client pool.")
+
+            self._reset_state()
+            self.world = FakeWorld(mission, self.saves_dir)
+
+            ms_per_tick = mission.find("MsPerTick")
+            ms_per_tick = float(ms_per_tick.text) if ms_per_tick is not None else 50.0
+            self.tick = self.tick_length if self.tick_length is not None else ms_per_tick / 1000.0
+
+            video = mission.find("VideoProducer")
+            if video is not None:
+                self.video = (int(video.find(MALMO_NS + "Width").text), int(video.find(MALMO_NS + "Height").text))
+
+            time_up = mission.find("ServerQuitFromTimeUp")
+            if time_up is not None:
+                # the time limit is in game time; a game tick is 50 ms
+                ticks = float(time_up.attrib["timeLimitMs"]) / 50.0
+                self.end_time = time.time() + ticks * ms_per_tick / 1000.0
+
+            self.has_mission_begun = True
+            self.is_mission_running = True
+            self._observe(time.time())
+
+    def sendCommand(self, command):
+        with self.lock:
+            if not self.is_mission_running:
+                return
+            if command == "quit":
+                self.is_mission_running = False
+                return
+            if self.faults.command_drop_rate and self.faults.rng.random() < self.faults.command_drop_rate:
+                return
+            if self.faults.command_latency is None:
+                self._execute(command)
+            else:
+                due = time.time() + self.faults.command_latency(self.faults.rng)
+                if self.pending_commands:
+                    # commands are carried out in the order they were sent
+                    due = max(due, self.pending_commands[-1][0])
+                self.pending_commands.append((due, command))
+
+    def _execute(self, command):
+        if not self.world.execute(command):
+            logging.getLogger('fake_malmo.AgentHost').debug("Ignored command: %s", command)
+        if self.world.send_command_reward:
+            self.rewards.append(TimestampedReward(self.world.send_command_reward))
+
+    def getWorldState(self):
+        with self.lock:
+            world_state = self.peekWorldState()
+            self.observations = []
+            self.rewards = []
+            self.errors = []
+            self.video_frames = []
+            return world_state
+
+    def peekWorldState(self):
+        with self.lock:
+            self._advance(time.time())
+            return WorldState(self.has_mission_begun, self.is_mission_running, list(self.observations),
+                              list(self.rewards), list(self.video_frames), list(self.errors))
+
+    def _advance(self, now):
+        if not self.is_mission_running:
+            return
+        if self.end_time is not None and now >= self.end_time:
+            self.is_mission_running = False
+            return
+        while self.pending_commands and self.pending_commands[0][0] <= now:
+            self._execute(self.pending_commands.pop(0)[1])
+        if now - self.last_tick >= self.tick:
+            self._observe(now)
+        while self.in_flight and self.in_flight[0][0] <= now:
+            # like Malmo's default observation policy, only the latest observation is kept
+            self.observations = [self.in_flight.pop(0)[1]]
+
+    def _observe(self, now):
+        self.last_tick = now
+        if self.video is not None:
+            self.video_frames.append(self._render(now))
+        faults = self.faults
+        if faults.drop_rate and faults.rng.random() < faults.drop_rate:
+            return
+
+        observation = self.world.observation()
+        if faults.incomplete_rate and faults.rng.random() < faults.incomplete_rate:
+            del observation[u"LineOfSight"]
+        text = TimestampedString(json.dumps(observation), now)
+
+        if faults.observation_latency is None:
+            self.observations = [text]
+            return
+        due = now + faults.observation_latency(faults.rng)
+        if self.in_flight:
+            # observations arrive in the order they were made
+            due = max(due, self.in_flight[-1][0])
+        self.in_flight.append((due, text))
+
+    def _render(self, now):
+        # not a picture of the arena; the shade only tells how far the agent looks and which way it faces
+        width, height = self.video
+        line_of_sight = self.world.line_of_sight()
+        shade = int(255 / (1 + line_of_sight[u"distance"])) ^ (self.world.yaw // 90)
+        return TimestampedVideoFrame(width, height, 3, bytearray([shade]) * (width * height * 3), now)
@@ -0,0 +1,231 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import atexit
+import logging
+import threading
+import weakref
+import Queue
+
+import numpy as np
+
+# weights of the red, green and blue channels in the luma of a pixel (ITU-R BT.601)
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# threaded pipelines that are still open, stopped at exit; weak, so that dropped pipelines are collected
+_open_pipelines = weakref.WeakSet()
+
+
+@atexit.register
+def _close_pipelines():
+    for pipeline in list(_open_pipelines):
+        pipeline.close()
+
+
+def _work(queue, pipeline_ref):
+    """
+    Processes the frames of the queue until it gets None or the pipeline is gone.
+    :param pipeline_ref: weak reference to the FramePipeline
+    """
+    log = logging.getLogger('FramePipeline.work')
+    while True:
+        pixels = queue.get()
+        pipeline = pipeline_ref() if pixels is not None else None
+        if pipeline is None:
+            queue.task_done()
+            return
+        try:
+            pipeline._process(pixels)
+        except Exception as e:
+            log.error("Failed to process a frame: %s", e)
+        finally:
+            # not kept while waiting for the next frame
+            pipeline = None
+            queue.task_done()
+
+
+def frame_view(frame):
+    """
+    :param frame: a TimestampedVideoFrame
+    :return: the pixels of the frame as a (height, width, channels) uint8 array; a view of the buffer of the frame
+             when it exposes one, otherwise a copy
+    """
+    try:
+        pixels = np.frombuffer(frame.pixels, dtype=np.uint8)
+    except (TypeError, AttributeError, ValueError):
+        # older Malmo bindings expose the pixels as a sequence without the buffer interface
+        pixels = np.fromiter(frame.pixels, dtype=np.uint8, count=frame.width * frame.height * frame.channels)
+
+    return pixels.reshape((frame.height, frame.width, frame.channels))
+
+
+class FrameRing:
+    """
+    The last k frames in a preallocated array.
+    """
+
+    def __init__(self, k, shape, dtype=np.uint8):
+        self.frames = np.zeros((k,) + tuple(shape), dtype=dtype)
+        self.k = k
+        self.next = 0
+        self.count = 0
+
+    def push(self, frame):
+        self.frames[self.next] = frame
+        self.next = (self.next + 1) % self.k
+        self.count = min(self.count + 1, self.k)
+
+    def stacked(self, out=None):
+        """
+        :param out: array of the shape of the ring to write the frames to
+        :return: the frames from the oldest to the newest; slots that were never filled are zeros
+        """
+        order = (np.arange(self.k) + self.next) % self.k
+        return np.take(self.frames, order, axis=0, out=out)
+
+    def clear(self):
+        self.frames.fill(0)
+        self.next = 0
+        self.count = 0
+
+
+class FramePipeline:
+    """
+    Turns the video frames of the world states into a stack of the last k frames. The frames are optionally converted
+    to grayscale and resized with nearest neighbour sampling, on a worker thread unless threaded is False.
+    """
+
+    def __init__(self, width, height, channels=3, k=4, grayscale=False, size=None, threaded=True, queue_size=8):
+        """
+        :param width: width of the frames of the video producer
+        :param height: height of the frames of the video producer
+        :param channels: channels of the frames of the video producer
+        :param k: number of frames stacked
+        :param grayscale: if True, the frames are converted to grayscale
+        :param size: (width, height) to resize the frames to, or None
+        :param threaded: if True, the frames are processed on a worker thread
+        :param queue_size: number of frames waiting for the worker; the oldest are dropped when it falls behind
+        """
+        self.grayscale = grayscale
+        out_width, out_height = size if size is not None else (width, height)
+        self.rows = None
+        self.columns = None
+        if (out_width, out_height) != (width, height):
+            self.rows = (np.arange(out_height) * height // out_height).astype(np.intp)
+            self.columns = (np.arange(out_width) * width // out_width).astype(np.intp)
+
+        shape = (out_height, out_width) if grayscale else (out_height, out_width, channels)
+        self.ring = FrameRing(k, shape)
+        self.lock = threading.Lock()
+        self.n_frames = 0
+        self.n_dropped = 0
+
+        self.queue = None
+        self.worker = None
+        if threaded:
+            self.queue = Queue.Queue(maxsize=queue_size)
+            # the worker only holds a weak reference, so that a pipeline that is dropped without close is collected
+            self.worker = threading.Thread(target=_work, args=(self.queue, weakref.ref(self)), name="FramePipeline")
+            self.worker.daemon = True
+            self.worker.start()
+            _open_pipelines.add(self)
+
+    def submit(self, frames):
+        """
+        :param frames: the video_frames of a world state
+        """
+        for frame in frames:
+            pixels = frame_view(frame)
+            if self.queue is None:
+                self._process(pixels)
+                continue
+            while True:
+                try:
+                    self.queue.put_nowait(pixels)
+                    break
+                except Queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.queue.task_done()
+                        self.n_dropped += 1
+                    except Queue.Empty:
+                        pass
+
+    def _process(self, pixels):
+        if self.rows is not None:
+            pixels = pixels[self.rows[:, None], self.columns]
+        if self.grayscale:
+            pixels = np.dot(pixels[..., :3], LUMA).astype(np.uint8)
+        with self.lock:
+            self.ring.push(pixels)
+            self.n_frames += 1
+
+    def flush(self):
+        """
+        Waits until the frames submitted so far have been processed.
+        """
+        if self.queue is not None:
+            self.queue.join()
+
+    def stacked(self, out=None):
+        """
+        :return: the last k processed frames, from the oldest to the newest
+        """
+        with self.lock:
+            return self.ring.stacked(out)
+
+    def close(self, timeout=1.0):
+        """
+        Stops the worker thread, and waits for it to finish the frames submitted so far.
+        :param timeout: seconds to wait for the worker
+        """
+        if self.queue is not None:
+            self.queue.put(None)
+            self.worker.join(timeout)
+            if self.worker.is_alive():
+                logging.getLogger('FramePipeline.close').warning("The worker did not stop within %s s", timeout)
+            self.worker = None
+            self.queue = None
+            _open_pipelines.discard(self)
+
+    def __del__(self):
+        # stops the worker of a pipeline dropped without close; if the queue is full, the worker stops at its next
+        # frame, finding the pipeline gone
+        if self.queue is not None:
+            try:
+                self.queue.put_nowait(None)
+            except Queue.Full:
+                pass
+
+    def clear(self):
+        self.flush()
+        with self.lock:
+            self.ring.clear()
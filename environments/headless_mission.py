@@ -0,0 +1,316 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from pyrl.rlglue import TaskSpecRLGlue
+from pyrl.rlglue.registry import register_environment
+from pyrl.environments import mission_layout
+
+
+class GridMissionEngine:
+    """
+    Pure NumPy simulation of the SimpleMalmoEnvironment mission. Steps a batch of independent arenas at once, each
+    with its own agent, source item and destination. All the arenas share the same layout.
+
+    The simulation follows the Malmo mission:
+        - the arena spans the cells [0, size[0]] x [0, size[1]] and is walled in
+        - obstacles block the cell they are drawn on, landmarks are part of the floor
+        - every command sent to Malmo costs -1 (RewardForSendingCommand)
+        - walking onto the source landmark picks up the item: +11
+        - "use" at the destination while holding the item puts it down: +21 and the episode ends
+        - "use" anywhere else while holding the item is not sent to Malmo and costs -10
+    """
+
+    def __init__(self, batch_size=1, size=None, landmarks=None, obstacles=None, auto_reset=False, seed=None):
+        """
+        :param batch_size: number of independent arenas that are stepped together
+        :param size: size of the arena [x, z]; defaults to the layout of the simple mission
+        :param landmarks: list of [x, z] landmark locations
+        :param obstacles: list of [x, y, direction] obstacles, as used by SimpleMalmoEnvironment
+        :param auto_reset: if True, arenas that reach a terminal state are reset within step and the observation
+                           returned for them is the first observation of their new episode
+        :param seed: seed for the random source/destination/start selection
+        """
+        self.batch_size = batch_size
+        self.size = list(size) if size is not None else list(mission_layout.SIZE)
+        self.landmarks = [list(l) for l in (landmarks if landmarks is not None else mission_layout.LANDMARKS)]
+        self.obstacles = [list(o) for o in (obstacles if obstacles is not None else mission_layout.OBSTACLES)]
+        self.auto_reset = auto_reset
+        self.rng = np.random.RandomState(seed)
+
+        if len(self.landmarks) < 2:
+            raise ValueError("The mission needs at least two landmarks, got %d" % len(self.landmarks))
+
+        self.n_landmarks = len(self.landmarks)
+        self.landmark_x = np.array([l[0] for l in self.landmarks], dtype=np.int64)
+        self.landmark_z = np.array([l[1] for l in self.landmarks], dtype=np.int64)
+
+        self.blocked = np.zeros((self.size[0] + 1, self.size[1] + 1), dtype=bool)
+        for cx, cz in mission_layout.obstacle_cells(self.size, self.obstacles):
+            self.blocked[cx, cz] = True
+
+        self.next_x, self.next_z, self.distance = self._build_tables()
+
+        # state of every arena in the batch
+        self.x = np.zeros(batch_size, dtype=np.int64)
+        self.z = np.zeros(batch_size, dtype=np.int64)
+        self.direction = np.zeros(batch_size, dtype=np.int64)
+        self.source = np.zeros(batch_size, dtype=np.int64)
+        self.destination = np.zeros(batch_size, dtype=np.int64)
+        self.item_location = np.zeros(batch_size, dtype=np.int64)
+        self.has_item = np.zeros(batch_size, dtype=bool)
+        self.done = np.ones(batch_size, dtype=bool)
+
+        # observation buffers that are handed out to the caller
+        self.intobs = np.zeros((batch_size, 5), dtype=np.int64)
+        self.floatobs = np.zeros((batch_size, 1), dtype=np.float64)
+
+    def _build_tables(self):
+        """
+        Precomputes, for every cell and heading, the cell reached by "move 1" and the distance reported by the
+        LineOfSight ray, measured from the centre of the cell to the face of the first solid block.
+        """
+        width, depth = self.blocked.shape
+        next_x = np.zeros((width, depth, 4), dtype=np.int64)
+        next_z = np.zeros((width, depth, 4), dtype=np.int64)
+        distance = np.zeros((width, depth, 4), dtype=np.float64)
+
+        def is_free(cx, cz):
+            return 0 <= cx < width and 0 <= cz < depth and not self.blocked[cx, cz]
+
+        for cx in xrange(width):
+            for cz in xrange(depth):
+                for d, (dx, dz) in enumerate(mission_layout.HEADINGS):
+                    if is_free(cx + dx, cz + dz):
+                        next_x[cx, cz, d], next_z[cx, cz, d] = cx + dx, cz + dz
+                    else:
+                        next_x[cx, cz, d], next_z[cx, cz, d] = cx, cz
+
+                    k = 1
+                    while is_free(cx + k * dx, cz + k * dz):
+                        k += 1
+                    distance[cx, cz, d] = k - 0.5
+
+        return next_x, next_z, distance
+
+    def reset(self, mask=None):
+        """
+        Starts new episodes: picks the source, the destination and the start landmark for each arena the same way
+        SimpleMalmoEnvironment.reset does.
+        :param mask: boolean array of the arenas to reset; all the arenas are reset if None
+        :return: intobs, floatobs arrays of shape (batch_size, 5) and (batch_size, 1)
+        """
+        if mask is None:
+            idx = np.arange(self.batch_size)
+        else:
+            idx = np.flatnonzero(mask)
+
+        n = len(idx)
+        if n > 0:
+            n_landmarks = self.n_landmarks
+            source = self.rng.randint(n_landmarks, size=n)
+            # destination and start are drawn uniformly from the landmarks other than the source
+            destination = (source + self.rng.randint(1, n_landmarks, size=n)) % n_landmarks
+            start = (source + self.rng.randint(1, n_landmarks, size=n)) % n_landmarks
+
+            self.source[idx] = source
+            self.destination[idx] = destination
+            self.item_location[idx] = source
+            self.x[idx] = self.landmark_x[start]
+            self.z[idx] = self.landmark_z[start]
+            self.direction[idx] = 0
+            self.has_item[idx] = False
+            self.done[idx] = False
+
+        return self._observe()
+
+    def step(self, actions):
+        """
+        Executes one action in each of the arenas. Arenas whose episode is over are left untouched and report a
+        terminal state until they are reset.
+        :param actions: integer array of shape (batch_size,) with indices into mission_layout.ACTIONS
+        :return: intobs, floatobs, rewards, terminals
+        """
+        actions = np.asarray(actions)
+        live = ~self.done
+
+        move = live & (actions == 0)
+        turn_right = live & (actions == 1)
+        turn_left = live & (actions == 2)
+        use = live & (actions == 3)
+
+        x, z, direction = self.x, self.z, self.direction
+        new_x = self.next_x[x, z, direction]
+        new_z = self.next_z[x, z, direction]
+        np.copyto(x, new_x, where=move)
+        np.copyto(z, new_z, where=move)
+        direction += turn_right
+        direction -= turn_left
+        direction %= 4
+
+        at_destination = (x == self.landmark_x[self.destination]) & (z == self.landmark_z[self.destination])
+        holding = self.has_item.copy()
+
+        # "use" is only sent to Malmo when the agent stands on the destination
+        sent = move | turn_right | turn_left | (use & at_destination)
+        rewards = -sent.astype(np.float64)
+
+        picked = live & ~holding & (x == self.landmark_x[self.source]) & (z == self.landmark_z[self.source])
+        self.has_item |= picked
+        self.item_location[picked] = self.n_landmarks
+        rewards += 11.0 * picked
+
+        put = use & holding & at_destination
+        rewards += 21.0 * put
+        rewards -= 10.0 * (use & holding & ~at_destination)
+
+        self.done |= put
+        terminals = self.done.astype(np.int64)
+
+        if self.auto_reset and put.any():
+            intobs, floatobs = self.reset(put)
+        else:
+            intobs, floatobs = self._observe()
+
+        return intobs, floatobs, rewards, terminals
+
+    def _observe(self):
+        intobs = self.intobs
+        intobs[:, 0] = self.x
+        intobs[:, 1] = self.z
+        intobs[:, 2] = self.direction
+        intobs[:, 3] = self.item_location
+        intobs[:, 4] = self.destination
+        self.floatobs[:, 0] = self.distance[self.x, self.z, self.direction]
+        return intobs, self.floatobs
+
+
+@register_environment
+class HeadlessMalmoEnvironment:
+    """
+    Drop in replacement for SimpleMalmoEnvironment that does not need Minecraft. With batch_size 1 it returns the
+    same observations as SimpleMalmoEnvironment; with a larger batch it returns the same dictionary with the
+    "intobs" and "floatobs" stacked into arrays, one row per arena.
+    """
+    name = 'HeadlessMalmoEnvironment'
+
+    def __init__(self, batch_size=1, size=None, landmarks=None, obstacles=None, auto_reset=False, seed=None):
+        log = logging.getLogger('HeadlessMalmoEnvironment.init')
+
+        self.actions = list(mission_layout.ACTIONS)
+        self.landmark_types = list(mission_layout.LANDMARK_TYPES)
+
+        self.engine = GridMissionEngine(batch_size=batch_size, size=size, landmarks=landmarks, obstacles=obstacles,
+                                        auto_reset=auto_reset, seed=seed)
+        self.batch_size = batch_size
+        self.size = self.engine.size
+        self.landmarks = self.engine.landmarks
+        self.obstacles = self.engine.obstacles
+
+        log.debug("Headless environment with %d arenas of size %s", batch_size, self.size)
+
+    @property
+    def is_get_completed(self):
+        if self.batch_size == 1:
+            return bool(self.engine.has_item[0])
+        return self.engine.has_item.copy()
+
+    def makeTaskSpec(self):
+        ts = TaskSpecRLGlue.TaskSpec(discount_factor=0.9, reward_range=(-10.0, 20.0))
+        ts.addDiscreteAction((0, len(self.actions) - 1))
+        ts.addDiscreteObservation((0, self.size[0]))
+        ts.addDiscreteObservation((0, self.size[1]))
+        ts.addDiscreteObservation((0, 3))
+        ts.addDiscreteObservation((0, len(self.landmarks)))
+        ts.addDiscreteObservation((0, len(self.landmarks) - 1))
+        ts.addContinuousObservation((0.0, float(self.engine.distance.max())))
+        ts.setEpisodic()
+        ts.setExtra(self.name)
+
+        return ts.toTaskSpec()
+
+    def env_init(self):
+        return self.makeTaskSpec()
+
+    def env_start(self):
+        intobs, floatobs = self.engine.reset()
+        return self._make_observation(intobs, floatobs)
+
+    def env_step(self, thisAction):
+        """
+        :param thisAction: index of the action; an array of indices, one per arena, when batch_size > 1
+        :return: observation, reward, terminal
+        """
+        if self.batch_size == 1:
+            intobs, floatobs, rewards, terminals = self.engine.step([thisAction])
+            return self._make_observation(intobs, floatobs), float(rewards[0]), int(terminals[0])
+
+        intobs, floatobs, rewards, terminals = self.engine.step(thisAction)
+        return self._make_observation(intobs, floatobs), rewards, terminals
+
+    def env_cleanup(self):
+        pass
+
+    def env_message(self, message):
+        return ""
+
+    def _make_observation(self, intobs, floatobs):
+        if self.batch_size == 1:
+            return {"intobs": intobs[0].tolist(), "floatobs": floatobs[0].tolist()}
+        return {"intobs": intobs.copy(), "floatobs": floatobs.copy()}
+
+
+def main():
+    logging.basicConfig()
+    log = logging.getLogger('HeadlessMalmoEnvironment')
+    log.setLevel('INFO')
+
+    batch_size = 1024
+    n_steps = 1000
+
+    engine = GridMissionEngine(batch_size=batch_size, auto_reset=True, seed=0)
+    engine.reset()
+    actions = engine.rng.randint(len(mission_layout.ACTIONS), size=(n_steps, batch_size))
+
+    start = time.time()
+    for i in xrange(n_steps):
+        engine.step(actions[i])
+    elapsed = time.time() - start
+
+    log.info("%d steps in %.3f s: %.0f steps/s", n_steps * batch_size, elapsed, n_steps * batch_size / elapsed)
+
+
+if __name__ == '__main__':
+    main()
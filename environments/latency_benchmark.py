@@ -0,0 +1,114 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from pyrl.environments import fake_malmo
+from pyrl.environments.malmo_client import MalmoClient
+from pyrl.environments.simple_mission import SimpleMalmoEnvironment
+
+
+def run(faults, n_episodes, n_steps, speedup=1.0, soft_reset=False, observation_deadline=2.0):
+    """
+    Runs a random agent in a SimpleMalmoEnvironment on a fake Malmo with the given faults.
+    :param faults: fake_malmo.Faults
+    :param n_episodes: number of episodes
+    :param n_steps: maximum number of steps per episode
+    :return: number of steps, seconds spent in them, summary of the observation waits, summary of the mission starts
+             and the number of attempts it took to start the missions
+    """
+    client = MalmoClient(fake_malmo.AgentHost(faults=faults), observation_deadline=observation_deadline / speedup)
+    env = SimpleMalmoEnvironment(client=client, malmo=fake_malmo, speedup=speedup, soft_reset=soft_reset,
+                                 retry_delay=0.1)
+    actions = range(len(env.actions))
+
+    total_steps = 0
+    step_time = 0.0
+    for e in xrange(n_episodes):
+        env.env_start()
+        start = time.time()
+        for i in xrange(n_steps):
+            obs, reward, terminal = env.env_step(random.choice(actions))
+            total_steps += 1
+            if terminal:
+                break
+        step_time += time.time() - start
+
+    attempts = sum(record.attempts for record in env.startup_records)
+    env.agent_host.sendCommand("quit")
+    return total_steps, step_time, env.waiter.summary(), env.startup_summary(), attempts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure SimpleMalmoEnvironment on a fake Malmo with late, lost and '
+                                                 'incomplete observations and failing mission starts.')
+    parser.add_argument("--episodes", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=100, help="maximum steps per episode")
+    parser.add_argument("--speedup", type=float, default=1.0)
+    parser.add_argument("--soft-reset", action="store_true")
+    parser.add_argument("--median", type=float, default=0.01, help="median observation latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.5, help="sigma of the lognormal observation latency")
+    parser.add_argument("--spike-rate", type=float, default=0.01, help="probability of a latency spike")
+    parser.add_argument("--spike", type=float, default=0.5, help="maximum length of a latency spike in seconds")
+    parser.add_argument("--command-latency", type=float, default=0.0, help="seconds until a command is carried out")
+    parser.add_argument("--drop", type=float, default=0.01, help="probability that an observation is lost")
+    parser.add_argument("--incomplete", type=float, default=0.01, help="probability of an observation without ray")
+    parser.add_argument("--start-failures", type=float, default=0.2, help="probability that a mission start fails")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # the environment logs every failed action of the random agent and every incomplete observation
+    logging.basicConfig(level=logging.CRITICAL)
+    log = logging.getLogger('LatencyBenchmark')
+    log.setLevel('INFO')
+
+    random.seed(args.seed)
+    faults = fake_malmo.Faults(
+        observation_latency=fake_malmo.with_spikes(fake_malmo.lognormal(args.median, args.sigma), args.spike_rate,
+                                                   fake_malmo.uniform(0.0, args.spike)),
+        command_latency=fake_malmo.constant(args.command_latency) if args.command_latency > 0 else None,
+        drop_rate=args.drop, incomplete_rate=args.incomplete, start_failure_rate=args.start_failures, seed=args.seed)
+
+    n_steps, elapsed, waits, starts, attempts = run(faults, args.episodes, args.steps, args.speedup, args.soft_reset)
+
+    log.info("%d steps in %.3f s: %.1f steps/s", n_steps, elapsed, n_steps / elapsed)
+    log.info("observation waits: p50 %.4f s, p99 %.4f s, max %.4f s; %d timeouts, %d incomplete", waits["p50"],
+             waits["p99"], waits["max"], waits["timeouts"], waits["incomplete"])
+    if "total_time_mean" in starts:
+        log.info("mission starts: %d in %d attempts, mean %.3f s, max %.3f s", starts["episodes"], attempts,
+                 starts["total_time_mean"], starts["total_time_max"])
+
+
+if __name__ == '__main__':
+    main()
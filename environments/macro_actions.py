@@ -0,0 +1,121 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import collections
+
+from pyrl.environments import mission_layout
+
+# outcome of a macro action; primitive_steps is the number of commands it sent, round_trips the number of
+# observations it waited for
+MacroResult = collections.namedtuple('MacroResult', ['observation', 'reward', 'terminal', 'primitive_steps',
+                                                     'round_trips'])
+
+
+class Repeat:
+    """
+    Action repeat: the same primitive action several times in a row, with the rewards summed up.
+    """
+
+    def __init__(self, action, times):
+        """
+        :param action: index of the primitive action
+        :param times: number of times to take it
+        """
+        self.action = action
+        self.times = times
+
+    def plan(self, actions, direction):
+        return [self.action] * self.times
+
+    def __repr__(self):
+        return "Repeat(%r, %d)" % (self.action, self.times)
+
+
+class TurnToHeading:
+    """
+    Turns the agent, the shortest way round, to face a heading: 0: south, 1: west, 2: north, 3: east.
+    """
+
+    def __init__(self, heading):
+        self.heading = heading % 4
+
+    def plan(self, actions, direction):
+        turns = (self.heading - direction) % 4
+        if turns == 3:
+            return [actions.index("turn -1")]
+        return [actions.index("turn 1")] * turns
+
+    def __repr__(self):
+        return "TurnToHeading(%d)" % self.heading
+
+
+class AdvanceCells:
+    """
+    Moves the agent forward by a number of cells; moves into a blocked cell leave the agent where it is.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    def plan(self, actions, direction):
+        return [actions.index("move 1")] * self.cells
+
+    def __repr__(self):
+        return "AdvanceCells(%d)" % self.cells
+
+
+def blocked_cells(size, obstacles):
+    """
+    :return: set of the (x, z) cells of the arena the agent cannot enter
+    """
+    return set(tuple(cell) for cell in mission_layout.obstacle_cells(size, obstacles))
+
+
+def predict(size, blocked, x, z, direction, commands):
+    """
+    Plays discrete movement commands on the layout of the arena, the way Minecraft carries them out.
+    :param size: size of the arena [x, z]; cells outside 0..size are solid
+    :param blocked: set of blocked (x, z) cells, see blocked_cells
+    :param commands: Malmo commands, e.g. "move 1"
+    :return: x, z and direction of the agent after the commands
+    """
+    for command in commands:
+        verb, _, argument = command.partition(" ")
+        if verb == "move":
+            step = 1 if float(argument) > 0 else -1
+            dx, dz = mission_layout.HEADINGS[direction]
+            nx, nz = x + step * dx, z + step * dz
+            if 0 <= nx <= size[0] and 0 <= nz <= size[1] and (nx, nz) not in blocked:
+                x, z = nx, nz
+        elif verb == "turn":
+            direction = (direction + (1 if float(argument) > 0 else -1)) % 4
+
+    return x, z, direction
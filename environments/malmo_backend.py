@@ -0,0 +1,53 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import importlib
+import os
+
+# modules that provide the MalmoPython classes: the Malmo bindings, or the in-process fake for machines without
+# Minecraft
+BACKENDS = {"malmo": "MalmoPython", "fake": "pyrl.environments.fake_malmo"}
+
+# environment variable that selects the backend when none is given
+BACKEND_VARIABLE = "PYRL_MALMO_BACKEND"
+
+
+def load(name=None):
+    """
+    :param name: "malmo" or "fake"; defaults to the value of PYRL_MALMO_BACKEND, or "malmo"
+    :return: the module that provides AgentHost, MissionSpec, MissionRecordSpec, ClientPool and ClientInfo
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_VARIABLE, "malmo")
+    if name not in BACKENDS:
+        raise ValueError("Unknown Malmo backend %r; expected one of %s" % (name, sorted(BACKENDS.keys())))
+
+    return importlib.import_module(BACKENDS[name])
@@ -0,0 +1,124 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import time
+
+from pyrl.environments.observation_wait import ObservationWaiter, StartupRecord
+
+
+class MissionStartError(RuntimeError):
+    """
+    Raised when a mission could not be started on a client within the allowed retries.
+    """
+    pass
+
+
+class MalmoClient:
+    """
+    An agent host, the pool of Minecraft clients its missions are started on, and the waiter that polls it for
+    observations. With no client pool, Malmo starts the missions on the default client at 127.0.0.1:10000.
+    """
+
+    def __init__(self, agent_host, client_pool=None, observation_deadline=2.0, experiment_id="simple_mission"):
+        """
+        :param agent_host: the MalmoPython.AgentHost
+        :param client_pool: MalmoPython.ClientPool with the client(s) to run the missions on, or None
+        :param observation_deadline: seconds to wait for an observation before the wait is reported as timed out
+        :param experiment_id: id passed to Malmo when the mission is started on a client pool
+        """
+        self.agent_host = agent_host
+        self.client_pool = client_pool
+        self.experiment_id = experiment_id
+        self.waiter = ObservationWaiter(agent_host, deadline=observation_deadline)
+
+    def start_mission(self, mission, mission_record):
+        if self.client_pool is None:
+            self.agent_host.startMission(mission, mission_record)
+        else:
+            self.agent_host.startMission(mission, self.client_pool, mission_record, 0, self.experiment_id)
+
+    def launch(self, mission, mission_record, startup_timeout, retry_delay, retries=3):
+        """
+        Starts the mission and waits until it has begun and sent its first complete observation. The previous mission
+        on this client has to be over first; quit has to be sent before calling this.
+        :param mission: the MissionSpec to start
+        :param mission_record: the MissionRecordSpec of the mission
+        :param startup_timeout: seconds to wait for the mission to begin, and then for its first observation
+        :param retry_delay: seconds to wait before the first retry of a failed start; doubles every retry
+        :param retries: number of times the mission is started before giving up
+        :return: WaitResult with the first observation, StartupRecord of the start
+        :raises MissionStartError: if the mission did not begin after all the retries
+        """
+        log = logging.getLogger('MalmoClient.launch')
+
+        start = time.time()
+
+        # the mission from the previous episode has to be over before a new one can be started
+        if not self.waiter.wait_for_mission_end(startup_timeout):
+            log.warn("Previous mission still running after %.1f s", startup_timeout)
+
+        for retry in range(retries):
+            try:
+                self.start_mission(mission, mission_record)
+            except RuntimeError as e:
+                if retry == retries - 1:
+                    raise MissionStartError("Error starting mission: %s" % e)
+                log.warn("Error starting mission, retrying: %s", e)
+                time.sleep(retry_delay * 2 ** retry)
+                continue
+
+            if self.waiter.wait_for_mission_begin(startup_timeout):
+                break
+            if retry == retries - 1:
+                raise MissionStartError("Mission did not begin within %.1f s" % startup_timeout)
+            log.warn("Mission did not begin within %.1f s, retrying", startup_timeout)
+
+        begin_time = time.time() - start
+
+        # the episode starts with the first complete observation; anything collected before it is not part of it
+        self.waiter.pending_reward = 0.0
+        result = self.waiter.wait(deadline=startup_timeout)
+
+        total_time = time.time() - start
+        log.info("Mission started in %.3f s (begun after %.3f s, %d attempts)", total_time, begin_time, retry + 1)
+
+        return result, StartupRecord(retry + 1, begin_time, total_time - begin_time, total_time)
+
+    def reconnect(self, malmo):
+        """
+        :param malmo: module that provides the Malmo classes
+        :return: a client on a new agent host, with the same client pool and observation deadline
+        """
+        return MalmoClient(malmo.AgentHost(), self.client_pool, self.waiter.deadline, self.experiment_id)
+
+    def is_mission_running(self):
+        return self.agent_host.peekWorldState().is_mission_running
@@ -0,0 +1,193 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import threading
+
+import numpy as np
+
+from pyrl.rlglue.registry import register_environment
+from pyrl.environments import malmo_backend
+from pyrl.environments.malmo_client import MalmoClient
+from pyrl.environments.simple_mission import SimpleMalmoEnvironment
+
+
+class MalmoClientPool:
+    """
+    Owns one agent host per Minecraft client, each one bound to its client through a ClientPool holding only that
+    client, so that every environment of a VectorSimpleMalmoEnvironment runs its missions on its own Minecraft.
+    """
+
+    def __init__(self, ports, host="127.0.0.1", malmo=None, observation_deadline=2.0):
+        """
+        :param ports: Malmo control ports of the Minecraft clients, one per environment
+        :param host: address of the machine running the clients
+        :param malmo: module that provides the Malmo classes, or the name of a malmo_backend; defaults to the backend
+                      selected by PYRL_MALMO_BACKEND
+        :param observation_deadline: seconds to wait for an observation before the wait is reported as timed out
+        """
+        self.malmo = malmo if malmo is not None and not isinstance(malmo, basestring) else malmo_backend.load(malmo)
+        self.host = host
+        self.ports = list(ports)
+        self.clients = []
+
+        for port in self.ports:
+            client_pool = self.malmo.ClientPool()
+            client_pool.add(self.malmo.ClientInfo(host, port))
+            self.clients.append(MalmoClient(self.malmo.AgentHost(), client_pool,
+                                            observation_deadline=observation_deadline,
+                                            experiment_id="simple_mission_%d" % port))
+
+    def __len__(self):
+        return len(self.clients)
+
+
+@register_environment
+class VectorSimpleMalmoEnvironment:
+    """
+    Runs one SimpleMalmoEnvironment per Minecraft client and steps them together. The actions of all the
+    environments are sent before any of their observations is waited for, so the round trips overlap.
+    Observations are the same dictionary as for SimpleMalmoEnvironment, with "intobs", "floatobs" and, for a profile
+    with video, "pixels" stacked into arrays, one row per environment. floatobs has a column for the ray if the
+    profile has one, which is NaN when the ray reported no distance.
+    """
+    name = 'VectorSimpleMalmoEnvironment'
+
+    def __init__(self, ports=(10000,), host="127.0.0.1", malmo=None, observation_deadline=2.0, speedup=1.0,
+                 **env_params):
+        """
+        :param ports: Malmo control ports of the Minecraft clients, one per environment
+        :param host: address of the machine running the clients
+        :param malmo: module that provides the Malmo classes, or the name of a malmo_backend
+        :param observation_deadline: seconds to wait for an observation before the wait is reported as timed out
+        :param speedup: how many times faster than real time Minecraft runs, see SimpleMalmoEnvironment
+        :param env_params: further parameters for every SimpleMalmoEnvironment
+        """
+        log = logging.getLogger('VectorSimpleMalmoEnvironment.init')
+
+        self.pool = MalmoClientPool(ports, host, malmo, observation_deadline / float(speedup))
+        # the environments are started on threads of their own, so each one gets its own stream of a BlockRandom
+        rng = env_params.pop("rng", None)
+        self.envs = []
+        for i, client in enumerate(self.pool.clients):
+            if rng is not None:
+                env_params["rng"] = rng.spawn("env", i) if hasattr(rng, "spawn") else rng
+            self.envs.append(SimpleMalmoEnvironment(observation_deadline=observation_deadline, client=client,
+                                                    malmo=malmo, speedup=speedup, **env_params))
+        self.n_envs = len(self.envs)
+        self.actions = self.envs[0].actions
+
+        profile = self.envs[0].observation_profile
+        self.intobs = np.zeros((self.n_envs, 5), dtype=np.int64)
+        self.floatobs = np.zeros((self.n_envs, 1 if profile.ray else 0), dtype=np.float64)
+        self.pixels = None
+        if self.envs[0].frames is not None:
+            self.pixels = np.zeros((self.n_envs,) + self.envs[0].frames.ring.frames.shape, dtype=np.uint8)
+        self.done = np.ones(self.n_envs, dtype=bool)
+
+        log.info("Vector environment over %d clients on ports %s", self.n_envs, self.pool.ports)
+
+    def reset_all(self):
+        """
+        Starts a new episode in every environment; the missions are started in parallel.
+        :return: stacked observation
+        """
+        log = logging.getLogger('VectorSimpleMalmoEnvironment.resetAll')
+
+        observations = [None] * self.n_envs
+        errors = []
+
+        def start(i):
+            try:
+                observations[i] = self.envs[i].env_start()
+            except Exception as e:
+                log.error("Environment %d failed to start: %s", i, e)
+                errors.append(e)
+
+        threads = [threading.Thread(target=start, args=(i,)) for i in xrange(self.n_envs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+        for i, observation in enumerate(observations):
+            self._store(i, observation)
+        self.done[:] = False
+
+        return self._stacked()
+
+    def step(self, actions):
+        """
+        Executes one action in every environment whose episode is not over. Finished environments report a terminal
+        state and zero reward until reset_all is called.
+        :param actions: sequence of action indices, one per environment
+        :return: stacked observation, rewards, terminals
+        """
+        statuses = [None] * self.n_envs
+        for i, env in enumerate(self.envs):
+            if not self.done[i]:
+                statuses[i] = env.send_action(int(actions[i]))
+
+        rewards = np.zeros(self.n_envs, dtype=np.float64)
+        for i, env in enumerate(self.envs):
+            if not self.done[i]:
+                observation, rewards[i], terminal = env.makeObservation(statuses[i])
+                self._store(i, observation)
+                self.done[i] = terminal
+
+        return self._stacked(), rewards, self.done.astype(np.int64)
+
+    def env_start(self):
+        return self.reset_all()
+
+    def env_step(self, thisAction):
+        return self.step(thisAction)
+
+    def env_cleanup(self):
+        for env in self.envs:
+            env.agent_host.sendCommand("quit")
+
+    def _store(self, i, observation):
+        # a mission that ended returns an empty observation; the last one is kept for it
+        if observation:
+            self.intobs[i] = observation["intobs"]
+            if self.floatobs.shape[1]:
+                self.floatobs[i] = observation["floatobs"] if observation["floatobs"] else np.nan
+            if self.pixels is not None:
+                self.pixels[i] = observation["pixels"]
+
+    def _stacked(self):
+        stacked = {"intobs": self.intobs.copy(), "floatobs": self.floatobs.copy()}
+        if self.pixels is not None:
+            stacked["pixels"] = self.pixels.copy()
+        return stacked
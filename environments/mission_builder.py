@@ -0,0 +1,186 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import collections
+import re
+
+# observation handlers a mission can enable; video is None or the (width, height) of the frames
+ObservationProfile = collections.namedtuple('ObservationProfile', ['name', 'full_stats', 'ray', 'inventory',
+                                                                   'discrete_cell', 'video'])
+
+PROFILES = {
+    # position, yaw and inventory: everything intobs needs
+    "symbolic": ObservationProfile("symbolic", True, False, True, False, None),
+    # plus the LineOfSight ray for floatobs
+    "symbolic+ray": ObservationProfile("symbolic+ray", True, True, True, False, None),
+    # every handler the mission used to enable, including the 480x320 video
+    "full": ObservationProfile("full", True, True, True, True, (480, 320)),
+}
+
+PIXELS_PROFILE = re.compile(r'^pixels@(\d+)x(\d+)$')
+
+FLAT_WORLD = "3;7,220*1,5*3,2;3;,biome_1"
+
+
+def lookup_profile(profile):
+    """
+    :param profile: an ObservationProfile, the name of one in PROFILES, or "pixels@WxH" for the symbolic
+                    observations and the ray together with WxH video frames
+    :return: the ObservationProfile
+    """
+    if isinstance(profile, ObservationProfile):
+        return profile
+    if profile in PROFILES:
+        return PROFILES[profile]
+
+    match = PIXELS_PROFILE.match(profile)
+    if match is None:
+        raise ValueError("Unknown observation profile %r; expected one of %s or pixels@WxH" %
+                         (profile, sorted(PROFILES.keys())))
+
+    return ObservationProfile(profile, True, True, True, False, (int(match.group(1)), int(match.group(2))))
+
+
+class MissionBuilder:
+    """
+    Builds the XML of a mission from its settings. Only the observation handlers of the chosen profile are
+    emitted, so missions that do not use pixels do not make Minecraft render and send video frames.
+    """
+
+    def __init__(self, profile="symbolic+ray", summary="Simple Malmo Environment", agent_name="ButterFingers",
+                 mode="Survival", time_limit_ms=50000, send_command_reward=-1, viewpoint=1,
+                 generator_string=FLAT_WORLD, ms_per_tick=None, prioritise_offscreen_rendering=False,
+                 world_file=None):
+        """
+        :param profile: observation profile, see lookup_profile
+        :param summary: summary of the mission
+        :param agent_name: name of the agent
+        :param mode: game mode of the agent
+        :param time_limit_ms: time after which the server quits the mission
+        :param send_command_reward: reward for every command sent, or None for no such reward
+        :param viewpoint: viewpoint of the video producer
+        :param generator_string: generator string of the flat world
+        :param ms_per_tick: length of a game tick in ms; None keeps the default of 50 ms
+        :param prioritise_offscreen_rendering: if True, the client skips rendering to its window
+        :param world_file: saved world to start the mission from instead of generating a flat world
+        """
+        self.profile = lookup_profile(profile)
+        self.summary = summary
+        self.agent_name = agent_name
+        self.mode = mode
+        self.time_limit_ms = time_limit_ms
+        self.send_command_reward = send_command_reward
+        self.viewpoint = viewpoint
+        self.generator_string = generator_string
+        self.ms_per_tick = ms_per_tick
+        self.prioritise_offscreen_rendering = prioritise_offscreen_rendering
+        self.world_file = world_file
+
+        self.command_handlers = ["DiscreteMovementCommands", "MissionQuitCommands", "InventoryCommands"]
+        self.drawing = []
+
+    def add_command_handler(self, handler):
+        if handler not in self.command_handlers:
+            self.command_handlers.append(handler)
+
+    def draw(self, xml):
+        """
+        :param xml: elements to add to the DrawingDecorator
+        """
+        self.drawing.append(xml)
+
+    def observation_handlers(self):
+        profile = self.profile
+        handlers = []
+        if profile.full_stats:
+            handlers.append('<ObservationFromFullStats/>')
+        if profile.ray:
+            handlers.append('<ObservationFromRay/>')
+        if profile.inventory:
+            handlers.append('<ObservationFromFullInventory/>')
+        if profile.discrete_cell:
+            handlers.append('<ObservationFromDiscreteCell/>')
+        if profile.video is not None:
+            handlers.append('<VideoProducer want_depth="false" viewpoint="%d"><Width>%d</Width><Height>%d</Height>'
+                            '</VideoProducer>' % (self.viewpoint, profile.video[0], profile.video[1]))
+
+        return handlers
+
+    def mod_settings(self):
+        settings = []
+        if self.ms_per_tick is not None:
+            settings.append('<MsPerTick>%d</MsPerTick>' % self.ms_per_tick)
+        if self.prioritise_offscreen_rendering:
+            settings.append('<PrioritiseOffscreenRendering>true</PrioritiseOffscreenRendering>')
+        if not settings:
+            return []
+
+        return ['<ModSettings>'] + settings + ['</ModSettings>']
+
+    def world_generator(self):
+        if self.world_file is not None:
+            return '<FileWorldGenerator src="%s" forceReset="true" />' % self.world_file
+        return '<FlatWorldGenerator generatorString="%s" forceReset="true" />' % self.generator_string
+
+    def build(self):
+        """
+        :return: the mission XML
+        """
+        parts = ['<?xml version="1.0" encoding="UTF-8" standalone="no" ?>',
+                 '<Mission xmlns="http://ProjectMalmo.microsoft.com" '
+                 'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">',
+                 '<About><Summary>%s</Summary></About>' % self.summary]
+        parts.extend(self.mod_settings())
+        parts.extend(['<ServerSection>',
+                 '<ServerInitialConditions><Time><StartTime>1</StartTime></Time><Weather>clear</Weather>'
+                 '</ServerInitialConditions>',
+                 '<ServerHandlers>',
+                 self.world_generator(),
+                 '<DrawingDecorator>'])
+        parts.extend(self.drawing)
+        parts.extend(['</DrawingDecorator>',
+                      '<ServerQuitFromTimeUp timeLimitMs="%d"/>' % self.time_limit_ms,
+                      '<ServerQuitWhenAnyAgentFinishes/>',
+                      '</ServerHandlers>',
+                      '</ServerSection>',
+                      '<AgentSection mode="%s">' % self.mode,
+                      '<Name>%s</Name>' % self.agent_name,
+                      '<AgentStart><Inventory></Inventory></AgentStart>',
+                      '<AgentHandlers>'])
+        parts.extend('<%s/>' % handler for handler in self.command_handlers)
+        parts.extend(self.observation_handlers())
+        if self.send_command_reward is not None:
+            parts.append('<RewardForSendingCommand reward="%g" />' % self.send_command_reward)
+        parts.extend(['</AgentHandlers>',
+                      '</AgentSection>',
+                      '</Mission>'])
+
+        return "\n".join(parts)
@@ -0,0 +1,119 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+# The default layout of the simple Malmo mission. It is shared by the Malmo backed environment and the headless
+# simulator, so that both of them always describe the same arena.
+
+# actions available for the agent
+ACTIONS = ["move 1", "turn 1", "turn -1", "use 1"]
+
+# mission elements: landmarks, size, landmark types, obstacles etc.,
+LANDMARK_TYPES = ["redstone_block", "emerald_block", "lapis_block", "gold_block", "cobblestone", "quartz_block"]
+SIZE = [6, 6]
+LANDMARKS = [[1, 2], [2, 5], [5, 6], [5, 2]]
+OBSTACLES = [[2, 2, 2], [3, 2, 2], [3, 3, 2], [4, 3, 2], [1, 4, 2], [2, 5, 2], [2, 6, 2]]
+
+# unit steps along x and z for each of the directions the agent can face; the index is Yaw / 90 in Minecraft,
+# i.e., 0: south (+z), 1: west (-x), 2: north (-z), 3: east (+x)
+HEADINGS = [(0, 1), (-1, 0), (0, -1), (1, 0)]
+
+
+def obstacle_cell(size, x, y, direction):
+    """
+    Computes the cell that is blocked by an obstacle, the same way SimpleMalmoEnvironment.arena_blocks places it.
+    :param size: size of the arena [x, z]
+    :param x: x coordinate of the cell the obstacle is attached to
+    :param y: z coordinate of the cell the obstacle is attached to
+    :param direction: side of the cell on which the wall is added; 0: north, 1: south, 2: east, 3: west
+    :return: [x, z] of the blocked cell, or None if the wall would be on the boundary of the arena
+    """
+    if direction == 3 and x == 0:
+        return None
+    if direction == 2 and x == size[0] - 1:
+        return None
+    if direction == 1 and y == 0:
+        return None
+    if direction == 0 and y == size[1] - 1:
+        return None
+
+    _x, _y = x, y
+    if direction == 0:  # north bit value: 0001
+        _y = y + 1
+    elif direction == 1:  # south bit value: 0010
+        _y = y - 1
+    elif direction == 2:  # east bit value: 0100
+        _x = x + 1
+    elif direction == 3:  # west bit value: 1000
+        _x = x - 1
+
+    # clip the values between the max and min environment size.
+    _x = 0 if _x < 0 else size[0] if _x > size[0] else _x
+    _y = 0 if _y < 0 else size[1] if _y > size[1] else _y
+
+    return [_x, _y]
+
+
+def obstacle_cells(size, obstacles):
+    """
+    :param size: size of the arena [x, z]
+    :param obstacles: list of [x, y, direction] obstacles
+    :return: list of the [x, z] cells blocked by the obstacles, in the order they were given
+    """
+    cells = []
+    for x, y, direction in obstacles:
+        cell = obstacle_cell(size, x, y, direction)
+        if cell is not None:
+            cells.append(cell)
+
+    return cells
+
+
+# largest number of blocks a single /fill command may change
+FILL_LIMIT = 32768
+
+
+def fill_regions(size, height, limit=FILL_LIMIT):
+    """
+    Splits the arena into regions that a /fill command of the given height can cover.
+    :param size: size of the arena [x, z]; the cells are 0..size[0] by 0..size[1]
+    :param height: number of layers filled
+    :return: list of inclusive [x1, z1, x2, z2] regions
+    """
+    columns = max(1, limit // height)
+    depth = min(size[1] + 1, columns)
+    width = max(1, columns // depth)
+
+    regions = []
+    for x1 in xrange(0, size[0] + 1, width):
+        for z1 in xrange(0, size[1] + 1, depth):
+            regions.append([x1, z1, min(x1 + width - 1, size[0]), min(z1 + depth - 1, size[1])])
+
+    return regions
@@ -0,0 +1,104 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import collections
+import logging
+import threading
+
+# the source, start and destination of an episode
+EpisodePlan = collections.namedtuple('EpisodePlan', ['source', 'start', 'item_location', 'destination'])
+
+# a mission built for a plan; client, start_result and startup_record are set once it has been started on a client.
+# world_file is the cached world the mission starts from, or None if it generates its world.
+PreparedMission = collections.namedtuple('PreparedMission', ['plan', 'mission_xml', 'mission', 'mission_record',
+                                                             'client', 'start_result', 'startup_record',
+                                                             'world_file'])
+
+
+class MissionPreparer:
+    """
+    Prepares the mission of the next episode on a background thread while the current episode is running.
+
+    prepare builds a PreparedMission; the optional launch then starts it on a standby client, so that the next episode
+    only has to switch over to that client. A failed launch leaves the mission prepared but not started.
+    """
+
+    def __init__(self, prepare, launch=None):
+        """
+        :param prepare: callable that returns a new PreparedMission
+        :param launch: callable that starts a PreparedMission on a standby client and returns it updated, or None
+        """
+        self.prepare = prepare
+        self.launch = launch
+        self._thread = None
+        self._prepared = None
+
+    def request(self):
+        """
+        Starts preparing the next mission, unless one is already being prepared.
+        """
+        if self._thread is not None:
+            return
+
+        self._prepared = None
+        self._thread = threading.Thread(target=self._run, name="MissionPreparer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def take(self):
+        """
+        Waits for the mission being prepared.
+        :return: the PreparedMission, or None if nothing was requested or the preparation failed
+        """
+        if self._thread is None:
+            return None
+
+        self._thread.join()
+        self._thread = None
+        prepared, self._prepared = self._prepared, None
+        return prepared
+
+    def _run(self):
+        log = logging.getLogger('MissionPreparer.run')
+
+        try:
+            prepared = self.prepare()
+        except Exception as e:
+            log.error("Failed to prepare the next mission: %s", e)
+            return
+
+        if self.launch is not None:
+            try:
+                prepared = self.launch(prepared)
+            except Exception as e:
+                log.error("Failed to start the next mission on the standby client: %s", e)
+
+        self._prepared = prepared
@@ -0,0 +1,126 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import re
+
+# a JSON number, as written by Malmo
+NUMBER = r'(-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)'
+
+
+class MalmoObservation(object):
+    """
+    The fields of a Malmo observation used by the simple mission.
+    """
+    __slots__ = ('x', 'z', 'yaw', 'distance', 'inventory')
+
+    def __init__(self, x, z, yaw, distance, inventory):
+        """
+        :param x: XPos of the agent
+        :param z: ZPos of the agent
+        :param yaw: Yaw of the agent
+        :param distance: distance reported by the LineOfSight ray; None if the ray is not observed
+        :param inventory: bitmap of the landmark types in the inventory; bit i is set for landmark_types[i]
+        """
+        self.x = x
+        self.z = z
+        self.yaw = yaw
+        self.distance = distance
+        self.inventory = inventory
+
+    def __repr__(self):
+        return "MalmoObservation(x=%r, z=%r, yaw=%r, distance=%r, inventory=%s)" % (self.x, self.z, self.yaw,
+                                                                                  self.distance, bin(self.inventory))
+
+
+class ObservationDecoder:
+    """
+    Extracts the position, yaw, line of sight distance and the landmark blocks in the inventory straight from the
+    observation text, without building the dictionary of the whole observation. The patterns are compiled once,
+    for the landmark types of the mission.
+    """
+
+    def __init__(self, landmark_types, n_slots=39, require_ray=True):
+        """
+        :param landmark_types: block types that are tracked in the inventory bitmap
+        :param n_slots: inventory slots that are looked at: 0 to n_slots - 1
+        :param require_ray: if True, observations without LineOfSight are incomplete
+        """
+        self.landmark_types = list(landmark_types)
+        self.n_slots = n_slots
+        self.require_ray = require_ray
+
+        self.type_bits = {}
+        for i, block in enumerate(self.landmark_types):
+            self.type_bits.setdefault(block, 1 << i)
+
+        self._x = re.compile(r'"XPos":\s*' + NUMBER)
+        self._z = re.compile(r'"ZPos":\s*' + NUMBER)
+        self._yaw = re.compile(r'"Yaw":\s*' + NUMBER)
+        self._distance = re.compile(r'"LineOfSight":\s*\{[^{}]*?"distance":\s*' + NUMBER)
+        self._items = [('"' + block + '"', bit,
+                        re.compile(r'"InventorySlot_(\d+)_item":\s*"' + re.escape(block) + '"'))
+                       for block, bit in self.type_bits.items()]
+
+    def decode(self, text):
+        """
+        :param text: observation text received from Malmo
+        :return: MalmoObservation, or None if a required field is missing
+        """
+        x = self._x.search(text)
+        z = self._z.search(text)
+        yaw = self._yaw.search(text)
+        if x is None or z is None or yaw is None:
+            return None
+
+        distance = self._distance.search(text)
+        if distance is not None:
+            distance = float(distance.group(1))
+        elif self.require_ray:
+            return None
+
+        inventory = 0
+        n_slots = self.n_slots
+        for quoted, bit, pattern in self._items:
+            # most of the blocks are not in the inventory at all; a plain substring test rules them out
+            if quoted not in text:
+                continue
+            for match in pattern.finditer(text):
+                if int(match.group(1)) < n_slots:
+                    inventory |= bit
+                    break
+
+        return MalmoObservation(float(x.group(1)), float(z.group(1)), float(yaw.group(1)), distance, inventory)
+
+    def has_item(self, observation, block):
+        """
+        :return: True if a block of the given landmark type is in the inventory of the observation
+        """
+        return bool(observation.inventory & self.type_bits.get(block, 0))
@@ -0,0 +1,251 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import collections
+import json
+import logging
+import time
+
+from pyrl.rlglue.event_loop import Return, run_blocking
+
+# keys that have to be present for an observation to be usable by SimpleMalmoEnvironment
+REQUIRED_KEYS = (u'XPos', u'ZPos', u'Yaw', u'LineOfSight')
+
+WaitResult = collections.namedtuple('WaitResult', ['observation', 'world_state', 'reward', 'is_running',
+                                                   'timed_out', 'elapsed', 'polls'])
+
+# time taken by the phases of a mission start: until has_mission_begun, and until the first complete observation
+StartupRecord = collections.namedtuple('StartupRecord', ['attempts', 'begin_time', 'observation_time', 'total_time'])
+
+
+class ObservationWaiter:
+    """
+    Waits for observations from a Malmo agent host by polling with exponential backoff, instead of sleeping a fixed
+    amount of time before every getWorldState.
+
+    Malmo hands out every observation and reward only once: getWorldState returns what arrived since the previous
+    call. mark_action drains the world state just before a command is sent, so any observation returned by the
+    following wait arrived after the command. Rewards are accumulated over all the polls and handed out with the
+    next complete observation, so none of them are lost between polls.
+    """
+
+    def __init__(self, agent_host, deadline=2.0, initial_delay=0.002, max_delay=0.05, backoff=2.0,
+                 required_keys=REQUIRED_KEYS, force_command="jump 0", history=1000, decode=None):
+        """
+        :param agent_host: the MalmoPython.AgentHost to poll
+        :param deadline: seconds to wait for a complete observation before giving up
+        :param initial_delay: seconds to sleep after the first unsuccessful poll
+        :param max_delay: upper bound on the sleep between two polls
+        :param backoff: factor by which the sleep grows after every unsuccessful poll
+        :param required_keys: keys that must be present in an observation for it to be complete
+        :param force_command: command sent to force a new observation when an incomplete one is received
+        :param history: number of wait times kept for the statistics
+        :param decode: callable that turns an observation text into an observation, or None if it is incomplete;
+                       by default the text is parsed as JSON and checked for the required keys
+        """
+        self.agent_host = agent_host
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.required_keys = required_keys
+        self.force_command = force_command
+        self.decode = decode if decode is not None else self.decode_json
+        # callable that is handed the video frames of every world state polled, or None
+        self.frame_sink = None
+
+        self.pending_reward = 0.0
+        self.wait_times = collections.deque(maxlen=history)
+        self.n_waits = 0
+        self.n_timeouts = 0
+        self.n_incomplete = 0
+        self.n_polls = 0
+
+    def mark_action(self):
+        """
+        Drains the observations received so far. To be called right before a command is sent to Malmo.
+        """
+        world_state = self.agent_host.getWorldState()
+        self._collect(world_state)
+        return world_state
+
+    def discard(self):
+        """
+        Drains the world state and forgets the rewards collected so far.
+        """
+        world_state = self.mark_action()
+        self.pending_reward = 0.0
+        return world_state
+
+    def wait(self, deadline=None):
+        """
+        Polls the agent host until a complete observation arrives, the mission ends or the deadline elapses.
+        :param deadline: seconds to wait; defaults to the deadline given to the constructor
+        :return: WaitResult; the reward is only handed out (and reset) when the wait did not time out
+        """
+        return run_blocking(self.wait_async(deadline))
+
+    def wait_async(self, deadline=None):
+        """
+        Coroutine version of wait, see event_loop: it yields instead of sleeping between two polls, so that other
+        coroutines run meanwhile.
+        """
+        log = logging.getLogger('ObservationWaiter.wait')
+
+        if deadline is None:
+            deadline = self.deadline
+
+        start = time.time()
+        end = start + deadline
+        delay = self.initial_delay
+        polls = 0
+        observation = None
+
+        while True:
+            world_state = self.agent_host.getWorldState()
+            polls += 1
+            self._collect(world_state)
+
+            if not world_state.is_mission_running:
+                break
+
+            if len(world_state.observations) > 0 and not world_state.observations[-1].text == "{}":
+                text = world_state.observations[-1].text
+                observation = self.decode(text)
+                if observation is not None:
+                    break
+                self.n_incomplete += 1
+                log.error("Incomplete observation received: %s", text)
+                if self.force_command:
+                    # sometimes the observation does not have LineOfSight; a noop command forces a new one
+                    self.agent_host.sendCommand(self.force_command)
+
+            now = time.time()
+            if now >= end:
+                break
+            yield min(delay, end - now)
+            delay = min(delay * self.backoff, self.max_delay)
+
+        elapsed = time.time() - start
+        self.n_waits += 1
+        self.n_polls += polls
+        self.wait_times.append(elapsed)
+
+        is_running = world_state.is_mission_running
+        timed_out = is_running and observation is None
+        if timed_out:
+            self.n_timeouts += 1
+            reward = 0.0
+            log.warn("No complete observation within %.3f s (%d polls)", elapsed, polls)
+        else:
+            reward = self.pending_reward
+            self.pending_reward = 0.0
+            log.debug("Observation after %.4f s (%d polls)", elapsed, polls)
+
+        raise Return(WaitResult(observation, world_state, reward, is_running, timed_out, elapsed, polls))
+
+    def wait_for_mission_begin(self, timeout):
+        """
+        Polls until the mission has begun, with the same backoff as wait.
+        :param timeout: seconds to wait
+        :return: True if the mission began within the timeout
+        """
+        world_state = self._poll_until(lambda ws: ws.has_mission_begun, timeout)
+        return world_state.has_mission_begun
+
+    def wait_for_mission_end(self, timeout):
+        """
+        Polls until no mission is running anymore, e.g., after sending quit.
+        :param timeout: seconds to wait
+        :return: True if the mission stopped within the timeout
+        """
+        world_state = self._poll_until(lambda ws: not ws.is_mission_running, timeout)
+        return not world_state.is_mission_running
+
+    def decode_json(self, text):
+        observation = json.loads(text)
+        if self.is_complete(observation):
+            return observation
+        return None
+
+    def is_complete(self, observation):
+        for key in self.required_keys:
+            if key not in observation:
+                return False
+        return True
+
+    def summary(self):
+        """
+        :return: dictionary with the number of waits, timeouts, incomplete observations and polls, and the mean,
+                 median, 99th percentile and maximum of the recent wait times in seconds
+        """
+        stats = {"waits": self.n_waits, "timeouts": self.n_timeouts, "incomplete": self.n_incomplete,
+                 "polls": self.n_polls}
+        stats.update(summarize(self.wait_times))
+
+        return stats
+
+    def _poll_until(self, condition, timeout):
+        end = time.time() + timeout
+        delay = self.initial_delay
+        while True:
+            world_state = self.agent_host.getWorldState()
+            self._collect(world_state)
+            now = time.time()
+            if condition(world_state) or now >= end:
+                return world_state
+            time.sleep(min(delay, end - now))
+            delay = min(delay * self.backoff, self.max_delay)
+
+    def _collect(self, world_state):
+        log = logging.getLogger('ObservationWaiter.collect')
+
+        for error in world_state.errors:
+            log.error("Error: %s", error.text)
+        for reward in world_state.rewards:
+            self.pending_reward += reward.getValue()
+        if self.frame_sink is not None:
+            self.frame_sink(world_state.video_frames)
+
+
+def summarize(times):
+    """
+    :param times: durations in seconds
+    :return: dictionary with the mean, median, 99th percentile and maximum of the durations; empty if there are none
+    """
+    times = sorted(times)
+    if not times:
+        return {}
+
+    return {"mean": sum(times) / len(times),
+            "p50": times[len(times) // 2],
+            "p99": times[min(len(times) - 1, int(0.99 * len(times)))],
+            "max": times[-1]}
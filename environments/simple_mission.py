@@ -39,9 +39,6 @@ import os
 
 from pprint import pformat
 
-import MalmoPython
-
-
 from rlglue.environment.Environment import Environment
 from rlglue.environment import EnvironmentLoader as EnvironmentLoader
 from rlglue.types import Observation
@@ -49,26 +46,100 @@ from rlglue.types import Action
 from rlglue.types import Reward_observation_terminal
 from pyrl.rlglue import TaskSpecRLGlue
 from pyrl.rlglue.registry import register_environment
-
-malmo_env = MalmoPython.AgentHost()
+from pyrl.rlglue.event_loop import Return
+from pyrl.environments import mission_layout, macro_actions, malmo_backend, draw_compiler
+from pyrl.environments.arena_generator import generate_arena
+from pyrl.environments.observation_wait import summarize
+from pyrl.environments.observation_decoder import ObservationDecoder
+from pyrl.environments.mission_builder import lookup_profile, MissionBuilder
+from pyrl.environments.malmo_client import MalmoClient, MissionStartError
+from pyrl.environments.mission_preparer import EpisodePlan, MissionPreparer, PreparedMission
+from pyrl.environments.world_recorder import RecordingAgentHost
+from pyrl.environments.step_watchdog import StepWatchdog
+from pyrl.environments.world_cache import WorldCache, layout_key
+from pyrl.environments.frame_pipeline import FramePipeline
+
+# agent host shared by the environments that are not given a client; created along with the first of them
+malmo_env = None
 list_compare = lambda x, y: collections.Counter(x) == collections.Counter(y)
 
 @register_environment
 class SimpleMalmoEnvironment:
-	name = 'SimpleMalmoEnvironment'
-
-    def __init__(self):
+    name = 'SimpleMalmoEnvironment'
+
+    def __init__(self, observation_deadline=2.0, startup_timeout=60.0, retry_delay=1.0, soft_reset=False,
+                 hard_reset_every=20, prepare_next=False, standby_port=None, client=None, malmo=None,
+                 observation_profile="symbolic+ray", speedup=1.0, record_path=None, step_deadline=None,
+                 arena_size=None, n_landmarks=4, n_obstacles=0, arena_seed=None, world_cache_dir=None,
+                 saves_dir=None, world_cache_size=16, frame_stack=4, frame_grayscale=False, frame_size=None,
+                 rng=random):
+        """
+        :param observation_deadline: seconds to wait for an observation before the wait is reported as timed out
+        :param startup_timeout: seconds to wait for a mission to begin, and then for its first observation
+        :param retry_delay: seconds to wait before the first retry of a failed mission start; doubles every retry
+        :param soft_reset: if True, episodes are started inside the running mission by teleporting the agent and
+                           redrawing the item, instead of starting a new mission every episode
+        :param hard_reset_every: number of episodes after which the mission is restarted anyway when soft resetting
+        :param prepare_next: if True, the mission of the next episode is built in the background during the episode
+        :param standby_port: port of a second Minecraft client; if given (with prepare_next), the next mission is
+                             also started on it in the background and the environment switches clients every episode.
+                             The clock of that mission runs while it waits, so it is best used with episodes that are
+                             short compared to the time limit.
+        :param client: MalmoClient to run the missions on; defaults to the module's agent host on the default client
+        :param malmo: module that provides the Malmo classes, or the name of a malmo_backend; defaults to the backend
+                      selected by PYRL_MALMO_BACKEND, i.e., MalmoPython unless it is set to "fake"
+        :param observation_profile: which observations the mission produces: "symbolic", "symbolic+ray", "full" or
+                                    "pixels@WxH". Without the ray, floatobs is empty.
+        :param speedup: how many times faster than real time Minecraft runs; the observation deadline is divided by
+                        it, and the time limit of a mission stays the same in real time
+        :param record_path: if given, the traffic with the module's agent host, the configuration, the episode plans
+                            and the actions are logged to this file, to be replayed with world_recorder
+        :param step_deadline: seconds a step may wait for its observation before the episode is ended and the mission
+                              restarted; defaults to three observation deadlines
+        :param arena_size: size [x, z] of a generated arena; by default the layout of mission_layout is used
+        :param n_landmarks: number of landmarks of a generated arena
+        :param n_obstacles: number of blocked cells of a generated arena
+        :param arena_seed: seed of the generated arena; a random one if None
+        :param world_cache_dir: if given, the world of the arena is saved here after its first mission, and later
+                                missions start from the saved world instead of generating and drawing it
+        :param saves_dir: saves directory of the Minecraft client; needed with world_cache_dir
+        :param world_cache_size: number of worlds kept in the cache
+        :param frame_stack: number of video frames in the "pixels" observation of a profile with video; they are the
+                            last frames the worker has processed, which may lag the newest ones while it is behind
+        :param frame_grayscale: if True, the video frames are converted to grayscale
+        :param frame_size: (width, height) to resize the video frames to, or None
+        :param rng: source of random numbers for the episodes, with the interface of the random module, e.g., a
+                    misc.rng.BlockRandom
+        """
         log = logging.getLogger('SimpleMalmoEnvironment.init')
 
+        self.rng = rng
+
         # actions available for the agent
-        self.actions = ["move 1", "turn 1", "turn -1", "use 1"]
+        self.actions = list(mission_layout.ACTIONS)
 
         # mission elements: landmarks, size, landmark types, obstacles etc.,
-        self.landmark_types = ["redstone_block", "emerald_block", "lapis_block", "gold_block", "cobblestone",
-                               "quartz_block"]
-        self.size = [6, 6]
-        self.landmarks = [[1, 2], [2, 5], [5, 6], [5, 2]]
-        self.obstacles = [[2, 2, 2], [3, 2, 2], [3, 3, 2], [4, 3, 2], [1, 4, 2], [2, 5, 2], [2, 6, 2]]
+        self.landmark_types = list(mission_layout.LANDMARK_TYPES)
+        self.size = list(mission_layout.SIZE)
+        self.landmarks = copy.deepcopy(mission_layout.LANDMARKS)
+        self.obstacles = copy.deepcopy(mission_layout.OBSTACLES)
+        if arena_size is not None:
+            if arena_seed is None:
+                # drawn here rather than by generate_arena, so that the recording notes the seed to replay with
+                arena_seed = random.SystemRandom().getrandbits(32)
+            self.size, self.landmarks, self.obstacles = generate_arena(arena_size, n_landmarks, n_obstacles,
+                                                                       arena_seed)
+        self.blocked = macro_actions.blocked_cells(self.size, self.obstacles)
+        # the layout does not change, so the arena is only compiled once; draw_stats are the number of blocks of the
+        # landmarks and obstacles, and of the elements they were drawn with
+        self.arena_xml = None
+        self.draw_stats = None
+
+        # saved worlds of the arena layouts
+        self.world_cache = None
+        if world_cache_dir is not None:
+            self.world_cache = WorldCache(world_cache_dir, saves_dir, world_cache_size)
+        self.layout_key = layout_key(self.size, self.landmarks, self.obstacles)
 
         # observation stuff that needs to be passed to the learning algorithm
         self.item_location = 0
@@ -79,195 +150,213 @@ class SimpleMalmoEnvironment:
         self.direction = 0
         self.is_get_completed = False
 
+        # observations waited for after a macro action until the agent is where its commands should have taken it
+        self.settle_waits = 3
+
+        # observations are decoded straight into the fields used below
+        self.observation_profile = lookup_profile(observation_profile)
+        self.decoder = ObservationDecoder(self.landmark_types, require_ray=self.observation_profile.ray)
+        self.frames = None
+        if self.observation_profile.video is not None:
+            width, height = self.observation_profile.video
+            self.frames = FramePipeline(width, height, k=frame_stack, grayscale=frame_grayscale, size=frame_size)
+
+        # time acceleration: a game tick lasts 50 ms / speedup
+        self.speedup = float(speedup)
+        config = {"observation_deadline": observation_deadline, "soft_reset": soft_reset,
+                  "hard_reset_every": hard_reset_every, "observation_profile": self.observation_profile.name,
+                  "speedup": speedup, "arena_size": arena_size, "n_landmarks": n_landmarks,
+                  "n_obstacles": n_obstacles, "arena_seed": arena_seed}
+        observation_deadline /= self.speedup
+
         # malmo objects
+        self.malmo = malmo if malmo is not None and not isinstance(malmo, basestring) else malmo_backend.load(malmo)
+        self.client = None
+        self.agent_host = None
+        self.waiter = None
+        self.note = None
+        if client is None:
+            agent_host = default_agent_host(self.malmo)
+            if record_path is not None:
+                agent_host = RecordingAgentHost(agent_host, record_path)
+            client = MalmoClient(agent_host, observation_deadline=observation_deadline)
+        self.use_client(client)
+        if self.note is not None:
+            self.note("config", config)
         self.mission_xml = ""
         self.mission_record = None
         self.mission = None
+        self.startup_timeout = startup_timeout
+        self.retry_delay = retry_delay
+        self.start_result = None
+        self.startup_records = []
+
+        # late observations are recovered from, up to restarting the mission and reconnecting the client
+        if step_deadline is None:
+            step_deadline = 3 * observation_deadline
+        self.watchdog = StepWatchdog(step_deadline)
+        self.needs_restart = False
+
+        # soft reset: one mission is kept running over several episodes
+        self.soft_reset = soft_reset
+        self.hard_reset_every = hard_reset_every
+        self.episode_time_limit_ms = 50000
+        self.episodes_since_restart = 0
+
+        # double buffering: the next mission is prepared, and possibly started on the standby client, in the background
+        self.standby = None
+        self.preparer = None
+        if standby_port is not None:
+            client_pool = self.malmo.ClientPool()
+            client_pool.add(self.malmo.ClientInfo("127.0.0.1", standby_port))
+            self.standby = MalmoClient(self.malmo.AgentHost(), client_pool, observation_deadline=observation_deadline)
+        if prepare_next:
+            launch = self.launch_on_standby if self.standby is not None else None
+            # the preparer plans on its own thread, so it draws from a stream of its own when rng is a BlockRandom,
+            # which is not thread safe; the random module is
+            preparer_rng = self.rng.spawn("preparer") if hasattr(self.rng, "spawn") else self.rng
+            self.preparer = MissionPreparer(lambda: self.prepare_mission(self.plan_episode(preparer_rng)), launch)
 
         log.debug("Verify experiment config:\n%s", pformat(self.__dict__))
 
-    def generate_malmo_environment_xml(self):
+    def generate_malmo_environment_xml(self, world_file=None):
+        """
+        :param world_file: saved world of the arena to start from; by default the world is generated and the arena
+                           drawn into it
+        """
         log = logging.getLogger('SimpleMalmoEnvironment.generateMalmoEnvironmentXML')
-        xml_string = '''<?xml version="1.0" encoding="UTF-8" standalone="no" ?>
-        <Mission xmlns="http://ProjectMalmo.microsoft.com" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
-            <About>
-                <Summary>Simple Malmo Environment</Summary>
-            </About>
-            <ServerSection>
-                <ServerInitialConditions>
-                    <Time><StartTime>1</StartTime></Time>
-                    <Weather>clear</Weather>
-                </ServerInitialConditions>
-                <ServerHandlers>
-                    <FlatWorldGenerator generatorString="3;7,220*1,5*3,2;3;,biome_1" forceReset="true" />
-                <DrawingDecorator>
-                    <!-- coordinates for cuboid are inclusive -->
-                    <DrawCuboid x1="0" y1="46" z1="0" x2="''' + str(self.size[0]) + '''" y2="50" z2="''' + str(
-                    self.size[1]) + '''" type="air" />            <!-- limits of our arena -->
-                    <DrawCuboid x1="0" y1="45" z1="0" x2="''' + str(self.size[1]) + '''" y2="45" z2="''' + str(
-                    self.size[1]) + '''" type="sandstone" />      <!-- floor of the arena -->
-                    ''' + self.draw_landmarks() + self.draw_obstacles() + '''
-                </DrawingDecorator>
-                <ServerQuitFromTimeUp timeLimitMs="50000"/>
-                <ServerQuitWhenAnyAgentFinishes/>
-                </ServerHandlers>
-            </ServerSection>
-            <AgentSection mode="Survival">
-                <Name>ButterFingers</Name>
-                <AgentStart>
-                    <Inventory>
-                    </Inventory>
-                </AgentStart>
-                <AgentHandlers>
-                    <DiscreteMovementCommands/>
-                    <MissionQuitCommands/>
-                    <InventoryCommands/>
-                    <ObservationFromFullStats/>
-                    <ObservationFromRay/>
-                    <ObservationFromFullInventory/>
-                    <ObservationFromDiscreteCell/>
-                    <VideoProducer want_depth="false" viewpoint="1">
-                        <Width>480</Width>
-                        <Height>320</Height>
-                    </VideoProducer>
-                    <RewardForSendingCommand reward="-1" />
-                </AgentHandlers>
-                </AgentSection>
-        </Mission>'''
+
+        builder = MissionBuilder(profile=self.observation_profile, time_limit_ms=self.mission_time_limit_ms(),
+                                 world_file=world_file)
+        if self.speedup != 1.0:
+            builder.ms_per_tick = self.ms_per_tick()
+            builder.prioritise_offscreen_rendering = True
+        if self.soft_reset:
+            # needed to reset an episode from inside the mission
+            builder.add_command_handler("AbsoluteMovementCommands")
+            builder.add_command_handler("ChatCommands")
+        if self.world_cache is not None:
+            # needed to save the world
+            builder.add_command_handler("ChatCommands")
+
+        if world_file is not None:
+            xml_string = builder.build()
+            log.debug("Final mission XML String: \n%s", xml_string)
+            return xml_string
+
+        # coordinates for cuboid are inclusive; limits of our arena, then its floor
+        builder.draw('<DrawCuboid x1="0" y1="46" z1="0" x2="%d" y2="50" z2="%d" type="air" />' %
+                     (self.size[0], self.size[1]))
+        builder.draw('<DrawCuboid x1="0" y1="45" z1="0" x2="%d" y2="45" z2="%d" type="sandstone" />' %
+                     (self.size[0], self.size[1]))
+        builder.draw(self.draw_arena())
+
+        xml_string = builder.build()
 
         log.debug("Final mission XML String: \n%s", xml_string)
 
         return xml_string
 
-    def draw_landmarks(self):
-        log = logging.getLogger('SimpleMalmoEnvironment.drawLandmarks')
-
-        landmarks = self.landmarks
-
-        log.debug("Input landmarks: %s", landmarks)
-
-        landmark_xml = '''<!-- draw landmarks -->'''
-
-        for i, l in enumerate(landmarks):
-            x, z = l
-            landmark_xml += '''<DrawBlock x="''' + str(x) + '''" y="45" z="''' + str(z) + '''" type="''' + \
-                            self.landmark_types[i % len(self.landmark_types)] + '''"/>'''
-
-        return landmark_xml
-
-    def draw_obstacles(self):
-        log = logging.getLogger('SimpleMalmoEnvironment.drawObstacles')
-
-        log.debug("Input walls: %s", self.obstacles)
-
-        obstacle_xml = '''<!-- draw the obstacles -->'''
-        for w in self.obstacles:
-            log.debug("Adding obstacle: %s", w)
-            x, y, direction = list(w)
-            obstacle_string = self.draw_obstacle(x, y, direction)
-            obstacle_xml = obstacle_xml + obstacle_string
-
-        log.debug("Obstacle string obtained: %s", obstacle_xml)
-
-        return obstacle_xml
-
-    def draw_obstacle(self, x, y, direction):
-        _x, _y = x, y
-
-        log = logging.getLogger('SimpleMalmoEnvironment.drawObstacle')
-
-        log.debug("Input x, y, d: %d, %d, %d", x, y, direction)
-
-        if direction == 3 and x == 0:
-            log.info("No wall added")
-            log.debug("Trying to add wall on the left boundary.")
-            return ""
-        if direction == 2 and x == self.size[0] - 1:
-            log.info("No wall added")
-            log.debug("Trying to add wall on the right boundary.")
-            return ""
-        if direction == 1 and y == 0:
-            log.info("No wall added")
-            log.debug("Trying to add wall on the bottom boundary.")
-            return ""
-        if direction == 0 and y == self.size[1] - 1:
-            log.info("No wall added")
-            log.debug("Trying to add wall on the top boundary.")
-            return ""
-
-        if direction == 0:  # north bit value: 0001
-            _y = y + 1
-
-        elif direction == 1:  # south bit value: 0010
-            _y = y - 1
-
-        elif direction == 2:  # east bit value: 0100
-            _x = x + 1
-
-        elif direction == 3:  # west bit value: 1000
-            _x = x - 1
-
-        # clip the values between the max and min environment size.
-        _x = 0 if _x < 0 else self.size[0] if _x > self.size[0] else _x
-        _y = 0 if _y < 0 else self.size[0] if _y > self.size[0] else _y
-
-        obstacle_string = '''<DrawBlock x="''' + str(_x) + '''" y="45" z="''' + str(_y) + '''"  type="bedrock" />
-                    <DrawBlock x="''' + str(_x) + '''" y="46" z="''' + str(_y) + '''"  type="bedrock" />
-                    <DrawBlock x="''' + str(_x) + '''" y="47" z="''' + str(_y) + '''"  type="bedrock" />
-                    <DrawBlock x="''' + str(_x) + '''" y="48" z="''' + str(_y) + '''"  type="beacon" />
-                    '''
-
-        log.debug("Obstacle string: %s", obstacle_string)
-        return obstacle_string
-
-    def makeObservation(self, action_status=False):
+    def mission_time_limit_ms(self):
+        """
+        :return: time limit of the mission in game time; a soft reset mission has to last for all the episodes played
+                 in it. The limit counts game ticks, so it is scaled by the speedup to last as long in real time.
+        """
+        time_limit_ms = self.episode_time_limit_ms * self.speedup
+        if self.soft_reset:
+            time_limit_ms *= self.hard_reset_every
+        return int(time_limit_ms)
+
+    def ms_per_tick(self):
+        """
+        :return: length of a game tick in ms at the speedup of the environment
+        """
+        return max(1, int(round(50.0 / self.speedup)))
+
+    def landmark_type(self, index):
+        """
+        :return: block type of the landmark with the given index; the types repeat when there are more landmarks
+        """
+        return self.landmark_types[index % len(self.landmark_types)]
+
+    def arena_blocks(self):
+        """
+        :return: dictionary from (x, y, z) to the block type of the landmarks and obstacles; an obstacle is a column
+                 of bedrock with a beacon on top
+        """
+        blocks = {}
+        for i, (x, z) in enumerate(self.landmarks):
+            blocks[(x, 45, z)] = self.landmark_type(i)
+        for x, z in mission_layout.obstacle_cells(self.size, self.obstacles):
+            for y in (45, 46, 47):
+                blocks[(x, y, z)] = "bedrock"
+            blocks[(x, 48, z)] = "beacon"
+
+        return blocks
+
+    def draw_arena(self):
+        """
+        :return: the landmarks and obstacles as DrawingDecorator elements, with identical neighbouring blocks merged
+                 into cuboids
+        """
+        log = logging.getLogger('SimpleMalmoEnvironment.drawArena')
+
+        if self.arena_xml is not None:
+            return self.arena_xml
+
+        blocks = self.arena_blocks()
+        cuboids = draw_compiler.compile_blocks(blocks)
+        self.draw_stats = (len(blocks), len(cuboids))
+        log.debug("Drawing %d landmarks and %d obstacles: %d blocks merged into %d elements", len(self.landmarks),
+                  len(self.obstacles), len(blocks), len(cuboids))
+
+        self.arena_xml = draw_compiler.to_xml(cuboids)
+        return self.arena_xml
+
+    def makeObservation(self, action_status=False, result=None):
+        """
+        :param action_status: whether the last action could be sent to Malmo
+        :param result: WaitResult to use instead of waiting for a new observation
+        """
+        # wait for the first complete observation received after the last command
+        if result is None:
+            result = self.watchdog.observe(self.agent_host, self.waiter)
+
+        return self.observation_from(result, action_status)
+
+    def observation_from(self, result, action_status=False):
+        """
+        :param result: WaitResult of the step, or None if the watchdog gave up waiting for it; a result that timed out,
+                       e.g., the first observation of a mission start, counts as None
+        :param action_status: whether the last action could be sent to Malmo
+        :return: observation, reward and terminal
+        """
         log = logging.getLogger('SimpleMalmoEnvironment.makeObservation')
 
-        target_item = self.landmark_types[self.destination]
+        target_item = self.landmark_type(self.destination)
 
-        # get the state from malmo
-        world_state = malmo_env.getWorldState()
+        if result is None or result.timed_out:
+            # the client is stuck; the episode ends here and env_start restarts the mission
+            log.error("No observation, ending the episode to restart the mission")
+            self.needs_restart = True
+            return {}, 0.0, 1
 
         terminal = 0
-        # wait for first valid observation to be received
-        while True:
-            time.sleep(0.1)
-            world_state = malmo_env.getWorldState()
-
-            for error in world_state.errors:
-                self.logger.error("Error: %s" % error.text)
-            log.debug("Received: %s, Num. observations: %d", world_state, len(world_state.observations))
-            if world_state.is_mission_running and len(world_state.observations) > 0 \
-                    and not world_state.observations[-1].text == "{}":
-                observation = json.loads(world_state.observations[-1].text)
-                if not u'XPos' in observation or not u'ZPos' in observation or not u'Yaw' in observation \
-                        or not u'LineOfSight' in observation:
-                    # hack to force an observation; sometimes the world_state.observations may not have LineOfSight
-                    # this line below forces the environment to return an observation.
-                    malmo_env.sendCommand("jump 0")
-                    log.error("Incomplete observation received: %s", pformat(observation))
-                else:
-                    self.last_observation = copy.deepcopy(observation)
-                    break
-            if not world_state.is_mission_running:
-                terminal = 1
-                break
+        current_r = result.reward
 
-        if not world_state.is_mission_running:
+        if not result.is_running:
             terminal = 1
             return_observation = {}
             log.warn("Malmo mission ended")
+        else:
+            observation = result.observation
+            self.last_observation = observation
 
-        current_r = 0
-        for reward in world_state.rewards:
-            current_r += reward.getValue()
-
-        if world_state.is_mission_running:
-            log.debug("Received world state: %s", world_state)
+            log.debug("Received world state: %s", result.world_state)
             log.debug("Received observation %s", pformat(observation))
 
-            x, y = int(observation[u'XPos']), int(observation[u'ZPos'])
-            self.direction = int(observation[u'Yaw'])/90
+            x, y = int(observation.x), int(observation.z)
+            self.direction = int(observation.yaw)/90
 
             if not self.is_get_completed:
                 self.is_get_completed = self.check_inventory(observation, target_item)
@@ -286,86 +375,292 @@ class SimpleMalmoEnvironment:
                         current_r -= 10
                         log.debug("Put failed")
 
-            distance = float(observation[u'LineOfSight'][u'distance'])
             return_observation = {"intobs": [x, y, self.direction, self.item_location, self.destination],
-                                  "floatobs": [distance]}
+                                  "floatobs": [observation.distance] if observation.distance is not None else []}
+            if self.frames is not None:
+                # not flushed, so the worker keeps processing the newest frames while the agent acts
+                return_observation["pixels"] = self.frames.stacked()
 
         return return_observation, current_r, terminal
 
+    def use_client(self, client):
+        """
+        Makes the environment send its commands to, and wait for observations from, the given client.
+        """
+        self.client = client
+        self.agent_host = client.agent_host
+        self.waiter = client.waiter
+        self.waiter.decode = self.decoder.decode
+        if self.frames is not None:
+            self.waiter.frame_sink = self.frames.submit
+        # a recording agent host also keeps the plans and actions, so that the episodes can be replayed
+        self.note = getattr(client.agent_host, "note", None)
+
+    def prepare_mission(self, plan):
+        """
+        Builds and validates the mission for an episode.
+        :param plan: EpisodePlan of the episode
+        :return: PreparedMission that has not been started yet
+        """
+        log = logging.getLogger('SimpleMalmoEnvironment.prepareMission')
+
+        # mission related objects
+        world_file = self.world_cache.lookup(self.layout_key) if self.world_cache is not None else None
+        mission_xml = self.generate_malmo_environment_xml(world_file)
+        log.debug("Obtained mission XML: \n %s", mission_xml)
+        mission_record = self.malmo.MissionRecordSpec()
+        mission = self.malmo.MissionSpec(mission_xml, True)
+        log.info("Loaded mission XML")
+
+        mission.setViewpoint(1)
+
+        x, y = plan.start
+        # malmo needs locations to be 0.5 to be in the middle of the square, else, it is at the edge
+        mission.startAt(x + 0.5, 46, y + 0.5)
+
+        mission.drawItem(plan.source[0], 47, plan.source[1], self.landmark_type(plan.destination))
+
+        log.debug("Final Mission XML sent to Malmo: \n %s", mission.getAsXML(True))
+
+        return PreparedMission(plan, mission_xml, mission, mission_record, None, None, None, world_file)
+
+    def launch_on_standby(self, prepared):
+        """
+        Starts a prepared mission on the standby client. Runs on the background thread of the preparer.
+        :return: the PreparedMission with the standby client and its first observation
+        """
+        client = self.standby
+        client.waiter.decode = self.decoder.decode
+        start_result, startup_record = client.launch(prepared.mission, prepared.mission_record, self.startup_timeout,
+                                                     self.retry_delay)
+        return prepared._replace(client=client, start_result=start_result, startup_record=startup_record)
+
     def reset(self):
         log = logging.getLogger('SimpleMalmoEnvironment.reset')
 
-        obstacle_locations = [[l[0], l[1]] for l in self.obstacles]
-        landmark_locations = [[l[0], l[1]] for l in self.landmarks]
+        prepared = self.preparer.take() if self.preparer is not None else None
+        if prepared is not None and prepared.client is not None and not prepared.client.is_mission_running():
+            log.warn("Mission started on the standby client is over, starting it again")
+            prepared = prepared._replace(client=None, start_result=None, startup_record=None)
+        if prepared is None:
+            prepared = self.prepare_mission(self.plan_episode())
+
+        self.apply_plan(prepared.plan)
 
         del self.mission  # just to be sure, i create a new mission every episode
-        # mission related objects
-        self.mission_xml = self.generate_malmo_environment_xml()
-        log.debug("Obtained mission XML: \n %s", self.mission_xml)
-        self.mission_record = MalmoPython.MissionRecordSpec()
-        self.mission = MalmoPython.MissionSpec(self.mission_xml, True)
-        log.info("Loaded mission XML")
+        self.mission_xml = prepared.mission_xml
+        self.mission_record = prepared.mission_record
+        self.mission = prepared.mission
+
+        if prepared.client is not None:
+            # the mission is already running on the standby client; the current client becomes the standby
+            log.info("Switching to the mission started on the standby client")
+            self.standby = self.client
+            self.use_client(prepared.client)
+            self.start_result, record = prepared.start_result, prepared.startup_record
+        else:
+            try:
+                self.start_result, record = self.client.launch(self.mission, self.mission_record,
+                                                               self.startup_timeout, self.retry_delay)
+            except MissionStartError as e:
+                log.error("Error starting mission, reconnecting the client: %s", e)
+                self.reconnect()
+                try:
+                    self.start_result, record = self.client.launch(self.mission, self.mission_record,
+                                                                   self.startup_timeout, self.retry_delay)
+                except MissionStartError as e:
+                    log.error("Error starting mission on the reconnected client. Max retries elapsed. %s", e)
+                    raise
+
+            if self.world_cache is not None and prepared.world_file is None:
+                self.capture_world()
+
+        self.startup_records.append(record)
+
+        if self.preparer is not None:
+            self.preparer.request()
+
+    def capture_world(self):
+        """
+        Saves the world of the mission that just started, before anything happened in it, into the world cache. The
+        item of the episode is taken out of the world while it is saved, and dropped again afterwards.
+        :return: True if the world was cached
+        """
+        log = logging.getLogger('SimpleMalmoEnvironment.captureWorld')
+
+        before = self.world_cache.save_times()
+        try:
+            self.agent_host.sendCommand("chat /kill @e[type=item]")
+            self.agent_host.sendCommand("chat /save-all")
+        except RuntimeError as e:
+            log.error("Failed to save the world: %s", e)
+            return False
+
+        world = self.world_cache.wait_for_save(before, self.startup_timeout)
+        cached = world is not None
+        if cached:
+            self.world_cache.capture(self.layout_key, world)
+        else:
+            log.warn("World not saved within %.1f s, not caching it", self.startup_timeout)
 
-        # select a random start location such that is is not one of the wall cells and not one of landmarks
-        # x, y = random.randint(0, self.size[0] - 1), random.randint(0, self.size[1] - 1)
-        # while [x, y] in obstacle_locations or [x, y] in landmark_locations:
-        #     x, y = random.randint(0, 6), random.randint(0, 6)
+        source = self.landmarks[self.item_location]
+        try:
+            self.agent_host.sendCommand('chat /summon item %d 47 %d {Item:{id:"minecraft:%s",Count:1b}}' %
+                                        (source[0], source[1], self.landmark_type(self.destination)))
+        except RuntimeError as e:
+            log.error("Failed to drop the item again: %s", e)
 
-        self.mission.setViewpoint(1)
+        # the commands are not part of the episode
+        result = self.waiter.wait()
+        if not result.timed_out:
+            self.start_result = result._replace(reward=0.0)
+        self.waiter.pending_reward = 0.0
 
+        return cached
+
+    def reconnect(self):
+        """
+        Replaces the client with one on a new agent host.
+        """
+        log = logging.getLogger('SimpleMalmoEnvironment.reconnect')
+
+        self.watchdog.counters["reconnect"] += 1
+        try:
+            self.agent_host.sendCommand("quit")
+        except RuntimeError as e:
+            log.warn("Failed to quit the mission of the old client: %s", e)
+        self.use_client(self.client.reconnect(self.malmo))
+
+    def plan_episode(self, rng=None):
+        """
+        Selects the source, the destination and the start location of an episode, without changing the state of the
+        environment.
+        :param rng: source of random numbers to draw from instead of self.rng, e.g., the stream of another thread
+        :return: EpisodePlan
+        """
+        rng = rng if rng is not None else self.rng
         # set mission variables - landmarks, source and destination
         landmarks = copy.deepcopy(self.landmarks)
-        source_loc = random.choice(landmarks)  # first select the source to pick up from
+        source_loc = rng.choice(landmarks)  # first select the source to pick up from
         remaining_landmarks = [lm for lm in landmarks if lm != source_loc]  # tentative destinations are other landmarks
-        destination = random.choice(remaining_landmarks)  # now randomly choose the destination from above list
-        agent_start_loc = random.choice(remaining_landmarks)  # start locations for agent; start loc != pick up source
-        x, y = agent_start_loc[0], agent_start_loc[1]
+        destination = rng.choice(remaining_landmarks)  # now randomly choose the destination from above list
+        agent_start_loc = rng.choice(remaining_landmarks)  # start locations for agent; start loc != pick up source
+
+        return EpisodePlan(source_loc, agent_start_loc, landmarks.index(source_loc), landmarks.index(destination))
+
+    def apply_plan(self, plan):
+        """
+        Makes the plan the current episode and clears the state kept from the previous episode.
+        """
+        x, y = plan.start[0], plan.start[1]
         self.current_agent_location = [x, y]
-        # malmo needs locations to be 0.5 to be in the middle of the square, else, it is at the edge
-        self.mission.startAt(x + 0.5, 46, y + 0.5)
 
-        self.item_location = landmarks.index(source_loc)
-        self.destination = landmarks.index(destination)
+        self.item_location = plan.item_location
+        self.destination = plan.destination
 
-        self.mission.drawItem(source_loc[0], 47, source_loc[1], self.landmark_types[self.destination])
+        self.is_get_completed = False
+        self.last_action = ""
+        self.last_observation = None
+        if self.frames is not None:
+            self.frames.clear()
+
+        if self.note is not None:
+            self.note("plan", plan)
+
+    def choose_episode(self):
+        """
+        Selects the source, the destination and the start location of the next episode and clears the state kept
+        from the previous episode.
+        :return: location of the source landmark, start location of the agent
+        """
+        plan = self.plan_episode()
+        self.apply_plan(plan)
+
+        return plan.source, plan.start
+
+    def soft_reset_episode(self):
+        """
+        Starts a new episode inside the running mission: clears the inventory and any block put down in the previous
+        episode, teleports the agent to the new start and drops the item on the new source.
+        :return: True if the agent is observed at the new start within the startup timeout
+        """
+        log = logging.getLogger('SimpleMalmoEnvironment.softReset')
+
+        start = time.time()
+        world_state = self.waiter.discard()
+        if not world_state.is_mission_running:
+            log.info("Mission is not running, cannot soft reset")
+            return False
 
-        retries = 3
-        log.debug("Final Mission XML sent to Malmo: \n %s", self.mission.getAsXML(True))
-        for retry in range(retries):
-            try:
-                malmo_env.startMission(self.mission, self.mission_record)
-                time.sleep(10)
+        source_loc, agent_start_loc = self.choose_episode()
+        x, y = agent_start_loc
+        item = self.landmark_type(self.destination)
+
+        commands = ["chat /clear", "chat /kill @e[type=item]"]
+        # items put down in earlier episodes are landmark blocks standing inside the arena
+        for block in set(self.landmark_types):
+            for x1, z1, x2, z2 in mission_layout.fill_regions(self.size, 5):
+                commands.append("chat /fill %d 46 %d %d 50 %d air 0 replace minecraft:%s" % (x1, z1, x2, z2, block))
+        commands += ["tp %g 46 %g" % (x + 0.5, y + 0.5), "setYaw 0",
+                     'chat /summon item %d 47 %d {Item:{id:"minecraft:%s",Count:1b}}' % (source_loc[0], source_loc[1],
+                                                                                          item)]
+        try:
+            for command in commands:
+                self.agent_host.sendCommand(command)
+        except RuntimeError as e:
+            log.error("Failed to send soft reset command: %s", e)
+            return False
 
-                world_state = malmo_env.getWorldState()
-                if world_state.has_mission_begun:
-                    break
-            except RuntimeError as e:
-                if retry == retries - 1:
-                    log.error("Error starting mission. Max retries elapsed. Closing! %s", e.message)
-                    exit(1)
-                else:
-                    time.sleep(10)
+        # wait until the agent is seen at the new start with an empty inventory
+        end = start + self.startup_timeout
+        while time.time() < end:
+            result = self.waiter.wait(deadline=end - time.time())
+            if not result.is_running:
+                log.warn("Mission ended during soft reset")
+                return False
+            observation = result.observation
+            if observation is None:
+                continue
+            if int(observation.x) == x and int(observation.z) == y \
+                    and int(observation.yaw) % 360 == 0 and not self.check_inventory(observation, item):
+                # the commands of the reset are not part of the episode
+                self.start_result = result._replace(reward=0.0)
+                self.waiter.pending_reward = 0.0
+                log.info("Soft reset in %.3f s", time.time() - start)
+                return True
+
+        log.warn("Agent not at the start after %.1f s, soft reset failed", self.startup_timeout)
+        return False
 
-        world_state = malmo_env.getWorldState()
+    def startup_summary(self):
+        """
+        :return: statistics of the time it took to start the missions of the episodes so far
+        """
+        stats = {"episodes": len(self.startup_records)}
+        for field in ["begin_time", "observation_time", "total_time"]:
+            for key, value in summarize([getattr(r, field) for r in self.startup_records]).items():
+                stats[field + "_" + key] = value
 
-        while not world_state.has_mission_begun:
-            log.debug("Waiting for mission to begin")
-            time.sleep(0.1)
-            world_state = malmo_env.getWorldState()
-            for error in world_state.errors:
-                log.error("Error: %s", error.text)
+        return stats
 
     def env_start(self):
         log = logging.getLogger('SimpleMalmoEnvironment.envStart')
 
-        # need to quit before you start a new mission, else it fails below with runtime error
-        log.debug("Sending quit command to restart the mission")
-        malmo_env.sendCommand("quit")
-
-        self.reset()
-        log.info("Environment started")
-
-        return_observation, reward, terminal = self.makeObservation()
+        if self.soft_reset and not self.needs_restart and 0 < self.episodes_since_restart < self.hard_reset_every \
+                and self.soft_reset_episode():
+            log.info("Environment soft reset")
+        else:
+            # need to quit before you start a new mission, else it fails below with runtime error
+            log.debug("Sending quit command to restart the mission")
+            self.agent_host.sendCommand("quit")
+
+            self.reset()
+            self.needs_restart = False
+            self.episodes_since_restart = 0
+            log.info("Environment started")
+        self.episodes_since_restart += 1
+
+        return_observation, reward, terminal = self.makeObservation(result=self.start_result)
         log.debug("First observation: %s, %f, %d", return_observation, reward, terminal)
 
         return return_observation
@@ -375,11 +670,7 @@ class SimpleMalmoEnvironment:
 
         log.debug("Received action: %s", str(thisAction))
 
-        malmo_action = self.actions[thisAction]
-
-        self.last_action = malmo_action
-
-        action_status = self.take_action(malmo_action)
+        action_status = self.send_action(thisAction)
 
         obs, reward, terminal = self.makeObservation(action_status)
 
@@ -387,44 +678,139 @@ class SimpleMalmoEnvironment:
 
         return obs, reward, terminal
 
+    def env_step_async(self, thisAction):
+        """
+        Coroutine version of env_step, see pyrl.rlglue.event_loop. The action is sent as soon as the coroutine
+        starts; while its observation is awaited, the other coroutines of the event loop run, e.g., the learning
+        update of the agent or the steps of other environments.
+        :return: observation, reward and terminal
+        """
+        log = logging.getLogger('SimpleMalmoEnvironment.envStep')
+
+        log.debug("Received action: %s", str(thisAction))
+
+        action_status = self.send_action(thisAction)
+
+        result = yield self.watchdog.observe_async(self.agent_host, self.waiter)
+        obs, reward, terminal = self.observation_from(result, action_status)
+
+        log.debug("Observation: %s ; reward = %f ; terminal = %d", pformat(obs), reward, terminal)
+
+        raise Return((obs, reward, terminal))
+
+    def env_macro_step(self, macro):
+        """
+        Carries out a macro action. Its primitive actions are sent back to back, and only the state after the last
+        one is observed. A "use" is the exception: whether it succeeds depends on where the agent is, so the commands
+        before it are observed first.
+        :param macro: macro action, see macro_actions
+        :return: MacroResult
+        """
+        log = logging.getLogger('SimpleMalmoEnvironment.envMacroStep')
+
+        primitives = macro.plan(self.actions, self.direction % 4)
+        log.debug("Macro %s: primitive actions %s", macro, primitives)
+
+        obs, reward, terminal = None, 0, 0
+        steps = 0
+        round_trips = 0
+        pending = []
+        for action in primitives:
+            is_use = "use" in self.actions[action]
+            if is_use and pending:
+                obs, r, terminal, waits = self.observe_commands(pending)
+                reward += r
+                round_trips += waits
+                pending = []
+                if terminal:
+                    break
+
+            action_status = self.send_action(action)
+            steps += 1
+            pending.append(self.actions[action])
+
+            if is_use:
+                obs, r, terminal, waits = self.observe_commands(pending, action_status)
+                reward += r
+                round_trips += waits
+                pending = []
+                if terminal:
+                    break
+
+        if pending or obs is None:
+            obs, r, terminal, waits = self.observe_commands(pending)
+            reward += r
+            round_trips += waits
+
+        log.debug("Macro %s: %d primitive steps, %d round trips, reward = %f, terminal = %d", macro, steps,
+                  round_trips, reward, terminal)
+
+        return macro_actions.MacroResult(obs, reward, terminal, steps, round_trips)
+
+    def observe_commands(self, commands, action_status=False):
+        """
+        Observes the outcome of commands that were sent back to back. An observation made before Minecraft carried
+        out all of them is followed by up to settle_waits more.
+        :param commands: Malmo commands sent since the last observation
+        :param action_status: action status of the last command
+        :return: observation, reward, terminal and the number of observations waited for
+        """
+        log = logging.getLogger('SimpleMalmoEnvironment.observeCommands')
+
+        expected = None
+        last = self.last_observation
+        if commands and last is not None and "use" not in commands[-1]:
+            expected = macro_actions.predict(self.size, self.blocked, int(last.x), int(last.z), self.direction % 4,
+                                             commands)
+
+        obs, reward, terminal = self.makeObservation(action_status)
+        waits = 1
+        while not terminal and expected is not None and waits <= self.settle_waits \
+                and (obs["intobs"][0], obs["intobs"][1], obs["intobs"][2] % 4) != expected:
+            log.debug("Agent at %s instead of %s, waiting for another observation", obs["intobs"][0:3], expected)
+            obs, r, terminal = self.makeObservation()
+            reward += r
+            waits += 1
+
+        return obs, reward, terminal, waits
+
+    def send_action(self, thisAction):
+        """
+        First half of env_step: sends the action to Malmo without waiting for its observation, so that the commands
+        of several environments can be in flight at the same time.
+        :return: the action status to pass on to makeObservation
+        """
+        malmo_action = self.actions[thisAction]
+
+        self.last_action = malmo_action
+        if self.note is not None:
+            self.note("action", int(thisAction))
+
+        return self.take_action(malmo_action)
+
     def take_action(self, malmo_action):
         log = logging.getLogger('SimpleMalmoEnvironment.takeAction')
 
         log.debug("Action to take: %s", malmo_action)
 
         # get the target landmark from the list
-        landmark_types = self.landmark_types
-        target_block = landmark_types[self.destination]
+        target_block = self.landmark_type(self.destination)
 
         if "use" in malmo_action:
             log.debug("Action to put things down")
 
-            retry_for_obs = 5
-            trial = 0
-            while trial < retry_for_obs:
-                trial += 1
-                time.sleep(0.1)
-                world_state = malmo_env.getWorldState()
-
-                for error in world_state.errors:
-                    log.error("Error: %s", error.text)
-
-                log.debug("Received: %s, Num. observations: %d", world_state, len(world_state.observations))
-
-                if world_state.is_mission_running and len(world_state.observations) > 0 \
-                        and not world_state.observations[-1].text == "{}":
-                    observation = json.loads(world_state.observations[-1].text)
-
-                    if not u'XPos' in observation or not u'ZPos' in observation or not u'Yaw' in observation \
-                            or not u'LineOfSight' in observation:
-                        malmo_env.sendCommand("jump 0")
-                        log.error("Incomplete observation received: %s", pformat(observation))
-                        log.warn("Sending a noop jump 0 command to force observation")
-                    else:
-                        log.debug("Put: Got it!!: : : Observation in put: %s", pformat(observation))
-                        break
-
-            x, y = int(observation[u'XPos']), int(observation[u'ZPos'])
+            # nothing has been sent since the last observation, so it still tells where the agent is
+            observation = self.last_observation
+            if observation is None:
+                result = self.waiter.wait()
+                observation = result.observation
+                # the rewards belong to the observation made after this action
+                self.waiter.pending_reward += result.reward
+                if observation is None:
+                    log.warn("No observation to check the position against, put down action failed")
+                    return False
+
+            x, y = int(observation.x), int(observation.z)
             dest = self.landmarks[self.destination]
 
             log.debug("Currently at: %d, %d", x, y)
@@ -437,7 +823,9 @@ class SimpleMalmoEnvironment:
                 log.info("Can put down now [%d,%d]", x, y)
 
         try:
-            malmo_env.sendCommand(malmo_action)
+            self.waiter.mark_action()
+            self.agent_host.sendCommand(malmo_action)
+            self.watchdog.sent(malmo_action, self.waiter)
             log.info("Action %s succeeded", malmo_action)
         except RuntimeError as e:
             log.error("Failed to send command %s", e)
@@ -447,15 +835,9 @@ class SimpleMalmoEnvironment:
 
     def check_inventory(self, observation, required):
         # need to find a way to see if the get task has been completed. one of the ways to do it is to check the
-        # inventory, if the block has been acquired.
-        for i in xrange(0, 39):
-            key = 'InventorySlot_' + str(i) + '_item'
-            if key in observation:
-                item = observation[key]
-                if item == required:
-                    return True
-
-        return False
+        # inventory, if the block has been acquired. the decoder keeps the landmark blocks found in the inventory
+        # slots as a bitmap.
+        return self.decoder.has_item(observation, required)
 
 
 def main():
@@ -487,6 +869,17 @@ def main():
                 obs, reward, terminal = malmo.env_step(action)
 
 
+def default_agent_host(malmo):
+    """
+    :param malmo: module that provides the Malmo classes
+    :return: the agent host shared by the environments that are not given a client
+    """
+    global malmo_env
+    if malmo_env is None:
+        malmo_env = malmo.AgentHost()
+    return malmo_env
+
+
 def get_time_now():
     return time.strftime('%Y%m%d-%H%M', time.localtime())
 
@@ -0,0 +1,94 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from pyrl.environments import malmo_backend
+from pyrl.environments.malmo_client import MalmoClient
+from pyrl.environments.simple_mission import SimpleMalmoEnvironment
+
+
+def measure(speedup, n_steps, malmo, port=None):
+    """
+    Runs random actions in a SimpleMalmoEnvironment at the given speedup.
+    :param speedup: how many times faster than real time Minecraft runs
+    :param n_steps: number of steps to take; episodes are restarted when they end
+    :param malmo: module that provides the Malmo classes
+    :param port: Malmo control port of the Minecraft client; None for the default client
+    :return: steps per second, and the summary of the observation waits
+    """
+    client_pool = None
+    if port is not None:
+        client_pool = malmo.ClientPool()
+        client_pool.add(malmo.ClientInfo("127.0.0.1", port))
+    client = MalmoClient(malmo.AgentHost(), client_pool, observation_deadline=2.0 / speedup)
+    env = SimpleMalmoEnvironment(speedup=speedup, client=client, malmo=malmo)
+    actions = range(len(env.actions))
+
+    env.env_start()
+    start = time.time()
+    for i in xrange(n_steps):
+        obs, reward, terminal = env.env_step(random.choice(actions))
+        if terminal:
+            env.env_start()
+    elapsed = time.time() - start
+
+    env.client.agent_host.sendCommand("quit")
+    return n_steps / elapsed, env.waiter.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the steps per second of SimpleMalmoEnvironment at several '
+                                                 'speedups of the Minecraft tick rate.')
+    parser.add_argument("--speedups", type=float, nargs="+", default=[1.0, 2.0, 5.0, 10.0])
+    parser.add_argument("--steps", type=int, default=500, help="steps per speedup")
+    parser.add_argument("--port", type=int, default=None, help="Malmo control port of the Minecraft client")
+    parser.add_argument("--fake", action="store_true", help="run against the in-process fake Malmo")
+    args = parser.parse_args()
+
+    # the environment warns about every failed action of the random agent
+    logging.basicConfig(level=logging.ERROR)
+    log = logging.getLogger('SpeedupBenchmark')
+    log.setLevel('INFO')
+
+    malmo = malmo_backend.load("fake" if args.fake else "malmo")
+
+    for speedup in args.speedups:
+        steps_per_second, summary = measure(speedup, args.steps, malmo, args.port)
+        log.info("speedup %5.1f: %8.1f steps/s, mean wait %.4f s, p99 wait %.4f s, %d timeouts", speedup,
+                 steps_per_second, summary["mean"], summary["p99"], summary["timeouts"])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import collections
+import logging
+import time
+
+from pyrl.environments.observation_wait import summarize
+from pyrl.rlglue.event_loop import Return, run_blocking
+
+# recovery paths of the watchdog, from the cheapest to the most expensive
+RECOVERIES = ("resend", "force", "restart", "reconnect")
+
+# commands that set an absolute state, which can be sent twice without changing the outcome
+ABSOLUTE_COMMANDS = ("tp", "tpx", "tpy", "tpz", "setYaw", "setPitch")
+
+
+def is_idempotent(command):
+    """
+    :return: True if sending the command twice has the same effect as sending it once, e.g., "tp 1 2 3" or a command
+             that stops a continuous action like "jump 0"; relative commands like "move 1" or "turn 1" are not
+    """
+    words = command.split()
+    return len(words) > 0 and (words[0] in ABSOLUTE_COMMANDS or words[1:] == ["0"])
+
+
+class StepWatchdog:
+    """
+    Bounds the time a step waits for its observation. When a wait times out, the watchdog escalates: the command is
+    sent again if Malmo has not acknowledged it and sending it twice is harmless, then new observations are forced,
+    and once the step deadline has passed the step gives up, so that the environment ends the episode and restarts
+    the mission. The environment reconnects the client when the restart fails. Every recovery is counted.
+    """
+
+    def __init__(self, step_deadline, history=1000):
+        """
+        :param step_deadline: seconds a step may wait for its observation before the mission is restarted
+        :param history: number of step times kept for the statistics
+        """
+        self.step_deadline = step_deadline
+        self.counters = collections.Counter()
+        self.step_times = collections.deque(maxlen=history)
+        self.command = None
+        self.reward_mark = None
+
+    def sent(self, command, waiter):
+        """
+        Remembers the command just sent. Malmo acknowledges a command by the reward for sending it, so the command
+        can be told apart from a lost one as long as that reward has not arrived.
+        """
+        self.command = command
+        self.reward_mark = waiter.pending_reward
+
+    def is_acknowledged(self, waiter):
+        return waiter.pending_reward != self.reward_mark
+
+    def observe(self, agent_host, waiter):
+        """
+        Waits for the observation of a step, escalating while it is late.
+        :return: WaitResult, or None if no observation arrived within the step deadline
+        """
+        return run_blocking(self.observe_async(agent_host, waiter))
+
+    def observe_async(self, agent_host, waiter):
+        """
+        Coroutine version of observe, see event_loop.
+        """
+        log = logging.getLogger('StepWatchdog.observe')
+
+        start = time.time()
+        end = start + self.step_deadline
+        result = yield waiter.wait_async(deadline=min(waiter.deadline, self.step_deadline))
+        escalations = 0
+        while result.timed_out:
+            remaining = end - time.time()
+            if remaining <= 0:
+                self.counters["restart"] += 1
+                log.error("No observation within the step deadline of %.3f s", self.step_deadline)
+                result = None
+                break
+
+            escalations += 1
+            try:
+                # a late acknowledgement does not prove the command was lost, so only an idempotent one is resent
+                if escalations == 1 and self.command is not None and is_idempotent(self.command) \
+                        and not self.is_acknowledged(waiter):
+                    self.counters["resend"] += 1
+                    log.warn("Command %s not acknowledged, sending it again", self.command)
+                    agent_host.sendCommand(self.command)
+                else:
+                    self.counters["force"] += 1
+                    log.warn("Forcing a new observation")
+                    agent_host.sendCommand(waiter.force_command)
+            except RuntimeError as e:
+                log.error("Failed to send command: %s", e)
+            result = yield waiter.wait_async(deadline=min(waiter.deadline, remaining))
+
+        self.command = None
+        self.counters["steps"] += 1
+        if escalations > 0:
+            self.counters["late_steps"] += 1
+        self.step_times.append(time.time() - start)
+
+        raise Return(result)
+
+    def summary(self):
+        """
+        :return: dictionary with the number of steps, late steps and recoveries of every kind, and the mean, median,
+                 99th percentile and maximum of the recent step times in seconds
+        """
+        stats = {"steps": self.counters["steps"], "late_steps": self.counters["late_steps"]}
+        for recovery in RECOVERIES:
+            stats[recovery] = self.counters[recovery]
+        stats.update(summarize(list(self.step_times)))
+
+        return stats
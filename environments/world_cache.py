@@ -0,0 +1,145 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+# files of a saved world that belong to the running game and are not copied
+SKIPPED_FILES = ("session.lock",)
+
+
+def layout_key(size, landmarks, obstacles):
+    """
+    :return: hash of an arena layout, the name of its entry in the cache
+    """
+    layout = json.dumps([list(size), [list(l) for l in landmarks], [list(o) for o in obstacles]],
+                        separators=(",", ":"))
+    return hashlib.sha1(layout.encode("utf-8")).hexdigest()
+
+
+class WorldCache:
+    """
+    A directory of saved Minecraft worlds, one per arena layout, so that missions can be started from a file instead
+    of generating the flat world and drawing the arena every time. The least recently used worlds are deleted when
+    there are more than max_entries.
+    """
+
+    def __init__(self, directory, saves_dir, max_entries=16):
+        """
+        :param directory: directory that keeps the cached worlds
+        :param saves_dir: saves directory of the Minecraft client, where it writes the worlds it generates
+        :param max_entries: number of worlds kept
+        """
+        if saves_dir is None:
+            raise ValueError("A world cache needs the saves directory of the Minecraft client")
+        self.directory = os.path.abspath(directory)
+        self.saves_dir = saves_dir
+        self.max_entries = max_entries
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+    def path(self, key):
+        return os.path.join(self.directory, key)
+
+    def lookup(self, key):
+        """
+        :return: path of the cached world, or None if there is none; a hit counts as a use of the world
+        """
+        path = self.path(key)
+        if not os.path.isdir(path):
+            return None
+        os.utime(path, None)
+        return path
+
+    def save_times(self):
+        """
+        :return: dictionary from the worlds in the saves directory to the modification time of their level.dat
+        """
+        times = {}
+        for name in os.listdir(self.saves_dir):
+            level = os.path.join(self.saves_dir, name, "level.dat")
+            if os.path.isfile(level):
+                times[os.path.join(self.saves_dir, name)] = os.path.getmtime(level)
+        return times
+
+    def wait_for_save(self, before, timeout):
+        """
+        Waits until Minecraft has saved one of the worlds again, e.g. after /save-all. Only the worlds that had been
+        written before are considered, since the level.dat Minecraft writes when it creates a world precedes the save.
+        :param before: save_times taken before the save was asked for
+        :param timeout: seconds to wait
+        :return: directory of the saved world, or None if no world was saved within the timeout
+        """
+        end = time.time() + timeout
+        while True:
+            saved = [(t, world) for world, t in self.save_times().iteritems()
+                     if world in before and t > before[world]]
+            if saved:
+                return max(saved)[1]
+            if time.time() >= end:
+                return None
+            time.sleep(0.05)
+
+    def capture(self, key, world):
+        """
+        Copies a saved world into the cache.
+        :param key: layout_key of the arena of the world
+        :param world: directory of the world
+        :return: path of the cached world
+        """
+        log = logging.getLogger('WorldCache.capture')
+
+        path = self.path(key)
+        staging = path + ".tmp"
+        if os.path.isdir(staging):
+            shutil.rmtree(staging)
+        shutil.copytree(world, staging, ignore=shutil.ignore_patterns(*SKIPPED_FILES))
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        os.rename(staging, path)
+        log.info("Cached world %s as %s", world, key)
+
+        self.evict()
+        return path
+
+    def evict(self):
+        log = logging.getLogger('WorldCache.evict')
+
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                   if not name.endswith(".tmp")]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            log.info("Evicting cached world %s", path)
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,333 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import struct
+import threading
+import time
+import zlib
+
+from pyrl.environments import fake_malmo
+
+# Log of the traffic between an environment and its Malmo agent host. The file starts with MAGIC and holds one record
+# per call: a header with the kind of the call, the seconds since the recording started and the length of the
+# payload, followed by the payload as zlib compressed JSON. The index of the records, the number of records and MAGIC
+# close the file; a log that was not closed is read by scanning the records instead.
+MAGIC = b"MWR1"
+RECORD_HEADER = struct.Struct("<cdI")
+INDEX_ENTRY = struct.Struct("<Q")
+FOOTER = struct.Struct("<QI4s")
+
+START = b"S"          # startMission: the mission XML, and the error if it failed to start
+COMMAND = b"C"        # sendCommand: the command
+WORLD_STATE = b"W"    # getWorldState: the world state returned
+PEEK = b"P"           # peekWorldState: the world state returned
+NOTE = b"N"           # note from the environment, e.g. its configuration or the plan of an episode
+
+
+def encode_world_state(world_state):
+    return {"begun": world_state.has_mission_begun,
+            "running": world_state.is_mission_running,
+            "observations": [o.text for o in world_state.observations],
+            "rewards": [r.getValue() for r in world_state.rewards],
+            "errors": [e.text for e in world_state.errors]}
+
+
+def decode_world_state(state):
+    return fake_malmo.WorldState(state["begun"], state["running"],
+                                 [fake_malmo.TimestampedString(text) for text in state["observations"]],
+                                 [fake_malmo.TimestampedReward(value) for value in state["rewards"]],
+                                 [], [fake_malmo.TimestampedString(text) for text in state["errors"]])
+
+
+class WorldLogWriter:
+    """
+    Appends records to a log file.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.offsets = []
+        self.start = time.time()
+        self.lock = threading.Lock()
+
+    def write(self, kind, payload):
+        data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 1)
+        with self.lock:
+            if self.file is None:
+                return
+            self.offsets.append(self.file.tell())
+            self.file.write(RECORD_HEADER.pack(kind, time.time() - self.start, len(data)))
+            self.file.write(data)
+
+    def close(self):
+        with self.lock:
+            if self.file is None:
+                return
+            index_offset = self.file.tell()
+            self.file.write(b"".join(INDEX_ENTRY.pack(offset) for offset in self.offsets))
+            self.file.write(FOOTER.pack(index_offset, len(self.offsets), MAGIC))
+            self.file.close()
+            self.file = None
+
+
+class WorldLog:
+    """
+    Reads the records of a log file: log[i] is the (kind, seconds since the start, payload) of the i-th record.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError("%s is not a world state log" % path)
+        self.offsets = self._read_index()
+
+    def _read_index(self):
+        if len(self.data) >= len(MAGIC) + FOOTER.size:
+            index_offset, count, magic = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+            if magic == MAGIC and index_offset + count * INDEX_ENTRY.size == len(self.data) - FOOTER.size:
+                return [INDEX_ENTRY.unpack_from(self.data, index_offset + i * INDEX_ENTRY.size)[0]
+                        for i in xrange(count)]
+
+        # the recording was not closed; drop a record that was cut off
+        offsets = []
+        offset = len(MAGIC)
+        while offset + RECORD_HEADER.size <= len(self.data):
+            kind, t, length = RECORD_HEADER.unpack_from(self.data, offset)
+            if offset + RECORD_HEADER.size + length > len(self.data):
+                break
+            offsets.append(offset)
+            offset += RECORD_HEADER.size + length
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def kind(self, i):
+        return self.data[self.offsets[i]:self.offsets[i] + 1]
+
+    def __getitem__(self, i):
+        offset = self.offsets[i]
+        kind, t, length = RECORD_HEADER.unpack_from(self.data, offset)
+        start = offset + RECORD_HEADER.size
+        return kind, t, json.loads(zlib.decompress(self.data[start:start + length]).decode("utf-8"))
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self[i]
+
+    def notes(self, name):
+        """
+        :return: values of the notes with the given name, in order
+        """
+        return [payload["value"] for kind, t, payload in self if kind == NOTE and payload["name"] == name]
+
+
+class RecordingAgentHost:
+    """
+    Wraps an agent host and logs the missions started, the commands sent and the world states returned.
+    """
+
+    def __init__(self, agent_host, path):
+        """
+        :param agent_host: the MalmoPython.AgentHost to record
+        :param path: file to write the log to; it is closed at exit, or by close
+        """
+        self.agent_host = agent_host
+        self.writer = WorldLogWriter(path)
+        atexit.register(self.close)
+
+    def startMission(self, mission, *args):
+        try:
+            self.agent_host.startMission(mission, *args)
+        except RuntimeError as e:
+            self.writer.write(START, {"xml": mission.getAsXML(False), "error": str(e)})
+            raise
+        self.writer.write(START, {"xml": mission.getAsXML(False), "error": None})
+
+    def sendCommand(self, command, *args):
+        self.writer.write(COMMAND, {"command": command})
+        self.agent_host.sendCommand(command, *args)
+
+    def getWorldState(self):
+        world_state = self.agent_host.getWorldState()
+        self.writer.write(WORLD_STATE, encode_world_state(world_state))
+        return world_state
+
+    def peekWorldState(self):
+        world_state = self.agent_host.peekWorldState()
+        self.writer.write(PEEK, encode_world_state(world_state))
+        return world_state
+
+    def note(self, name, value):
+        self.writer.write(NOTE, {"name": name, "value": value})
+
+    def close(self):
+        self.writer.close()
+
+    def __getattr__(self, name):
+        return getattr(self.agent_host, name)
+
+
+class ReplayDesync(RuntimeError):
+    """
+    Raised when the environment makes another call than the one recorded next, e.g. because a wait timed out in the
+    recording and not in the replay, so that the rest of the log would be played back to the wrong calls.
+    """
+
+
+class ReplayAgentHost:
+    """
+    Plays a log back to an environment: every call returns what the recorded call of the same kind returned. The
+    notes of the environment are skipped; a call of another kind than the next recorded one raises ReplayDesync.
+    After the end of the log no mission is running.
+    """
+
+    def __init__(self, path, timing=False):
+        """
+        :param path: log file written by RecordingAgentHost
+        :param timing: if True, every call returns no earlier than it did during the recording, counted from the
+                       first call; otherwise the log is played back as fast as it is asked for
+        """
+        self.log = WorldLog(path)
+        self.timing = timing
+        self.position = 0
+        self.origin = None
+        self.skipped = 0
+        self.mismatches = 0
+
+    def _next(self, kind):
+        i = self.position
+        while i < len(self.log) and self.log.kind(i) == NOTE:
+            i += 1
+        if i == len(self.log):
+            return None
+        if self.log.kind(i) != kind:
+            raise ReplayDesync("Record %d is %r, not the %r the environment asked for" % (i, self.log.kind(i), kind))
+
+        self.skipped += i - self.position
+        self.position = i + 1
+        kind, t, payload = self.log[i]
+
+        if self.timing:
+            now = time.time()
+            if self.origin is None:
+                self.origin = now - t
+            elif self.origin + t > now:
+                time.sleep(self.origin + t - now)
+
+        return payload
+
+    def startMission(self, mission, *args):
+        payload = self._next(START)
+        if payload is None:
+            raise RuntimeError("No more missions in the log")
+        if payload["error"] is not None:
+            raise RuntimeError(payload["error"])
+
+    def sendCommand(self, command, *args):
+        payload = self._next(COMMAND)
+        if payload is None or payload["command"] != command:
+            self.mismatches += 1
+            logging.getLogger('ReplayAgentHost.sendCommand').debug("Command %s was not recorded here", command)
+
+    def getWorldState(self):
+        payload = self._next(WORLD_STATE)
+        if payload is None:
+            return fake_malmo.WorldState(True, False)
+        return decode_world_state(payload)
+
+    def peekWorldState(self):
+        payload = self._next(PEEK)
+        if payload is None:
+            return fake_malmo.WorldState(True, False)
+        return decode_world_state(payload)
+
+
+def replay(path, timing=False):
+    """
+    Replays the episodes of a log recorded from a SimpleMalmoEnvironment: the environment gets the configuration,
+    the episode plans and the actions noted in the log, and the agent host plays back the world states.
+    :return: number of steps, seconds spent in env_start and env_step, and the ReplayAgentHost
+    """
+    # simple_mission records through this module, so it is imported here
+    from pyrl.environments.malmo_client import MalmoClient
+    from pyrl.environments.mission_preparer import EpisodePlan
+    from pyrl.environments.simple_mission import SimpleMalmoEnvironment
+
+    agent_host = ReplayAgentHost(path, timing)
+    config = agent_host.log.notes("config")
+    env = SimpleMalmoEnvironment(client=MalmoClient(agent_host), malmo=fake_malmo, **(config[0] if config else {}))
+    plans = iter([EpisodePlan(*plan) for plan in agent_host.log.notes("plan")])
+    env.plan_episode = lambda rng=None: next(plans)
+
+    # the actions of each episode, in the order they were taken
+    episodes = []
+    for kind, t, payload in agent_host.log:
+        if kind == NOTE and payload["name"] == "plan":
+            episodes.append([])
+        elif kind == NOTE and payload["name"] == "action" and episodes:
+            episodes[-1].append(payload["value"])
+
+    n_steps = 0
+    start = time.time()
+    for actions in episodes:
+        env.env_start()
+        for action in actions:
+            env.env_step(action)
+            n_steps += 1
+
+    return n_steps, time.time() - start, agent_host
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a world state log recorded from a SimpleMalmoEnvironment.')
+    parser.add_argument("log", help="log file written by RecordingAgentHost")
+    parser.add_argument("--timing", action="store_true", help="keep the timing of the recording")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    log = logging.getLogger('ReplayAgentHost')
+    log.setLevel('INFO')
+
+    n_steps, elapsed, agent_host = replay(args.log, args.timing)
+    log.info("%d records, %d steps in %.3f s: %.1f steps/s; %d notes skipped, %d commands not in the log",
+             len(agent_host.log), n_steps, elapsed, n_steps / elapsed if elapsed > 0 else 0.0,
+             agent_host.skipped, agent_host.mismatches)
+
+
+if __name__ == '__main__':
+    main()
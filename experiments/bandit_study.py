@@ -0,0 +1,121 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import argparse
+import csv
+import logging
+import time
+
+import numpy as np
+
+from pyrl.agents.BatchedBandits import BatchedEpsilonGreedy, BatchedSoftmax, BatchedUCB1
+from pyrl.environments.BernoulliEnvironment import BatchedBernoulliEnv
+
+ALGORITHMS = ("epsilon-greedy", "softmax", "annealing-softmax", "ucb1")
+
+
+def make_algorithm(name, n_runs, n_arms, epsilon=0.1, temperature=0.1, seed=None):
+    """
+    :param name: one of ALGORITHMS
+    :return: the batched bandit algorithm
+    """
+    if name == "epsilon-greedy":
+        return BatchedEpsilonGreedy(epsilon, n_runs, n_arms, seed)
+    elif name == "softmax":
+        return BatchedSoftmax(temperature, n_runs, n_arms, seed)
+    elif name == "annealing-softmax":
+        return BatchedSoftmax(temperature, n_runs, n_arms, seed, annealing=True)
+    elif name == "ucb1":
+        return BatchedUCB1(n_runs, n_arms, seed)
+    raise ValueError("Unknown bandit algorithm: %s" % name)
+
+
+def run_study(algorithm, env, horizon):
+    """
+    Plays all the runs of a batched bandit algorithm against a batched environment for the given number of pulls.
+    :return: arrays with the mean reward over the runs after every pull, and the fraction of the runs that pulled
+             their best arm
+    """
+    mean_rewards = np.empty(horizon)
+    best_fractions = np.empty(horizon)
+    best_arms = env.best_arms()
+
+    for t in xrange(horizon):
+        arms = algorithm.select_arms()
+        rewards = env.pull(arms)
+        algorithm.update(arms, rewards)
+
+        mean_rewards[t] = rewards.mean()
+        best_fractions[t] = np.count_nonzero(arms == best_arms) / float(env.n_runs)
+
+    return mean_rewards, best_fractions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Average a bandit algorithm over many independent runs on Bernoulli '
+                                                 'arms, all the runs at once.')
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="epsilon-greedy")
+    parser.add_argument("--runs", type=int, default=10000)
+    parser.add_argument("--horizon", type=int, default=10000, help="number of pulls of every run")
+    parser.add_argument("--means", type=float, nargs="+", default=[0.1, 0.2, 0.6, 0.1])
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--temperature", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="csv file to write the reward and best arm curves to")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    log = logging.getLogger('BanditStudy')
+    log.setLevel('INFO')
+
+    algorithm = make_algorithm(args.algorithm, args.runs, len(args.means), args.epsilon, args.temperature,
+                               args.seed)
+    env = BatchedBernoulliEnv(args.means, args.runs, None if args.seed is None else args.seed + 1)
+
+    start = time.time()
+    mean_rewards, best_fractions = run_study(algorithm, env, args.horizon)
+    elapsed = time.time() - start
+
+    log.info("%s: %d runs x %d pulls in %.2f s (%.0f pulls/s)", args.algorithm, args.runs, args.horizon, elapsed,
+             args.runs * args.horizon / elapsed)
+    log.info("Mean reward %.4f, final mean reward %.4f, best arm pulled in %.1f%% of the runs at the end",
+             mean_rewards.mean(), mean_rewards[-1], 100 * best_fractions[-1])
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            csvwrite = csv.writer(f)
+            csvwrite.writerow(["t", "mean_reward", "best_arm_fraction"])
+            for t in xrange(args.horizon):
+                csvwrite.writerow([t + 1, mean_rewards[t], best_fractions[t]])
+
+
+if __name__ == '__main__':
+    main()
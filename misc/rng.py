@@ -0,0 +1,130 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import hashlib
+import itertools
+import os
+import struct
+
+import numpy as np
+
+# number of draws generated at a time
+BLOCK_SIZE = 4096
+
+
+def derive_seed(seed, *keys):
+    """
+    Derives the seed of an independent stream from a root seed and the keys naming the stream, e.g., a component
+    name, a run and a worker index, so that every stream is reproducible from the root seed alone.
+    :return: a seed for numpy.random.RandomState
+    """
+    digest = hashlib.sha1(repr((seed,) + keys)).digest()
+    return struct.unpack("<I", digest[:4])[0]
+
+
+class BlockRandom:
+    """
+    Random number stream with the interface of the random module, to be passed where the module would be used.
+
+    Draws are generated by a numpy RandomState in blocks, which are refilled lazily as they run out; random() hands
+    them out through a C level iterator, so it costs about as much as random.random(). Every component gets a stream
+    of its own, derived from a root seed with spawn, so that parallel runs are reproducible whatever the order in
+    which they draw.
+
+    A stream is not thread safe: two threads drawing from it at once may get the same draws or break the iterator.
+    A thread draws from a stream spawned for it.
+    """
+
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        """
+        :param seed: seed of the stream; a random one if None
+        :param block_size: number of draws generated at a time
+        """
+        if seed is None:
+            seed = struct.unpack("<I", os.urandom(4))[0]
+        self.seed = seed
+        self.block_size = block_size
+        self.state = np.random.RandomState(seed)
+        self.random = itertools.chain.from_iterable(self._blocks()).next
+
+    def _blocks(self):
+        while True:
+            yield self.state.random_sample(self.block_size).tolist()
+
+    def spawn(self, *keys):
+        """
+        :param keys: names of the stream, e.g., "agent", run
+        :return: an independent BlockRandom derived from this one's seed and the keys
+        """
+        return BlockRandom(derive_seed(self.seed, *keys), self.block_size)
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            start, stop = 0, start
+        return start + int(self.random() * (stop - start))
+
+    def randint(self, a, b):
+        return self.randrange(a, b + 1)
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, x):
+        for i in xrange(len(x) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            x[i], x[j] = x[j], x[i]
+
+    def sample(self, population, k):
+        pool = list(population)
+        for i in xrange(k):
+            j = i + int(self.random() * (len(pool) - i))
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+    def integers(self, n):
+        """
+        :return: callable that returns a random integer in [0, n) on every call; the integers are generated in blocks
+                 like the uniform draws, for the hot paths that always draw from the same range
+        """
+        def blocks():
+            while True:
+                yield self.state.randint(n, size=self.block_size).tolist()
+        return itertools.chain.from_iterable(blocks()).next
+
+
+def stream(seed, *keys):
+    """
+    :return: the BlockRandom of the given keys, derived from the root seed
+    """
+    return BlockRandom(derive_seed(seed, *keys))
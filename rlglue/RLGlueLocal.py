@@ -28,6 +28,8 @@ from rlglue.types import Observation_action
 from rlglue.types import Reward_observation_action_terminal
 from rlglue.types import Reward_observation_terminal
 
+from pyrl.rlglue.event_loop import EventLoop, Return, gather
+
 # This class provides a seemless way of running python RLGlue experiments locally without
 # the use of sockets/network. I have no idea why this was not included in the python codec,
 # but I really need this functionality. Maybe it will help you as well.
@@ -119,3 +121,170 @@ class LocalGlue:
 			self.exitStatus = roat.terminal
 		return self.exitStatus
 
+	# Lean stepping mode for cheap environments, such as the bandit environments, for which the glue itself is a
+	# large part of the cost of a step. The state of the glue is the same as after RL_start and RL_step, but no
+	# result structs are allocated.
+	def RL_start_lean(self):
+		"""
+		RL_start without the Observation_action.
+		:return: observation, action
+		"""
+		self.reward_return = 0.0
+		self.step_count = 1
+		self.episode_count += 1
+		self.exitStatus = 0
+		obs = self.env.env_start()
+		self.prevact = self.agent.agent_start(obs)
+		return obs, self.prevact
+
+	def RL_step_lean(self):
+		"""
+		RL_step without the Reward_observation_action_terminal.
+		:return: reward, observation, action, terminal
+		"""
+		if self.prevact is None:
+			self.RL_start_lean()
+		self.step_count += 1
+		rot = self.env.env_step(self.prevact)
+		self.exitStatus = rot.terminal
+
+		action = self.prevact
+		if rot.terminal == 1:
+			self.agent.agent_end(rot.r)
+			self.prevact = None
+		else:
+			self.prevact = action = self.agent.agent_step(rot.r, rot.o)
+
+		self.reward_return += rot.r
+		return rot.r, rot.o, action, rot.terminal
+
+	def RL_episode_lean(self, num_steps):
+		"""
+		RL_episode in a tight loop: the methods are looked up once, and the counters are kept in locals and only
+		stored when the episode ends.
+		"""
+		env_step = self.env.env_step
+		agent_step = self.agent.agent_step
+
+		obs, action = self.RL_start_lean()
+		steps = 1
+		total = 0.0
+		terminal = 0
+		# If num_steps is zero (or less) then treat as unlimited
+		while num_steps <= 0 or steps < num_steps:
+			rot = env_step(action)
+			steps += 1
+			reward = rot.r
+			total += reward
+			if rot.terminal == 1:
+				self.agent.agent_end(reward)
+				terminal = 1
+				action = None
+				break
+			action = agent_step(reward, rot.o)
+
+		self.step_count = steps
+		self.reward_return = total
+		self.exitStatus = terminal
+		self.prevact = action
+		return terminal
+
+
+def sync_env_step(env, action):
+	"""
+	Coroutine that steps an environment without an env_step_async.
+	"""
+	raise Return(env.env_step(action))
+	yield
+
+
+# Pipelined variant of LocalGlue, for environments whose steps mostly wait, like Malmo. Steps are coroutines run by an
+# event loop (see event_loop), which several glues can share to step their environments concurrently in one process.
+#
+# An agent may split agent_step in two: agent_act(reward, observation) only chooses the next action, and agent_learn()
+# makes the learning update for the step. The glue then sends the next action before the update, so that the update
+# of step t runs while the command of step t+1 is in flight. The other agents are stepped as in LocalGlue.
+#
+# env_step_async(action) is a coroutine returning what env_step returns: a Reward_observation_terminal or an
+# (observation, reward, terminal) tuple. Environments without it are stepped by env_step.
+class AsyncLocalGlue(LocalGlue):
+	def __init__(self,theEnvironment,theAgent,loop=None):
+		LocalGlue.__init__(self, theEnvironment, theAgent)
+		self.loop = loop if loop is not None else EventLoop()
+		self.pipelined = hasattr(theAgent, "agent_act") and hasattr(theAgent, "agent_learn")
+		# task of the step whose action was sent before the agent learned from the previous one
+		self.inflight = None
+
+	def RL_start(self):
+		return self.loop.run_until_complete(self.RL_start_async())
+
+	def RL_start_async(self):
+		if self.inflight is not None:
+			# the episode was cut off with an action in flight, which has to be observed before the mission restarts
+			yield self.inflight
+			self.inflight = None
+		raise Return(LocalGlue.RL_start(self))
+
+	def RL_step(self):
+		return self.loop.run_until_complete(self.RL_step_async())
+
+	def RL_step_async(self):
+		if self.prevact is None:
+			yield self.RL_start_async()
+		self.step_count += 1
+		if self.inflight is not None:
+			step, self.inflight = self.inflight, None
+		else:
+			step = self.env_step(self.prevact)
+		rot = yield step
+		if isinstance(rot, tuple):
+			rot = Reward_observation_terminal(rot[1], rot[0], rot[2])
+
+		roat = Reward_observation_action_terminal()
+		roat.terminal = rot.terminal
+		self.exitStatus = rot.terminal
+
+		if rot.terminal == 1:
+			self.agent.agent_end(rot.r)
+			roat.a = self.prevact
+			self.prevact = None
+		elif self.pipelined:
+			self.prevact = self.agent.agent_act(rot.r, rot.o)
+			roat.a = self.prevact
+			self.inflight = self.loop.spawn(self.env_step(self.prevact))
+			self.agent.agent_learn()
+		else:
+			self.prevact = self.agent.agent_step(rot.r, rot.o)
+			roat.a = self.prevact
+
+		self.reward_return += rot.r
+		roat.r = rot.r
+		roat.o = rot.o
+		raise Return(roat)
+
+	def env_step(self, action):
+		if hasattr(self.env, "env_step_async"):
+			return self.env.env_step_async(action)
+		return sync_env_step(self.env, action)
+
+	def RL_episode(self, num_steps):
+		return self.loop.run_until_complete(self.RL_episode_async(num_steps))
+
+	def RL_episode_async(self, num_steps):
+		yield self.RL_start_async()
+		while self.exitStatus != 1:
+			# If num_steps is zero (or less) then treat as unlimited
+			if (num_steps > 0) and self.step_count >= num_steps:
+				break
+			roat = yield self.RL_step_async()
+			self.exitStatus = roat.terminal
+		raise Return(self.exitStatus)
+
+
+def RL_episodes(glues, num_steps):
+	"""
+	Runs an episode on each of the given glues, which share one event loop, concurrently.
+	:return: list with the exit status of every episode
+	"""
+	loop = glues[0].loop
+	return loop.run_until_complete(gather(loop, [glue.RL_episode_async(num_steps) for glue in glues]))
@@ -0,0 +1,179 @@
+"""
+.. module:: event_loop
+   :platform: Unix, Windows
+   :synopsis: Generator based coroutines and a single threaded event loop to run them
+
+.. moduleauthor:: Akshay Narayan
+
+A coroutine is a generator. It yields to say what it waits for:
+
+- a number: sleep that many seconds, letting the other coroutines run meanwhile; 0 or None only lets them run
+- a generator: run it as a sub-coroutine, and receive its result
+- a Task: wait for the task to finish, and receive its result
+
+A coroutine hands out its result by raising Return(value); falling off its end returns None. Exceptions raised by a
+sub-coroutine or a task are raised again where it was yielded.
+"""
+
+import collections
+import heapq
+import itertools
+import sys
+import time
+import types
+
+
+class Return(Exception):
+    """
+    Raised by a coroutine to return a value, since generators cannot return one.
+    """
+
+    def __init__(self, value=None):
+        Exception.__init__(self, value)
+        self.value = value
+
+
+class Task:
+    """
+    A coroutine scheduled on an event loop, together with the stack of sub-coroutines it is running.
+    """
+
+    def __init__(self, loop, coroutine):
+        self.loop = loop
+        self.stack = [coroutine]
+        self.done = False
+        self.result = None
+        self.exc_info = None
+        self.waiters = []
+
+    def get_result(self):
+        if not self.done:
+            raise RuntimeError("Task has not finished")
+        if self.exc_info is not None:
+            raise self.exc_info[0], self.exc_info[1], self.exc_info[2]
+        return self.result
+
+    def step(self, value=None, exc_info=None):
+        """
+        Resumes the coroutine with the given value or exception, and runs it until it waits for something.
+        """
+        while True:
+            coroutine = self.stack[-1]
+            try:
+                if exc_info is not None:
+                    yielded = coroutine.throw(*exc_info)
+                else:
+                    yielded = coroutine.send(value)
+            except Return as r:
+                value, exc_info = r.value, None
+            except StopIteration:
+                value, exc_info = None, None
+            except Exception:
+                value, exc_info = None, sys.exc_info()
+            else:
+                value, exc_info = None, None
+                if isinstance(yielded, types.GeneratorType):
+                    self.stack.append(yielded)
+                    continue
+                if isinstance(yielded, Task):
+                    if not yielded.done:
+                        yielded.waiters.append(self)
+                        return
+                    value, exc_info = yielded.result, yielded.exc_info
+                    continue
+                self.loop.call_later(yielded or 0.0, self)
+                return
+
+            # the coroutine on top of the stack finished
+            self.stack.pop()
+            if not self.stack:
+                self.finish(value, exc_info)
+                return
+
+    def finish(self, result, exc_info):
+        self.done = True
+        self.result = result
+        self.exc_info = exc_info
+        for task in self.waiters:
+            self.loop.call_soon(task, result, exc_info)
+        self.waiters = []
+
+
+class EventLoop:
+    """
+    Runs coroutines in a single thread. Whenever all of them are sleeping, e.g., while polling Malmo for the
+    observations of their commands, the loop sleeps until the first one has to wake up.
+    """
+
+    def __init__(self):
+        self.ready = collections.deque()
+        self.timers = []
+        self.sequence = itertools.count()
+
+    def spawn(self, coroutine):
+        """
+        Schedules a coroutine. It is run right away until it first waits for something, so that, e.g., a command it
+        sends is on its way before the caller continues.
+        :return: Task
+        """
+        task = Task(self, coroutine)
+        task.step()
+        return task
+
+    def call_soon(self, task, value=None, exc_info=None):
+        self.ready.append((task, value, exc_info))
+
+    def call_later(self, delay, task):
+        if delay <= 0:
+            self.call_soon(task)
+        else:
+            heapq.heappush(self.timers, (time.time() + delay, next(self.sequence), task))
+
+    def run_until_complete(self, coroutine):
+        """
+        Runs the loop until the given coroutine or task has finished.
+        :return: the result of the coroutine
+        """
+        task = coroutine if isinstance(coroutine, Task) else self.spawn(coroutine)
+        while not task.done:
+            self.run_once()
+        return task.get_result()
+
+    def run_once(self):
+        """
+        Resumes the coroutines that are ready, sleeping first if none is.
+        """
+        if not self.ready:
+            if not self.timers:
+                raise RuntimeError("Deadlock: no coroutine is ready or sleeping")
+            delay = self.timers[0][0] - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+        now = time.time()
+        while self.timers and self.timers[0][0] <= now:
+            self.ready.append((heapq.heappop(self.timers)[2], None, None))
+
+        for _ in xrange(len(self.ready)):
+            task, value, exc_info = self.ready.popleft()
+            task.step(value, exc_info)
+
+
+def gather(loop, coroutines):
+    """
+    Coroutine that runs the given coroutines concurrently.
+    :return: list with their results
+    """
+    tasks = [loop.spawn(coroutine) for coroutine in coroutines]
+    results = []
+    for task in tasks:
+        result = yield task
+        results.append(result)
+    raise Return(results)
+
+
+def run_blocking(coroutine):
+    """
+    Runs a coroutine to completion on a loop of its own, i.e., like a blocking function call.
+    """
+    return EventLoop().run_until_complete(coroutine)
@@ -0,0 +1,127 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import argparse
+import logging
+import time
+
+from pyrl.environments.BernoulliEnvironment import BernoulliEnv
+from pyrl.misc.rng import BlockRandom
+from pyrl.rlglue.RLGlueLocal import LocalGlue
+
+
+class RandomBanditAgent:
+    """
+    Agent that pulls arms at random, so that a step costs little besides the glue.
+    """
+
+    def __init__(self, n_arms, rng):
+        self.arm = rng.integers(n_arms)
+
+    def agent_init(self, task_spec):
+        pass
+
+    def agent_start(self, observation):
+        return self.arm()
+
+    def agent_step(self, reward, observation):
+        return self.arm()
+
+    def agent_end(self, reward):
+        pass
+
+    def agent_cleanup(self):
+        pass
+
+    def agent_message(self, message):
+        return ""
+
+
+def measure(mode, n_episodes, n_steps, n_arms, seed):
+    """
+    :param mode: "episode" for RL_episode, "lean" for RL_episode_lean, "step" for RL_step and "step-lean" for
+                 RL_step_lean in a loop
+    :return: steps per second, and the total reward
+    """
+    rng = BlockRandom(seed)
+    env = BernoulliEnv(n_arms=n_arms, rng=rng.spawn("env"))
+    glue = LocalGlue(env, RandomBanditAgent(n_arms, rng.spawn("agent")))
+    glue.RL_init()
+
+    steps = 0
+    total = 0.0
+    start = time.time()
+    for e in xrange(n_episodes):
+        if mode == "episode":
+            glue.RL_episode(n_steps)
+        elif mode == "lean":
+            glue.RL_episode_lean(n_steps)
+        elif mode == "step":
+            glue.RL_start()
+            for i in xrange(n_steps - 1):
+                glue.RL_step()
+        elif mode == "step-lean":
+            glue.RL_start_lean()
+            for i in xrange(n_steps - 1):
+                glue.RL_step_lean()
+        else:
+            raise ValueError("Unknown mode: %s" % mode)
+        steps += glue.RL_num_steps()
+        total += glue.RL_return()
+    elapsed = time.time() - start
+
+    return steps / elapsed, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the steps per second of the LocalGlue stepping modes on a '
+                                                 'Bernoulli bandit.')
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=50000, help="steps per episode")
+    parser.add_argument("--arms", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    log = logging.getLogger('GlueBenchmark')
+    log.setLevel('INFO')
+
+    baseline = None
+    for mode in ("episode", "lean", "step", "step-lean"):
+        rate, total = measure(mode, args.episodes, args.steps, args.arms, args.seed)
+        if baseline is None:
+            baseline = rate
+        # the same seed gives every mode the same pulls, so the returns must match
+        log.info("%-9s %9.0f steps/s (x%.2f), return %.0f", mode, rate, rate / baseline, total)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import collections
+import gc
+import unittest
+import weakref
+
+from pyrl.environments.frame_pipeline import FramePipeline
+
+Frame = collections.namedtuple("Frame", ["pixels", "width", "height", "channels"])
+
+
+class FramePipelineTest(unittest.TestCase):
+
+    def test_close_joins_worker(self):
+        pipeline = FramePipeline(4, 2, k=2)
+        worker = pipeline.worker
+        pipeline.submit([Frame(bytearray([value] * 24), 4, 2, 3) for value in (1, 2)])
+
+        pipeline.close()
+
+        self.assertFalse(worker.is_alive())
+        self.assertIsNone(pipeline.queue)
+        self.assertEqual(pipeline.stacked()[:, 0, 0, 0].tolist(), [1, 2])
+
+    def test_dropped_pipeline_is_collected(self):
+        pipeline = FramePipeline(4, 2)
+        pipeline.submit([Frame(bytearray(24), 4, 2, 3)])
+        pipeline.flush()
+        worker, ref = pipeline.worker, weakref.ref(pipeline)
+
+        del pipeline
+        gc.collect()
+        worker.join(1.0)
+
+        self.assertIsNone(ref())
+        self.assertFalse(worker.is_alive())
+
+    def test_close_twice(self):
+        pipeline = FramePipeline(4, 2)
+        pipeline.close()
+        pipeline.close()
+        self.assertIsNone(pipeline.worker)
+
+
+if __name__ == '__main__':
+    unittest.main()
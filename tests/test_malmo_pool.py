@@ -0,0 +1,71 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import unittest
+
+from pyrl.environments import fake_malmo
+from pyrl.environments.malmo_pool import VectorSimpleMalmoEnvironment
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class VectorObservationTest(unittest.TestCase):
+
+    def run_steps(self, profile, n_steps=3, **kwargs):
+        env = VectorSimpleMalmoEnvironment(ports=(10000, 10001), malmo=fake_malmo, speedup=10,
+                                           observation_profile=profile, **kwargs)
+        observation = env.reset_all()
+        for _ in xrange(n_steps):
+            observation, rewards, terminals = env.step([0, 1])
+        return observation
+
+    def test_symbolic_has_no_floatobs(self):
+        observation = self.run_steps("symbolic")
+
+        self.assertEqual(observation["intobs"].shape, (2, 5))
+        self.assertEqual(observation["floatobs"].shape, (2, 0))
+        self.assertNotIn("pixels", observation)
+
+    def test_ray_has_one_floatobs(self):
+        observation = self.run_steps("symbolic+ray")
+
+        self.assertEqual(observation["floatobs"].shape, (2, 1))
+
+    def test_video_stacks_pixels(self):
+        observation = self.run_steps("pixels@16x8", frame_stack=3, frame_grayscale=True)
+
+        self.assertEqual(observation["pixels"].shape, (2, 3, 8, 16))
+        self.assertEqual(observation["floatobs"].shape, (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import unittest
+
+from pyrl.environments import fake_malmo
+from pyrl.environments.malmo_client import MalmoClient
+from pyrl.environments.simple_mission import SimpleMalmoEnvironment
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def make_environment(faults=None, **kwargs):
+    client = MalmoClient(fake_malmo.AgentHost(faults=faults), observation_deadline=0.2)
+    return SimpleMalmoEnvironment(client=client, malmo=fake_malmo, retry_delay=0.01, **kwargs)
+
+
+class StartTimeoutTest(unittest.TestCase):
+
+    def test_start_without_observation_ends_episode(self):
+        # every observation is dropped, so the first observation of the mission start times out
+        env = make_environment(fake_malmo.Faults(drop_rate=1.0, seed=0), startup_timeout=0.5)
+
+        observation = env.env_start()
+
+        self.assertEqual(observation, {})
+        self.assertTrue(env.needs_restart)
+
+    def test_timed_out_result_ends_episode(self):
+        env = make_environment()
+        env.env_start()
+        timed_out = env.start_result._replace(observation=None, timed_out=True)
+
+        self.assertEqual(env.observation_from(timed_out), ({}, 0.0, 1))
+        self.assertTrue(env.needs_restart)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import unittest
+
+from pyrl.environments.observation_wait import WaitResult
+from pyrl.environments.step_watchdog import StepWatchdog, is_idempotent
+from pyrl.rlglue.event_loop import Return
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class AgentHost:
+    def __init__(self):
+        self.commands = []
+
+    def sendCommand(self, command):
+        self.commands.append(command)
+
+
+class LateWaiter:
+    """
+    Waiter whose first wait times out before the reward acknowledging the command has arrived.
+    """
+    deadline = 0.01
+    force_command = "jump 0"
+
+    def __init__(self):
+        self.pending_reward = 0.0
+        self.waits = 0
+
+    def wait_async(self, deadline=None):
+        self.waits += 1
+        timed_out = self.waits == 1
+        raise Return(WaitResult(*([None] * len(WaitResult._fields)))._replace(timed_out=timed_out))
+        yield
+
+
+class StepWatchdogTest(unittest.TestCase):
+
+    def observe(self, command):
+        agent_host, waiter = AgentHost(), LateWaiter()
+        watchdog = StepWatchdog(step_deadline=1.0)
+        watchdog.sent(command, waiter)
+        watchdog.observe(agent_host, waiter)
+        return agent_host.commands, watchdog.counters
+
+    def test_relative_command_is_not_resent(self):
+        commands, counters = self.observe("move 1")
+
+        self.assertEqual(commands, ["jump 0"])
+        self.assertEqual(counters["resend"], 0)
+        self.assertEqual(counters["force"], 1)
+
+    def test_idempotent_command_is_resent(self):
+        commands, counters = self.observe("tp 1.5 47 2.5")
+
+        self.assertEqual(commands, ["tp 1.5 47 2.5"])
+        self.assertEqual(counters["resend"], 1)
+
+    def test_is_idempotent(self):
+        for command in ("move 1", "turn 1", "turn -1", "use 1"):
+            self.assertFalse(is_idempotent(command), command)
+        for command in ("jump 0", "use 0", "setYaw 90", "tp 1 2 3"):
+            self.assertTrue(is_idempotent(command), command)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyrl.environments import fake_malmo
+from pyrl.environments.malmo_client import MalmoClient
+from pyrl.environments.simple_mission import SimpleMalmoEnvironment
+from pyrl.environments.world_cache import WorldCache
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class WorldCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.saves_dir = os.path.join(self.directory, "saves")
+        os.makedirs(self.saves_dir)
+        self.cache = WorldCache(os.path.join(self.directory, "cache"), self.saves_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_level(self, name, mtime):
+        world = os.path.join(self.saves_dir, name)
+        if not os.path.isdir(world):
+            os.makedirs(world)
+        level = os.path.join(world, "level.dat")
+        open(level, "w").close()
+        os.utime(level, (mtime, mtime))
+        return world
+
+    def test_needs_saves_dir(self):
+        self.assertRaises(ValueError, WorldCache, os.path.join(self.directory, "cache"), None)
+
+    def test_created_world_is_not_a_save(self):
+        self.write_level("world", 1000.0)
+        before = self.cache.save_times()
+
+        self.assertIsNone(self.cache.wait_for_save(before, 0.1))
+
+    def test_world_created_after_the_request_is_not_a_save(self):
+        before = self.cache.save_times()
+        self.write_level("world", 1000.0)
+
+        self.assertIsNone(self.cache.wait_for_save(before, 0.1))
+
+    def test_saved_world(self):
+        self.write_level("old", 1000.0)
+        world = self.write_level("world", 1000.0)
+        before = self.cache.save_times()
+        self.write_level("world", 1000.5)
+
+        self.assertEqual(self.cache.wait_for_save(before, 0.1), world)
+
+    def test_environment_caches_saved_world(self):
+        agent_host = fake_malmo.AgentHost(saves_dir=self.saves_dir)
+        env = SimpleMalmoEnvironment(client=MalmoClient(agent_host), malmo=fake_malmo, speedup=10,
+                                     world_cache_dir=self.cache.directory, saves_dir=self.saves_dir)
+
+        env.env_start()
+
+        cached = self.cache.lookup(env.layout_key)
+        self.assertIsNotNone(cached)
+        self.assertTrue(os.path.exists(os.path.join(cached, "blocks.json")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Created on Oct 18, 2026
+
+@author: Akshay Narayan
+
+This code is shared under The MIT License
+-----------------------------------------
+
+The MIT License (MIT)
+
+Copyright (c) <year> <copyright holders>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import logging
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from pyrl.environments import fake_malmo, world_recorder
+from pyrl.environments.malmo_client import MalmoClient
+from pyrl.environments.simple_mission import SimpleMalmoEnvironment
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class ReplayTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "episodes.mwr")
+        self.rewards = []
+        # replay builds its own environment, so its rewards are collected by wrapping env_step
+        self.env_step = SimpleMalmoEnvironment.env_step
+
+    def tearDown(self):
+        SimpleMalmoEnvironment.env_step = self.env_step
+        shutil.rmtree(self.directory)
+
+    def record(self, n_episodes, n_steps, **kwargs):
+        """
+        Plays random actions in an environment recording to self.path.
+        :return: list with the rewards of the steps
+        """
+        agent_host = world_recorder.RecordingAgentHost(fake_malmo.AgentHost(), self.path)
+        env = SimpleMalmoEnvironment(client=MalmoClient(agent_host), malmo=fake_malmo, speedup=10, **kwargs)
+        actions = random.Random(1)
+        rewards = []
+        for _ in xrange(n_episodes):
+            env.env_start()
+            for _ in xrange(n_steps):
+                observation, reward, terminal = env.env_step(actions.randrange(4))
+                rewards.append(reward)
+                if terminal:
+                    break
+        agent_host.close()
+        return rewards
+
+    def replay(self):
+        env_step, rewards = self.env_step, self.rewards
+
+        def step(env, action):
+            result = env_step(env, action)
+            rewards.append(result[1])
+            return result
+
+        SimpleMalmoEnvironment.env_step = step
+        return world_recorder.replay(self.path)
+
+    def test_replay_default_arena(self):
+        rewards = self.record(2, 20)
+
+        n_steps, elapsed, agent_host = self.replay()
+
+        self.assertEqual(n_steps, len(rewards))
+        self.assertEqual(self.rewards, rewards)
+        self.assertEqual(agent_host.mismatches, 0)
+
+    def test_replay_generated_arena(self):
+        rewards = self.record(3, 40, arena_size=[12, 12], n_landmarks=5, n_obstacles=20, arena_seed=3)
+
+        n_steps, elapsed, agent_host = self.replay()
+
+        self.assertEqual(self.rewards, rewards)
+        self.assertEqual(agent_host.mismatches, 0)
+
+    def test_replay_generated_arena_without_seed(self):
+        # the seed drawn for the arena is noted, so the replay rebuilds the same layout
+        rewards = self.record(2, 40, arena_size=[10, 10], n_landmarks=4, n_obstacles=12)
+
+        n_steps, elapsed, agent_host = self.replay()
+
+        self.assertIsNotNone(agent_host.log.notes("config")[0]["arena_seed"])
+        self.assertEqual(self.rewards, rewards)
+        self.assertEqual(agent_host.mismatches, 0)
+
+    def test_desync_raises(self):
+        writer = world_recorder.WorldLogWriter(self.path)
+        writer.write(world_recorder.NOTE, {"name": "plan", "value": None})
+        writer.write(world_recorder.COMMAND, {"command": "move 1"})
+        writer.close()
+        agent_host = world_recorder.ReplayAgentHost(self.path)
+
+        self.assertRaises(world_recorder.ReplayDesync, agent_host.getWorldState)
+
+
+if __name__ == '__main__':
+    unittest.main()